@@ -0,0 +1,132 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares the conversion of label NFAs into DFAs
+with the previous converter based on queue.Queue and frozensets.
+
+Usage: PYTHONPATH=. python benchmarks/conversion_benchmark.py [n_labels]"""
+
+import random
+import sys
+from collections import defaultdict
+from queue import Queue
+from time import perf_counter
+
+from search_benchmark import random_word
+
+from stwfsapy import case_handlers, expansion
+from stwfsapy.automata import construction, conversion, dfa, nfa
+
+
+class LegacyNfaToDfaConverter:
+    """The converter before the switch to a deque and sorted tuple keys."""
+
+    def __init__(self, nfa_automaton):
+        self.nfa = nfa_automaton
+        self.dfa = dfa.Dfa()
+        idx0 = self.dfa.add_state()
+        self.queue = Queue()
+        self.queue.put(idx0)
+        start_states = frozenset(self.nfa.starts)
+        self.state_represents = {idx0: list(start_states)}
+        self.state_cache = {start_states: 0}
+
+    def start_conversion(self):
+        while self.queue.qsize() > 0:
+            self.perform_step(self.queue.get())
+            self.queue.task_done()
+        return self.dfa
+
+    def perform_step(self, dfa_start_state_idx):
+        symbol_transitions = defaultdict(set)
+        non_word_char_transitions = set()
+        accepts = set()
+        for nfa_start_idx in self.state_represents[dfa_start_state_idx]:
+            for symbol, nfa_end_state_idxs in self.nfa.states[
+                nfa_start_idx
+            ].symbol_transitions.items():
+                symbol_transitions[symbol].update(nfa_end_state_idxs)
+            non_word_char_transitions.update(
+                self.nfa.states[nfa_start_idx].non_word_char_transitions
+            )
+            accepts.update(self.nfa.states[nfa_start_idx].accepts)
+        for symbol, nfa_end_state_idxs in symbol_transitions.items():
+            self.dfa.set_symbol_transition(
+                dfa_start_state_idx,
+                self._get_or_create_dfa_state(nfa_end_state_idxs),
+                symbol,
+            )
+        if len(non_word_char_transitions) > 0:
+            self.dfa.set_non_word_char_transition(
+                dfa_start_state_idx,
+                self._get_or_create_dfa_state(non_word_char_transitions),
+            )
+        if len(accepts) > 0:
+            self.dfa.add_acceptances(dfa_start_state_idx, accepts)
+
+    def _get_or_create_dfa_state(self, state_idxs):
+        frozen_states = frozenset(state_idxs)
+        try:
+            return self.state_cache[frozen_states]
+        except KeyError:
+            dfa_state_idx = self.dfa.add_state()
+            self.queue.put(dfa_state_idx)
+            self.state_represents[dfa_state_idx] = list(frozen_states)
+            self.state_cache[frozen_states] = dfa_state_idx
+            return dfa_state_idx
+
+
+def build_nfa(labels):
+    automaton = nfa.Nfa()
+    expansion_funs = expansion.collect_expansion_functions()
+    for idx, label in enumerate(labels):
+        expanded = label
+        for fun in expansion_funs:
+            expanded = fun(expanded)
+        construction.ConstructionState(
+            automaton,
+            expansion.simple_english_plural_fun(
+                case_handlers.title_case_handler(expanded)
+            ),
+            idx,
+        ).construct()
+    automaton.remove_empty_transitions()
+    return automaton
+
+
+def main(n_labels):
+    rng = random.Random(0)
+    vocabulary = [random_word(rng) for _ in range(n_labels)]
+    labels = [
+        " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3)))
+        for _ in range(n_labels)
+    ]
+    automaton = build_nfa(labels)
+    print(f"{n_labels} labels, {len(automaton.states)} NFA states")
+    timings = {}
+    for name, converter in [
+        ("legacy", LegacyNfaToDfaConverter),
+        ("NfaToDfaConverter", conversion.NfaToDfaConverter),
+    ]:
+        start = perf_counter()
+        result = converter(automaton).start_conversion()
+        timings[name] = perf_counter() - start
+        print(
+            f"{name}: {len(result.states)} DFA states, {timings[name]:.2f} s"
+            + f" ({timings['legacy'] / timings[name]:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
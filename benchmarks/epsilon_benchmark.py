@@ -0,0 +1,121 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares the removal of empty transitions in reverse topological order
+with the previous removal driven by a priority queue.
+
+Usage: PYTHONPATH=. python benchmarks/epsilon_benchmark.py [n_labels]"""
+
+import random
+import sys
+from heapq import heapify, heappop, heappush
+from time import perf_counter
+
+from search_benchmark import random_word
+
+from stwfsapy import case_handlers, expansion
+from stwfsapy.automata import construction, nfa
+
+
+def legacy_remove_empty_transitions(automaton):
+    """The removal before processing states in reverse topological order.
+    States are taken from a queue by their number of empty transitions.
+    Entries are pushed again when this number decreases
+    and outdated entries are skipped."""
+    states = automaton.states
+    queue = [
+        (len(state.empty_transitions), idx)
+        for idx, state in enumerate(states)
+        if state.incoming_empty_transitions
+    ]
+    heapify(queue)
+    while queue:
+        priority, ptr_idx = heappop(queue)
+        ptr = states[ptr_idx]
+        if priority != len(ptr.empty_transitions):
+            continue
+        if priority > 0:
+            raise Exception("There is an empty transition loop in the NFA.")
+        for incoming_idx in ptr.incoming_empty_transitions:
+            incoming = states[incoming_idx]
+            for symbol, state_idxs in ptr.symbol_transitions.items():
+                for state_idx in state_idxs:
+                    automaton.add_symbol_transition(incoming_idx, state_idx, symbol)
+            for state_idx in ptr.non_word_char_transitions:
+                automaton.add_non_word_char_transition(incoming_idx, state_idx)
+            incoming.empty_transitions = nfa._removed(
+                incoming.empty_transitions, ptr_idx
+            )
+            if incoming.incoming_empty_transitions:
+                heappush(queue, (len(incoming.empty_transitions), incoming_idx))
+        ptr.incoming_empty_transitions = ()
+
+
+def build_nfa_with_empty_transitions(labels):
+    automaton = nfa.Nfa()
+    expansion_funs = expansion.collect_expansion_functions()
+    for idx, label in enumerate(labels):
+        expanded = label
+        for fun in expansion_funs:
+            expanded = fun(expanded)
+        construction.ConstructionState(
+            automaton,
+            expansion.simple_english_plural_fun(
+                case_handlers.title_case_handler(expanded)
+            ),
+            idx,
+        ).construct()
+    return automaton
+
+
+def transitions(automaton):
+    return [
+        (
+            {
+                symbol: set(state_idxs)
+                for symbol, state_idxs in state.symbol_transitions.items()
+            },
+            set(state.non_word_char_transitions),
+        )
+        for state in automaton.states
+    ]
+
+
+def main(n_labels):
+    rng = random.Random(0)
+    vocabulary = [random_word(rng) for _ in range(n_labels)]
+    labels = [
+        " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3)))
+        for _ in range(n_labels)
+    ]
+    automata = []
+    timings = {}
+    for name, remove in [
+        ("legacy", legacy_remove_empty_transitions),
+        ("remove_empty_transitions", nfa.Nfa.remove_empty_transitions),
+    ]:
+        automaton = build_nfa_with_empty_transitions(labels)
+        start = perf_counter()
+        remove(automaton)
+        timings[name] = perf_counter() - start
+        print(
+            f"{name}: {len(automaton.states)} NFA states, {timings[name]:.2f} s"
+            + f" ({timings['legacy'] / timings[name]:.1f}x)"
+        )
+        automata.append(automaton)
+    assert transitions(automata[0]) == transitions(automata[1])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40_000)
@@ -0,0 +1,94 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares the construction of automata for multilingual labels
+with and without grouping identical expressions.
+
+Usage:
+PYTHONPATH=. python benchmarks/expression_groups_benchmark.py [n_concepts] [n_langs]
+with at most 5 languages."""
+
+import random
+import sys
+from time import perf_counter
+
+from rdflib.term import Literal
+from search_benchmark import random_word
+
+from stwfsapy.automata import trie
+from stwfsapy.predictor import StwfsapyPredictor
+
+_LANGS = ["en", "de", "fr", "es", "it"]
+
+
+def ungrouped(predictor, labels):
+    """Expands and adds every label on its own, as before the grouping."""
+    for concept, label in labels:
+        for expression, concept_labels in predictor._expression_groups(
+            [(concept, label)]
+        ).items():
+            yield expression, concept_labels
+
+
+def legacy_construct_dfa(predictor, labels):
+    builder = trie.TrieBuilder()
+    for expression, concept_labels in ungrouped(predictor, labels):
+        assert builder.add(expression, *map(str, concept_labels))
+    return builder.to_dfa()
+
+
+def main(n_concepts=20_000, n_langs=3):
+    rng = random.Random(0)
+    vocabulary = [random_word(rng) for _ in range(n_concepts)]
+    labels = []
+    for concept in range(n_concepts):
+        label = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3)))
+        for lang in range(n_langs):
+            # Most labels are identical in all languages.
+            if lang and rng.random() < 0.2:
+                label = random_word(rng)
+            labels.append((f"c{concept}", Literal(label, lang=_LANGS[lang])))
+    predictor = StwfsapyPredictor(None, None, None, None)
+    print(f"{len(labels)} labels")
+    results = []
+    for name, nfa_fun, dfa_fun in [
+        (
+            "ungrouped",
+            lambda: predictor._expression_nfa(ungrouped(predictor, labels)),
+            lambda: legacy_construct_dfa(predictor, labels),
+        ),
+        (
+            "grouped",
+            lambda: predictor._construct_nfa(labels),
+            lambda: predictor._construct_dfa(labels),
+        ),
+    ]:
+        start = perf_counter()
+        automaton = nfa_fun()
+        nfa_time = perf_counter() - start
+        n_nfa_states = len(automaton.states)
+        del automaton
+        start = perf_counter()
+        result = dfa_fun()
+        dfa_time = perf_counter() - start
+        results.append(result)
+        print(
+            f"{name}: NFA {n_nfa_states} states {nfa_time:.2f} s,"
+            f" trie {len(result.states)} states {dfa_time:.2f} s"
+        )
+    assert [len(result.states) for result in results] == [len(results[0].states)] * 2
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
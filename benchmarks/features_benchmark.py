@@ -0,0 +1,112 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares the transforms of the position and frequency features
+with the loops over single matches they replaced.
+
+Usage: PYTHONPATH=. python benchmarks/features_benchmark.py [n_docs] [n_matches]"""
+
+import random
+import sys
+from collections import OrderedDict
+from timeit import timeit
+
+import numpy as np
+
+from stwfsapy.frequency_features import FrequencyFeatures
+from stwfsapy.position_features import PositionFeatures
+
+
+def legacy_position_transform(X):
+    out = np.zeros((len(X), 3))
+    for idx, x in enumerate(X):
+        positions = x[1]
+        min_pos = min(positions)
+        max_pos = max(positions)
+        txt_len = x[0]
+        out[idx][0] = min_pos / txt_len
+        out[idx][1] = max_pos / txt_len
+        out[idx][2] = (max_pos - min_pos) / txt_len
+    return out
+
+
+def legacy_frequency_transform(features, X):
+    ret = np.zeros((len(X), 3))
+    concept_counts = OrderedDict()
+    ret_ptr = 0
+    doc_concept_sum = 0
+    for x in X:
+        concept_counts[x[0]] = len(x[1])
+        doc_concept_sum += len(x[1])
+        if x[-1] == 1:
+            for concept, count in concept_counts.items():
+                tf = count / doc_concept_sum
+                idf = features.idfs_.get(concept, features.log_doc_count_)
+                ret[ret_ptr, 0] = tf
+                ret[ret_ptr, 1] = idf
+                ret[ret_ptr, 2] = tf * idf
+                ret_ptr += 1
+            doc_concept_sum = 0
+            concept_counts = OrderedDict()
+    return ret
+
+
+def random_matches(rng, n_docs, n_matches):
+    """Rows as selected by the column transformer of the predictor."""
+    rows = []
+    for _ in range(n_docs):
+        txt_len = rng.randint(10_000, 100_000)
+        for idx, concept in enumerate(rng.sample(range(10 * n_matches), n_matches)):
+            positions = sorted(rng.randrange(txt_len) for _ in range(rng.randint(1, 5)))
+            rows.append((str(concept), txt_len, positions, int(idx == n_matches - 1)))
+    position_rows = np.empty((len(rows), 2), dtype=object)
+    position_rows[:] = [(row[1], row[2]) for row in rows]
+    frequency_rows = np.empty((len(rows), 3), dtype=object)
+    frequency_rows[:] = [(row[0], row[2], row[3]) for row in rows]
+    return position_rows, frequency_rows
+
+
+def main(n_docs=100, n_matches=2000):
+    position_rows, frequency_rows = random_matches(random.Random(0), n_docs, n_matches)
+    positions = PositionFeatures().fit(position_rows)
+    frequencies = FrequencyFeatures().fit(frequency_rows)
+    assert np.allclose(
+        positions.transform(position_rows), legacy_position_transform(position_rows)
+    )
+    assert np.allclose(
+        frequencies.transform(frequency_rows),
+        legacy_frequency_transform(frequencies, frequency_rows),
+    )
+    for name, legacy, current in [
+        (
+            "position",
+            lambda: legacy_position_transform(position_rows),
+            lambda: positions.transform(position_rows),
+        ),
+        (
+            "frequency",
+            lambda: legacy_frequency_transform(frequencies, frequency_rows),
+            lambda: frequencies.transform(frequency_rows),
+        ),
+    ]:
+        legacy_time = timeit(legacy, number=3) / 3
+        current_time = timeit(current, number=3) / 3
+        print(
+            f"{name}: {legacy_time:.3f}s loop, {current_time:.3f}s vectorized, "
+            f"{legacy_time / current_time:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,59 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares the eager conversion of a label automaton
+with its lazy determinization during search.
+
+Usage: PYTHONPATH=. python benchmarks/lazy_benchmark.py [n_labels] [max_states]"""
+
+import random
+import sys
+from time import perf_counter
+
+from conversion_benchmark import build_nfa
+from search_benchmark import random_text, random_word
+
+from stwfsapy.automata import conversion, lazy
+
+
+def main(n_labels=100_000, max_states=100_000):
+    rng = random.Random(0)
+    vocabulary = [random_word(rng) for _ in range(n_labels)]
+    labels = [
+        " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3)))
+        for _ in range(n_labels)
+    ]
+    text_vocabulary = vocabulary + [random_word(rng) for _ in range(4 * n_labels)]
+    texts = [random_text(rng, text_vocabulary, 20_000) for _ in range(100)]
+    automaton = build_nfa(labels)
+    print(f"{n_labels} labels, {len(automaton.states)} NFA states")
+    start = perf_counter()
+    eager = conversion.NfaToDfaConverter(automaton).start_conversion()
+    conversion_time = perf_counter() - start
+    print(f"eager: {len(eager.states)} states, conversion {conversion_time:.2f} s")
+    lazy_dfa = lazy.LazyDfa(automaton, max_states)
+    for name, searched in [
+        ("eager", eager),
+        ("lazy", lazy_dfa),
+        ("lazy warm", lazy_dfa),
+    ]:
+        start = perf_counter()
+        matches = [list(searched.search(text)) for text in texts]
+        print(f"{name}: search {perf_counter() - start:.2f} s")
+        assert matches == [list(eager.search(text)) for text in texts]
+    print(f"lazy: {len(lazy_dfa.states)} states")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,61 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures the memory of label NFAs and the peak memory of their conversion.
+
+Usage: PYTHONPATH=. python benchmarks/nfa_memory_benchmark.py [n_labels]"""
+
+import random
+import sys
+import tracemalloc
+from time import perf_counter
+
+from conversion_benchmark import build_nfa
+from search_benchmark import random_word
+
+from stwfsapy.automata import conversion
+
+
+def main(n_labels):
+    rng = random.Random(0)
+    vocabulary = [random_word(rng) for _ in range(n_labels)]
+    labels = [
+        " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3)))
+        for _ in range(n_labels)
+    ]
+    tracemalloc.start()
+    start = perf_counter()
+    automaton = build_nfa(labels)
+    construction_time = perf_counter() - start
+    nfa_memory = tracemalloc.get_traced_memory()[0]
+    print(
+        f"NFA: {len(automaton.states)} states, {nfa_memory / 2**20:.0f} MiB,"
+        f" {construction_time:.2f} s"
+    )
+    tracemalloc.reset_peak()
+    start = perf_counter()
+    converter = conversion.NfaToDfaConverter(automaton)
+    del automaton
+    result = converter.start_conversion()
+    conversion_time = perf_counter() - start
+    del converter
+    current, peak = tracemalloc.get_traced_memory()
+    print(
+        f"DFA: {len(result.states)} states, {conversion_time:.2f} s,"
+        f" peak {peak / 2**20:.0f} MiB, {current / 2**20:.0f} MiB after conversion"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
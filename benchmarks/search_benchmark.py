@@ -0,0 +1,126 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares the search of the automaton with the search loop
+that tries every text position as start.
+
+Usage: PYTHONPATH=. python benchmarks/search_benchmark.py [n_labels]"""
+
+import random
+import sys
+from timeit import timeit
+
+from stwfsapy import case_handlers, expansion
+from stwfsapy.automata import compact, construction, conversion, nfa
+
+_SEPARATORS = [" ", " ", " ", " ", ", ", ". ", " (", ") ", "-", "\n"]
+
+
+def random_word(rng):
+    return "".join(
+        rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 10))
+    )
+
+
+def build_dfa(labels):
+    automaton = nfa.Nfa()
+    expansion_funs = expansion.collect_expansion_functions()
+    for idx, label in enumerate(labels):
+        expanded = label
+        for fun in expansion_funs:
+            expanded = fun(expanded)
+        construction.ConstructionState(
+            automaton, case_handlers.title_case_handler(expanded), idx
+        ).construct()
+    automaton.remove_empty_transitions()
+    return conversion.NfaToDfaConverter(automaton).start_conversion()
+
+
+def random_text(rng, vocabulary, length):
+    parts = []
+    size = 0
+    while size < length:
+        word = rng.choice(vocabulary)
+        if rng.random() < 0.3:
+            word = word.capitalize()
+        parts.append(word)
+        parts.append(rng.choice(_SEPARATORS))
+        size += len(word) + 1
+    return "".join(parts)
+
+
+def legacy_search(automaton, text):
+    """The search loop that starts a walk at every position."""
+    search_text = f".{text}."
+    last_end_position = 0
+    for start in range(len(search_text)):
+        if start < last_end_position:
+            continue
+        stack = [(0, start)]
+        while len(stack) > 0:
+            state_idx, position = stack.pop()
+            state = automaton.states[state_idx]
+            if state.accepts:
+                last_end_position = position
+                for accept in state.accepts:
+                    yield (accept, text[start : position - 2], start, position - 2)
+                break
+            try:
+                symbol = search_text[position]
+            except IndexError:
+                continue
+            if not symbol.isalnum() and state.non_word_char_transition:
+                stack.append((state.non_word_char_transition, position + 1))
+            try:
+                stack.append((state.symbol_transitions[symbol], position + 1))
+            except KeyError:
+                pass
+
+
+def main(n_labels):
+    rng = random.Random(0)
+    vocabulary = [random_word(rng) for _ in range(n_labels)]
+    labels = [
+        " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3)))
+        for _ in range(n_labels)
+    ]
+    # Words of real texts mostly do not start a label.
+    text_vocabulary = vocabulary + [random_word(rng) for _ in range(4 * n_labels)]
+    automaton = build_dfa(labels)
+    compact_automaton = compact.CompactDfa.from_dfa(automaton)
+    print(f"{n_labels} labels, {len(automaton.states)} states")
+    for length in [1_000, 20_000, 200_000]:
+        text = random_text(rng, text_vocabulary, length)
+        assert list(automaton.search(text)) == list(legacy_search(automaton, text))
+        repeats = max(1, 200_000 // length)
+        timings = {
+            name: timeit(lambda: list(fun(text)), number=repeats) / repeats
+            for name, fun in [
+                ("legacy", lambda t: legacy_search(automaton, t)),
+                ("Dfa.search", automaton.search),
+                ("CompactDfa.search", compact_automaton.search),
+            ]
+        }
+        print(
+            f"text length {len(text)}: "
+            + ", ".join(
+                f"{name} {seconds * 1000:.2f} ms"
+                + f" ({timings['legacy'] / seconds:.1f}x)"
+                for name, seconds in timings.items()
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
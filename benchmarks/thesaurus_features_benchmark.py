@@ -0,0 +1,77 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares the thesaurus feature transform
+with the one matrix per concept mapping it replaced.
+
+Usage:
+PYTHONPATH=. python benchmarks/thesaurus_features_benchmark.py [n_concepts] [n_matches]
+"""
+
+import pickle
+import random
+import sys
+from timeit import timeit
+
+from scipy.sparse import csr_matrix, vstack
+
+from stwfsapy.thesaurus_features import ThesaurusFeatureTransformation
+
+
+def legacy_transform(mapping, feature_dim, X):
+    unknown = csr_matrix((1, feature_dim))
+    return vstack([mapping.get(x, unknown) for x in X], format="csr")
+
+
+def random_mapping(rng, n_concepts, n_thesauri=500):
+    """One row per concept, with few thesauri each, like the STW."""
+    return {
+        str(concept): csr_matrix(
+            (
+                [1] * len(thesauri),
+                ([0] * len(thesauri), thesauri),
+            ),
+            shape=(1, n_thesauri),
+        )
+        for concept in range(n_concepts)
+        for thesauri in [rng.sample(range(n_thesauri), rng.randint(1, 4))]
+    }
+
+
+def main(n_concepts=100_000, n_matches=200_000):
+    rng = random.Random(0)
+    mapping = random_mapping(rng, n_concepts)
+    feature_dim = next(iter(mapping.values())).shape[1]
+    features = ThesaurusFeatureTransformation(None, None, None, None)
+    features.feature_dim_ = feature_dim
+    features.mapping_ = mapping
+    # Converts the legacy mapping.
+    features = pickle.loads(pickle.dumps(features))
+    X = [str(rng.randrange(n_concepts + n_concepts // 10)) for _ in range(n_matches)]
+    assert (
+        legacy_transform(mapping, feature_dim, X) != features.transform(X)
+    ).getnnz() == 0
+    legacy_size = len(pickle.dumps(mapping))
+    size = len(pickle.dumps((features.mapping_, features.features_)))
+    print(f"pickled size: {legacy_size / 2**20:.1f} MiB legacy, {size / 2**20:.1f} MiB")
+    legacy_time = timeit(lambda: legacy_transform(mapping, feature_dim, X), number=3)
+    time = timeit(lambda: features.transform(X), number=3)
+    print(
+        f"transform: {legacy_time / 3:.3f}s legacy, {time / 3:.3f}s, "
+        f"{legacy_time / time:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,70 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares the construction of label automata by the trie builder
+with the construction of an NFA and its conversion.
+
+Usage: PYTHONPATH=. python benchmarks/trie_benchmark.py [n_labels]"""
+
+import random
+import sys
+from time import perf_counter
+
+from conversion_benchmark import build_nfa
+from search_benchmark import random_text, random_word
+
+from stwfsapy import case_handlers, expansion
+from stwfsapy.automata import conversion, trie
+
+
+def build_trie(labels):
+    builder = trie.TrieBuilder()
+    expansion_funs = expansion.collect_expansion_functions()
+    for idx, label in enumerate(labels):
+        expanded = label
+        for fun in expansion_funs:
+            expanded = fun(expanded)
+        assert builder.add(
+            expansion.simple_english_plural_fun(
+                case_handlers.title_case_handler(expanded)
+            ),
+            idx,
+        )
+    return builder.to_dfa()
+
+
+def main(n_labels):
+    rng = random.Random(0)
+    vocabulary = [random_word(rng) for _ in range(n_labels)]
+    labels = [
+        " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3)))
+        for _ in range(n_labels)
+    ]
+    start = perf_counter()
+    converted = conversion.NfaToDfaConverter(build_nfa(labels)).start_conversion()
+    nfa_time = perf_counter() - start
+    print(f"NFA: {len(converted.states)} DFA states, {nfa_time:.2f} s")
+    start = perf_counter()
+    automaton = build_trie(labels)
+    trie_time = perf_counter() - start
+    print(
+        f"trie: {len(automaton.states)} DFA states, {trie_time:.2f} s"
+        + f" ({nfa_time / trie_time:.1f}x)"
+    )
+    for text in [random_text(rng, vocabulary, 20_000) for _ in range(10)]:
+        assert list(automaton.search(text)) == list(converted.search(text))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
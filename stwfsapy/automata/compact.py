@@ -0,0 +1,369 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import mmap
+from array import array
+from bisect import bisect_left
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from stwfsapy.automata import dfa
+from stwfsapy.util.binary_format import (
+    int_bytes,
+    read_ints,
+    read_sections,
+    read_strings,
+    string_table,
+    write_sections,
+)
+
+_TYPE_CODE = "i"
+"""Type code of all index arrays. Signed 32 bit integers."""
+
+_NO_TRANSITION = -1
+"""Marks the absence of a non word char transition."""
+
+_MAGIC = b"STWFSDFA"
+"""First bytes of every serialized automaton."""
+
+_FORMAT_VERSION = 1
+"""Version of the binary format written by CompactDfa.write."""
+
+_N_SECTIONS = 10
+
+
+class CompactDfa:
+    """Read only representation of a stwfsapy.automata.dfa.Dfa.
+    Instead of one object per state, the transitions and acceptances
+    of all states are stored in flat integer arrays.
+    The symbol transitions of state i are located at the positions
+    transition_offsets[i] to transition_offsets[i + 1] of
+    transition_symbols and transition_targets,
+    sorted by the interned symbol.
+    Example:
+        from stwfsapy.automata import compact
+
+        dfa = conversion.NfaToDfaConverter(nfautomaton).start_conversion()
+        compact_dfa = compact.CompactDfa.from_dfa(dfa)"""
+
+    def __init__(
+        self,
+        alphabet: List[str],
+        transition_offsets: Sequence[int],
+        transition_symbols: Sequence[int],
+        transition_targets: Sequence[int],
+        non_word_char_transitions: Sequence[int],
+        accept_offsets: Sequence[int],
+        accept_ids: Sequence[int],
+        accept_values: List[Any],
+    ):
+        self.alphabet: List[str] = alphabet
+        """All symbols that occur in a transition.
+        A symbol is represented by its index in this list."""
+        self.symbol_ids: Dict[str, int] = {
+            symbol: idx for idx, symbol in enumerate(alphabet)
+        }
+        """Maps symbols to their index in the alphabet."""
+        self.transition_offsets: Sequence[int] = transition_offsets
+        """Start of the symbol transitions for each state.
+        Contains one additional entry marking the end of the last state."""
+        self.transition_symbols: Sequence[int] = transition_symbols
+        """Symbol ids of all symbol transitions."""
+        self.transition_targets: Sequence[int] = transition_targets
+        """Target states of all symbol transitions."""
+        self.non_word_char_transitions: Sequence[int] = non_word_char_transitions
+        """Target of the non word char transition for each state.
+        Is negative if there is no such transition."""
+        self.accept_offsets: Sequence[int] = accept_offsets
+        """Start of the acceptances for each state.
+        Contains one additional entry marking the end of the last state."""
+        self.accept_ids: Sequence[int] = accept_ids
+        """Indices into accept_values for all acceptances."""
+        self.accept_values: List[Any] = accept_values
+        """All distinct objects that are accepted by the automaton."""
+        self._source: Optional[Tuple[str, Callable, int, int]] = None
+        """File location of a memory mapped automaton."""
+
+    def __len__(self) -> int:
+        """Number of states."""
+        return len(self.non_word_char_transitions)
+
+    @staticmethod
+    def from_dfa(automaton: dfa.Dfa) -> "CompactDfa":
+        """Creates the compact representation of an automaton."""
+        alphabet = sorted(
+            {
+                symbol
+                for state in automaton.states
+                for symbol in state.symbol_transitions
+            }
+        )
+        symbol_ids = {symbol: idx for idx, symbol in enumerate(alphabet)}
+        accept_value_ids: Dict[Any, int] = {}
+        accept_values: List[Any] = []
+        transition_offsets = array(_TYPE_CODE, [0])
+        transition_symbols = array(_TYPE_CODE)
+        transition_targets = array(_TYPE_CODE)
+        non_word_char_transitions = array(_TYPE_CODE)
+        accept_offsets = array(_TYPE_CODE, [0])
+        accept_ids = array(_TYPE_CODE)
+        for state in automaton.states:
+            for symbol_id, target in sorted(
+                (symbol_ids[symbol], target)
+                for symbol, target in state.symbol_transitions.items()
+            ):
+                transition_symbols.append(symbol_id)
+                transition_targets.append(target)
+            transition_offsets.append(len(transition_symbols))
+            if state.non_word_char_transition is None:
+                non_word_char_transitions.append(_NO_TRANSITION)
+            else:
+                non_word_char_transitions.append(state.non_word_char_transition)
+            for accept in state.accepts:
+                try:
+                    accept_id = accept_value_ids[accept]
+                except KeyError:
+                    accept_id = len(accept_values)
+                    accept_value_ids[accept] = accept_id
+                    accept_values.append(accept)
+                accept_ids.append(accept_id)
+            accept_offsets.append(len(accept_ids))
+        return CompactDfa(
+            alphabet,
+            transition_offsets,
+            transition_symbols,
+            transition_targets,
+            non_word_char_transitions,
+            accept_offsets,
+            accept_ids,
+            accept_values,
+        )
+
+    def to_dfa(self) -> dfa.Dfa:
+        """Creates a mutable stwfsapy.automata.dfa.Dfa
+        with the same states and transitions."""
+        states = []
+        for idx in range(len(self)):
+            start = self.transition_offsets[idx]
+            end = self.transition_offsets[idx + 1]
+            non_word_char_transition = self.non_word_char_transitions[idx]
+            states.append(
+                dfa.State(
+                    symbol_transitions={
+                        self.alphabet[self.transition_symbols[ptr]]: (
+                            self.transition_targets[ptr]
+                        )
+                        for ptr in range(start, end)
+                    },
+                    non_word_char_transition=(
+                        None
+                        if non_word_char_transition < 0
+                        else non_word_char_transition
+                    ),
+                    accepts=list(self.accepts(idx)),
+                )
+            )
+        return dfa.Dfa(states)
+
+    def accepts(self, state_idx: int) -> Iterable[Any]:
+        """Returns what is accepted by a state."""
+        return (
+            self.accept_values[self.accept_ids[ptr]]
+            for ptr in range(
+                self.accept_offsets[state_idx], self.accept_offsets[state_idx + 1]
+            )
+        )
+
+    def search(self, text: str) -> Iterable[Tuple[Any, str, int, int]]:
+        """Process a string, yielding acceptances of all substrings.
+        Yields the same results as stwfsapy.automata.dfa.Dfa.search
+        for the automaton this representation was created from."""
+        search_text = f".{text}."
+        symbol_ids = self.symbol_ids
+        transition_offsets = self.transition_offsets
+        transition_symbols = self.transition_symbols
+        transition_targets = self.transition_targets
+        non_word_char_transitions = self.non_word_char_transitions
+        accept_offsets = self.accept_offsets
+        accept_ids = self.accept_ids
+        accept_values = self.accept_values
+        last_end_position = 0
+        starts = self._candidate_starts(search_text)
+        for start in starts:
+            if start < last_end_position:
+                continue
+            stack = [(0, start)]
+            while len(stack) > 0:
+                state_idx, position = stack.pop()
+                accept_start = accept_offsets[state_idx]
+                accept_end = accept_offsets[state_idx + 1]
+                if accept_start < accept_end:
+                    last_end_position = position
+                    original_end = position - 2
+                    for ptr in range(accept_start, accept_end):
+                        yield (
+                            accept_values[accept_ids[ptr]],
+                            text[start:original_end],
+                            start,
+                            original_end,
+                        )
+                    break
+                try:
+                    symbol = search_text[position]
+                except IndexError:
+                    continue
+                # Transitions to the start state are ignored,
+                # as in stwfsapy.automata.dfa.Dfa.search.
+                if not symbol.isalnum():
+                    non_word_char_transition = non_word_char_transitions[state_idx]
+                    if non_word_char_transition > 0:
+                        stack.append((non_word_char_transition, position + 1))
+                symbol_id = symbol_ids.get(symbol)
+                if symbol_id is not None:
+                    lo = transition_offsets[state_idx]
+                    hi = transition_offsets[state_idx + 1]
+                    ptr = bisect_left(transition_symbols, symbol_id, lo, hi)
+                    if ptr < hi and transition_symbols[ptr] == symbol_id:
+                        stack.append((transition_targets[ptr], position + 1))
+
+    def _symbols(self, state_idx: int) -> List[str]:
+        return [
+            self.alphabet[self.transition_symbols[ptr]]
+            for ptr in range(
+                self.transition_offsets[state_idx],
+                self.transition_offsets[state_idx + 1],
+            )
+        ]
+
+    def _accepts_any(self, state_idx: int) -> bool:
+        return self.accept_offsets[state_idx] < self.accept_offsets[state_idx + 1]
+
+    def _candidate_starts(self, search_text: str) -> Iterable[int]:
+        if self._accepts_any(0):
+            return range(len(search_text))
+        start_symbols = self._symbols(0)
+        start_non_word_char_transition = self.non_word_char_transitions[0]
+        if start_symbols or start_non_word_char_transition <= 0:
+            return dfa.candidate_starts(
+                search_text, start_symbols, start_non_word_char_transition > 0
+            )
+        follow_idx = start_non_word_char_transition
+        if self._accepts_any(follow_idx):
+            return dfa.candidate_starts(search_text, (), True)
+        return dfa.candidate_starts(
+            search_text,
+            (),
+            True,
+            self._symbols(follow_idx),
+            self.non_word_char_transitions[follow_idx] > 0,
+        )
+
+    def to_dict(self, acceptance_handler: Callable) -> Dict[str, Any]:
+        return self.to_dfa().to_dict(acceptance_handler)
+
+    @staticmethod
+    def from_dict(conf: Dict[str, Any], acceptance_handler: Callable):
+        return CompactDfa.from_dfa(dfa.Dfa.from_dict(conf, acceptance_handler))
+
+    def write(self, fp: IO[bytes], acceptance_handler: Callable):
+        """Writes the automaton in a binary format
+        that can be read by from_buffer and open.
+        The integer arrays are stored as little endian 32 bit integers.
+        The alphabet and the accepted values,
+        converted to strings by the acceptance_handler,
+        are stored as utf-8 encoded string tables."""
+        write_sections(
+            fp,
+            _MAGIC,
+            _FORMAT_VERSION,
+            [
+                *string_table(self.alphabet),
+                int_bytes(self.transition_offsets),
+                int_bytes(self.transition_symbols),
+                int_bytes(self.transition_targets),
+                int_bytes(self.non_word_char_transitions),
+                int_bytes(self.accept_offsets),
+                int_bytes(self.accept_ids),
+                *string_table(
+                    [acceptance_handler(value) for value in self.accept_values]
+                ),
+            ],
+        )
+
+    @staticmethod
+    def from_buffer(
+        buffer, acceptance_handler: Callable, copy: bool = True
+    ) -> "CompactDfa":
+        """Reads an automaton written by write from a bytes like object.
+        If copy is false, the integer arrays are views into the buffer.
+        In this case, the buffer must stay unchanged
+        for the lifetime of the automaton."""
+        sections = read_sections(buffer, _MAGIC, _FORMAT_VERSION, _N_SECTIONS)
+        return CompactDfa(
+            read_strings(sections[0], sections[1]),
+            *[read_ints(section, copy) for section in sections[2:8]],
+            [
+                acceptance_handler(value)
+                for value in read_strings(sections[8], sections[9])
+            ],
+        )
+
+    @staticmethod
+    def open(
+        path: str, acceptance_handler: Callable, offset: int = 0, length: int = -1
+    ) -> "CompactDfa":
+        """Maps an automaton written by write into memory, read only.
+        The automaton is located at offset in the file at path
+        and spans length bytes, or up to the end of the file if negative.
+        All processes that open the same file share
+        a single physical copy of the transitions and acceptances.
+        When pickled, only the location of the automaton is stored."""
+        with open(path, "rb") as fp:
+            mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        end = len(mapped) if length < 0 else offset + length
+        automaton = CompactDfa.from_buffer(
+            memoryview(mapped)[offset:end], acceptance_handler, copy=False
+        )
+        automaton._source = (path, acceptance_handler, offset, length)
+        return automaton
+
+    def __getstate__(self):
+        if self._source is not None:
+            return {"_source": self._source}
+        state = self.__dict__.copy()
+        for key, value in state.items():
+            if isinstance(value, memoryview):
+                state[key] = read_ints(value.cast("B"))
+        return state
+
+    def __setstate__(self, state):
+        source = state.get("_source")
+        if source is not None:
+            self.__dict__.update(CompactDfa.open(*source).__dict__)
+        else:
+            self.__dict__.update(state)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, CompactDfa)
+            and self.alphabet == other.alphabet
+            and list(self.transition_offsets) == list(other.transition_offsets)
+            and list(self.transition_symbols) == list(other.transition_symbols)
+            and list(self.transition_targets) == list(other.transition_targets)
+            and list(self.non_word_char_transitions)
+            == list(other.non_word_char_transitions)
+            and list(self.accept_offsets) == list(other.accept_offsets)
+            and [self.accept_values[idx] for idx in self.accept_ids]
+            == [other.accept_values[idx] for idx in other.accept_ids]
+        )
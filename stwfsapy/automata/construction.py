@@ -13,20 +13,25 @@
 # limitations under the License.
 
 
-from typing import List
+from typing import List, Tuple
 
 from stwfsapy.automata import nfa
 
 
 class ConstructionState:
 
-    def __init__(self, graph: nfa.Nfa, expression: str, accept: object):
+    def __init__(
+        self, graph: nfa.Nfa, expression: str, accept: object, *accepts: object
+    ):
         self.graph: nfa.Nfa = graph
         """The graph the expression will be added to."""
         self.expression: str = expression
         """The expression that will be added to the graph."""
         self.accept: object = accept
         """Object returned when the expression matches an input."""
+        self.accepts: Tuple[object, ...] = (accept, *accepts)
+        """All objects returned when the expression matches an input.
+        Allows to add an expression shared by several concepts once."""
 
     def _set_up(self):
         self.start_idx = self.graph.add_state()
@@ -66,7 +71,8 @@ class ConstructionState:
             pass
         for end_idx in ends:
             acceptance_idx = self.graph.add_state()
-            self.graph.add_acceptance(acceptance_idx, self.accept)
+            for accept in self.accepts:
+                self.graph.add_acceptance(acceptance_idx, accept)
             self.graph.add_non_word_char_transition(end_idx, acceptance_idx)
         self.graph.add_start(self.start_idx)
 
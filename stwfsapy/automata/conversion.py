@@ -13,9 +13,19 @@
 # limitations under the License.
 
 
-from collections import defaultdict
-from queue import Queue
-from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+from collections import deque
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from stwfsapy.automata import dfa, nfa
 
@@ -26,86 +36,98 @@ class NfaToDfaConverter:
     The NFA must be free of empty transitions."""
 
     def __init__(self, nfa_automaton: nfa.Nfa):
-        self.nfa: nfa.Nfa = nfa_automaton
+        self.nfa: Optional[nfa.Nfa] = nfa_automaton
         """The input automaton."""
         self.dfa: dfa.Dfa = dfa.Dfa()
         """The resulting automaton."""
         idx0 = self.dfa.add_state()
-        self.queue: Queue = Queue()
-        """Queue for controlling the processing order."""
-        self.queue.put(idx0)
-        start_states = frozenset(self.nfa.starts)
-        self.state_represents: Dict[int, List[int]] = {idx0: list(start_states)}
-        """Maps a state index of the DFA to a set of NFA state indices."""
-        self.state_cache: Dict[FrozenSet[int], int] = {start_states: 0}
-        """Maps a set of NFA state indices to a DFA state index."""
+        self.queue: deque = deque([idx0])
+        """Indices of DFA states whose transitions have not been created."""
+        start_states = tuple(sorted(set(self.nfa.starts)))
+        self.state_represents: List[Tuple[int, ...]] = [start_states]
+        """Maps a state index of the DFA to the sorted NFA state indices
+        it represents."""
+        self.state_cache: Dict[Tuple[int, ...], int] = {start_states: idx0}
+        """Maps sorted NFA state indices to a DFA state index."""
 
     def start_conversion(self) -> dfa.Dfa:
-        while self.queue.qsize() > 0:
-            self.perform_step(self.queue.get())
-            self.queue.task_done()
+        """Converts the NFA. Afterwards the converter no longer
+        references it, as the NFA is usually much larger than the result."""
+        queue = self.queue
+        while queue:
+            self.perform_step(queue.popleft())
+        self.nfa = None
         return self.dfa
 
     def perform_step(self, dfa_start_state_idx: int):
-        symbol_transitions, non_word_char_transitions, accepts = (
-            self._collect_nfa_transitions(self.state_represents[dfa_start_state_idx])
+        symbol_transitions, non_word_char_transitions, accepts = combine_states(
+            self.nfa, self.state_represents[dfa_start_state_idx]
         )
         self._create_dfa_transitions(
             dfa_start_state_idx, symbol_transitions, non_word_char_transitions, accepts
         )
 
-    def _collect_nfa_transitions(self, states: Iterable[int]) -> Tuple:
-        symbol_transitions = defaultdict(set)
-        non_word_char_transitions = set()
-        accepts = set()
-        for nfa_start_idx in states:
-            for symbol, nfa_end_state_idxs in self.nfa.states[
-                nfa_start_idx
-            ].symbol_transitions.items():
-                symbol_transitions[symbol].update(nfa_end_state_idxs)
-            non_word_char_transitions.update(
-                self.nfa.states[nfa_start_idx].non_word_char_transitions
-            )
-            accepts.update(self.nfa.states[nfa_start_idx].accepts)
-        return symbol_transitions, non_word_char_transitions, accepts
-
     def _create_dfa_transitions(
         self,
         dfa_start_state_idx: int,
-        symbol_transitions: Dict[str, Set[int]],
-        non_word_char_transitions: Set[int],
-        accepts: Set[object],
+        symbol_transitions: Mapping[str, Collection[int]],
+        non_word_char_transitions: Collection[int],
+        accepts: Sequence[Any],
     ):
+        dfa_state = self.dfa.states[dfa_start_state_idx]
         for symbol, nfa_end_state_idxs in symbol_transitions.items():
-            dfa_end_state_idx = self._get_or_create_dfa_state(nfa_end_state_idxs)
-            self.dfa.set_symbol_transition(
-                dfa_start_state_idx, dfa_end_state_idx, symbol
+            dfa_state.symbol_transitions[symbol] = self._get_or_create_dfa_state(
+                nfa_end_state_idxs
             )
-        if len(non_word_char_transitions) > 0:
-            dfa_end_state_idx = self._get_or_create_dfa_state(non_word_char_transitions)
-            self.dfa.set_non_word_char_transition(
-                dfa_start_state_idx, dfa_end_state_idx
+        if non_word_char_transitions:
+            dfa_state.non_word_char_transition = self._get_or_create_dfa_state(
+                non_word_char_transitions
             )
-        if len(accepts) > 0:
-            self.dfa.add_acceptances(dfa_start_state_idx, accepts)
+        if accepts:
+            dfa_state.accepts = list(dict.fromkeys(accepts))
 
     def _get_or_create_dfa_state(self, state_idxs: Iterable[int]) -> int:
         """Retrieves a state index of the DFA representing a set of
         state indices in the NFA. If such a state does not exist,
         a new one will be created. The new State will also be added to
         the state lookup tables."""
-        frozen_states = frozenset(state_idxs)
+        key = tuple(sorted(state_idxs))
         try:
-            dfa_state_idx = self.state_cache[frozen_states]
+            return self.state_cache[key]
         except KeyError:
             dfa_state_idx = self.dfa.add_state()
-            self.queue.put(dfa_state_idx)
-            self.state_represents[dfa_state_idx] = list(frozen_states)
-            self.state_cache[frozen_states] = dfa_state_idx
-            acceptance: Set = set()
-            for state_idx in state_idxs:
-                acceptance.union(self.nfa.states[state_idx].accepts)
-            dfa_state = self.dfa.states[dfa_state_idx]
-            dfa_state.accepts = list(acceptance)
+            self.queue.append(dfa_state_idx)
+            self.state_represents.append(key)
+            self.state_cache[key] = dfa_state_idx
+            return dfa_state_idx
 
-        return dfa_state_idx
+
+def combine_states(
+    nfa_automaton: nfa.Nfa, states: Sequence[int]
+) -> Tuple[Mapping[str, Collection[int]], Collection[int], Sequence[Any]]:
+    """Combines the transitions and acceptances of NFA states.
+    Sets of the NFA are only copied if they have to be extended."""
+    nfa_states = nfa_automaton.states
+    if len(states) == 1:
+        # Most states of label automata represent a single NFA state,
+        # whose transitions can be used as they are.
+        nfa_state = nfa_states[states[0]]
+        return (
+            nfa_state.symbol_transitions,
+            nfa_state.non_word_char_transitions,
+            nfa_state.accepts,
+        )
+    symbol_transitions: Dict[str, Collection[int]] = {}
+    non_word_char_transitions: Set[int] = set()
+    accepts: Dict[Any, None] = {}
+    for nfa_start_idx in states:
+        nfa_state = nfa_states[nfa_start_idx]
+        for symbol, nfa_end_state_idxs in nfa_state.symbol_transitions.items():
+            collected = symbol_transitions.get(symbol)
+            if collected is None:
+                symbol_transitions[symbol] = nfa_end_state_idxs
+            else:
+                symbol_transitions[symbol] = {*collected, *nfa_end_state_idxs}
+        non_word_char_transitions.update(nfa_state.non_word_char_transitions)
+        accepts.update(dict.fromkeys(nfa_state.accepts))
+    return symbol_transitions, non_word_char_transitions, list(accepts)
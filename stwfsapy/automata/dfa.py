@@ -13,6 +13,7 @@
 # limitations under the License.
 
 
+import re
 from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 _KEY_STATE_SYMBOL_TRANSITIONS = "symbol_transitions"
@@ -20,6 +21,9 @@ _KEY_STATE_NON_WORD_CHAR_TRANSITION = "non_word_char_transitions"
 _KEY_STATE_ACCEPTS = "accepts"
 _KEY_DFA_STATES = "states"
 
+_NON_WORD_CHAR_CLASS = r"[\W_]"
+"""Matches exactly the symbols for which str.isalnum() is False."""
+
 
 class State:
 
@@ -119,7 +123,8 @@ class Dfa:
         # the beginning and end of a label. Therefore add them for search.
         search_text = f".{text}."
         last_end_position = 0
-        for start in range(len(search_text)):
+        starts = self._candidate_starts(search_text)
+        for start in starts:
             if start < last_end_position:
                 continue
             stack = [(0, start)]
@@ -152,6 +157,29 @@ class Dfa:
                 except KeyError:
                     pass
 
+    def _candidate_starts(self, search_text: str) -> Iterable[int]:
+        start_state = self.states[0]
+        if start_state.accepts:
+            return range(len(search_text))
+        follow_state = None
+        if not start_state.symbol_transitions and start_state.non_word_char_transition:
+            follow_state = self.states[start_state.non_word_char_transition]
+            if follow_state.accepts:
+                follow_state = None
+        if follow_state is None:
+            return candidate_starts(
+                search_text,
+                start_state.symbol_transitions,
+                bool(start_state.non_word_char_transition),
+            )
+        return candidate_starts(
+            search_text,
+            (),
+            True,
+            follow_state.symbol_transitions,
+            bool(follow_state.non_word_char_transition),
+        )
+
     def to_dict(self, acceptance_handler: Callable) -> Dict[str, Any]:
         return {
             _KEY_DFA_STATES: [
@@ -170,3 +198,54 @@ class Dfa:
 
     def __eq__(self, other):
         return isinstance(other, Dfa) and self.states == other.states
+
+
+def candidate_starts(
+    search_text: str,
+    start_symbols: Iterable[str],
+    start_non_word_char_transition: bool,
+    follow_symbols: Optional[Iterable[str]] = None,
+    follow_non_word_char_transition: bool = False,
+) -> Iterable[int]:
+    """Yields the positions in search_text at which the start state
+    has an outgoing transition.
+    A search starting at any other position fails at the first symbol.
+    For automata created by stwfsapy.automata.construction the start state
+    only has a non word char transition. Hence only word boundaries are
+    considered and all positions within words are skipped.
+
+    When follow_symbols is given, the symbol after the start position
+    must furthermore leave the state that is reached from the start state.
+    This is only valid if the start state has a single transition
+    and the reached state does not accept.
+
+    The candidates are computed in a single scan
+    by the regular expression engine."""
+    start_class = _symbol_class(start_symbols, start_non_word_char_transition)
+    if start_class is None:
+        return ()
+    if follow_symbols is None:
+        pattern = start_class
+    else:
+        follow_class = _symbol_class(follow_symbols, follow_non_word_char_transition)
+        if follow_class is None:
+            return ()
+        pattern = f"(?:{start_class})(?={follow_class})"
+    return (match.start() for match in re.finditer(pattern, search_text))
+
+
+def _symbol_class(symbols: Iterable[str], non_word_chars: bool) -> Optional[str]:
+    """Creates a regular expression matching any of the symbols.
+    Optionally also matches non word chars.
+    Returns None if nothing can be matched."""
+    alternatives = []
+    if non_word_chars:
+        alternatives.append(_NON_WORD_CHAR_CLASS)
+    escaped = "".join(
+        re.escape(symbol) for symbol in sorted(symbols) if len(symbol) == 1
+    )
+    if escaped:
+        alternatives.append(f"[{escaped}]")
+    if not alternatives:
+        return None
+    return "|".join(alternatives)
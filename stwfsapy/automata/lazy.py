@@ -0,0 +1,127 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Union
+
+from stwfsapy.automata import conversion, dfa, nfa
+
+Key = Union[int, FrozenSet[int]]
+"""Identifies a state of a LazyDfa. The start state is identified by 0,
+all other states by the indices of the NFA states they represent.
+Frozen sets are used as they store their hash."""
+
+
+class LazyDfa:
+    """Searches like the DFA converted from an NFA,
+    but only determinizes the states that are reached during search.
+    The NFA must be free of empty transitions.
+    At most max_states states are kept.
+    When this limit is reached,
+    the least recently used state is discarded.
+    It is determinized again when it is reached the next time."""
+
+    def __init__(self, nfa_automaton: nfa.Nfa, max_states: int = 100_000):
+        self.nfa: nfa.Nfa = nfa_automaton
+        """The automaton that is determinized."""
+        self.states: LazyStates = LazyStates(nfa_automaton, max_states)
+        """The determinized states, indexed by their key."""
+
+    # The search of Dfa only accesses the states by indexing
+    # and tests transitions for truthiness, which holds for keys as well.
+    search = dfa.Dfa.search
+    _candidate_starts = dfa.Dfa._candidate_starts
+
+    def to_dfa(self) -> dfa.Dfa:
+        """Converts all states of the NFA."""
+        return conversion.NfaToDfaConverter(self.nfa).start_conversion()
+
+
+class LazyStates:
+    """Bounded cache of determinized states.
+    The transitions of the states lead to the keys of their targets,
+    so that their targets can be discarded independently.
+    Transitions created after their target was determinized
+    use the key object of the cache,
+    so that looking up the target does not compare the NFA states."""
+
+    def __init__(self, nfa_automaton: nfa.Nfa, max_states: int):
+        if max_states < 1:
+            raise ValueError(f"max_states must be at least 1, but is {max_states}.")
+        self.nfa: nfa.Nfa = nfa_automaton
+        """The automaton that is determinized."""
+        self.max_states: int = max_states
+        """Maximal number of states in the cache."""
+        self.start: FrozenSet[int] = frozenset(nfa_automaton.starts)
+        """The NFA states represented by the start state."""
+        self.cache: OrderedDict[Key, dfa.State] = OrderedDict()
+        """The determinized states, from least to most recently used."""
+        self.keys: Dict[Key, Key] = {}
+        """Maps the keys of the cache to themselves."""
+
+    def __getitem__(self, key: Key) -> dfa.State:
+        cache = self.cache
+        try:
+            state = cache[key]
+        except KeyError:
+            pass
+        else:
+            cache.move_to_end(key)
+            return state
+        if len(cache) >= self.max_states:
+            evicted, _ = cache.popitem(last=False)
+            self.keys.pop(evicted, None)
+        if key == 0:
+            state = self._determinize(self.start)
+        else:
+            self.keys[key] = key
+            state = self._determinize(key)
+        cache[key] = state
+        return state
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def _determinize(self, nfa_state_idxs: FrozenSet[int]) -> dfa.State:
+        # Sorted as in the eager conversion, which determines
+        # the order of the acceptances.
+        symbol_transitions, non_word_char_transitions, accepts = (
+            conversion.combine_states(self.nfa, sorted(nfa_state_idxs))
+        )
+        return dfa.State(
+            {
+                symbol: self._key(nfa_end_state_idxs)
+                for symbol, nfa_end_state_idxs in symbol_transitions.items()
+            },
+            (
+                self._key(non_word_char_transitions)
+                if non_word_char_transitions
+                else None
+            ),
+            list(dict.fromkeys(accepts)),
+        )
+
+    def _key(self, nfa_state_idxs: Iterable[int]) -> Key:
+        key = frozenset(nfa_state_idxs)
+        if key == self.start:
+            return 0
+        return self.keys.get(key, key)
+
+    def __getstate__(self):
+        """The cache is not copied to other processes."""
+        state = dict(self.__dict__)
+        state["cache"] = OrderedDict()
+        state["keys"] = {}
+        return state
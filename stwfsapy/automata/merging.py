@@ -0,0 +1,192 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from stwfsapy.automata import compact, dfa
+
+
+def merge(automata: Sequence[compact.CompactDfa]) -> dfa.Dfa:
+    """Creates an automaton accepting everything
+    that is accepted by any of the given automata.
+    Each state of the result represents a tuple of states,
+    at most one from each input automaton.
+    If the input automata were converted from NFAs
+    with disjoint sets of states,
+    the result is the automaton that would have been converted
+    from the union of these NFAs, up to the numbering of the states."""
+    merged = dfa.Dfa()
+    start = tuple((automaton_idx, 0) for automaton_idx in range(len(automata)))
+    state_cache: Dict[Tuple[Tuple[int, int], ...], int] = {start: merged.add_state()}
+    queue = deque([start])
+    while queue:
+        key = queue.popleft()
+        merged_idx = state_cache[key]
+        if len(key) == 1:
+            _copy_state(merged, state_cache, queue, automata, merged_idx, key[0])
+            continue
+        symbol_transitions: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        non_word_char_transitions: List[Tuple[int, int]] = []
+        accepts = {}
+        for automaton_idx, state_idx in key:
+            automaton = automata[automaton_idx]
+            alphabet = automaton.alphabet
+            transition_symbols = automaton.transition_symbols
+            transition_targets = automaton.transition_targets
+            for ptr in range(
+                automaton.transition_offsets[state_idx],
+                automaton.transition_offsets[state_idx + 1],
+            ):
+                symbol_transitions[alphabet[transition_symbols[ptr]]].append(
+                    (automaton_idx, transition_targets[ptr])
+                )
+            non_word_char_transition = automaton.non_word_char_transitions[state_idx]
+            if non_word_char_transition >= 0:
+                non_word_char_transitions.append(
+                    (automaton_idx, non_word_char_transition)
+                )
+            accepts.update(dict.fromkeys(automaton.accepts(state_idx)))
+        for symbol, targets in symbol_transitions.items():
+            merged.set_symbol_transition(
+                merged_idx,
+                _get_or_create_state(merged, state_cache, queue, tuple(targets)),
+                symbol,
+            )
+        if non_word_char_transitions:
+            merged.set_non_word_char_transition(
+                merged_idx,
+                _get_or_create_state(
+                    merged, state_cache, queue, tuple(non_word_char_transitions)
+                ),
+            )
+        if accepts:
+            merged.add_acceptances(merged_idx, list(accepts))
+    return merged
+
+
+def _copy_state(
+    merged: dfa.Dfa,
+    state_cache: Dict[Tuple[Tuple[int, int], ...], int],
+    queue: deque,
+    automata: Sequence[compact.CompactDfa],
+    merged_idx: int,
+    component: Tuple[int, int],
+):
+    """Handles states that represent a state of a single automaton.
+    Their successors do so as well."""
+    automaton_idx, state_idx = component
+    automaton = automata[automaton_idx]
+    alphabet = automaton.alphabet
+    transition_symbols = automaton.transition_symbols
+    transition_targets = automaton.transition_targets
+    state = merged.states[merged_idx]
+    for ptr in range(
+        automaton.transition_offsets[state_idx],
+        automaton.transition_offsets[state_idx + 1],
+    ):
+        state.symbol_transitions[alphabet[transition_symbols[ptr]]] = (
+            _get_or_create_state(
+                merged,
+                state_cache,
+                queue,
+                ((automaton_idx, transition_targets[ptr]),),
+            )
+        )
+    non_word_char_transition = automaton.non_word_char_transitions[state_idx]
+    if non_word_char_transition >= 0:
+        state.non_word_char_transition = _get_or_create_state(
+            merged, state_cache, queue, ((automaton_idx, non_word_char_transition),)
+        )
+    state.accepts.extend(automaton.accepts(state_idx))
+
+
+def _get_or_create_state(
+    merged: dfa.Dfa,
+    state_cache: Dict[Tuple[Tuple[int, int], ...], int],
+    queue: deque,
+    key: Tuple[Tuple[int, int], ...],
+) -> int:
+    try:
+        return state_cache[key]
+    except KeyError:
+        merged_idx = merged.add_state()
+        state_cache[key] = merged_idx
+        queue.append(key)
+        return merged_idx
+
+
+def extend(automaton: dfa.Dfa, other: dfa.Dfa):
+    """Modifies the automaton in place,
+    such that it also accepts everything that is accepted by other.
+    Only the states reached by reading a prefix accepted by other
+    are changed. States that are only reachable from the start state
+    through these states may become unreachable.
+    They are kept, as removing them requires a pass over all states."""
+    start = (0, 0)
+    state_cache: Dict[Tuple[Optional[int], int], int] = {start: 0}
+    queue = deque([start])
+    while queue:
+        key = queue.popleft()
+        state = automaton.states[state_cache[key]]
+        other_state = other.states[key[1]]
+        for symbol, other_target in other_state.symbol_transitions.items():
+            state.symbol_transitions[symbol] = _get_or_create_product_state(
+                automaton,
+                state_cache,
+                queue,
+                (state.symbol_transitions.get(symbol), other_target),
+            )
+        if other_state.non_word_char_transition is not None:
+            state.non_word_char_transition = _get_or_create_product_state(
+                automaton,
+                state_cache,
+                queue,
+                (state.non_word_char_transition, other_state.non_word_char_transition),
+            )
+        for accept in other_state.accepts:
+            if accept not in state.accepts:
+                state.accepts.append(accept)
+
+
+def _get_or_create_product_state(
+    automaton: dfa.Dfa,
+    state_cache: Dict[Tuple[Optional[int], int], int],
+    queue: deque,
+    key: Tuple[Optional[int], int],
+) -> int:
+    """Returns the state reached by a prefix
+    that leads to key[0] in the automaton and to key[1] in the other automaton.
+    A new state starts as a copy of key[0], if present.
+    The original state is left unchanged,
+    as it may be reached by prefixes that are not accepted by the other automaton.
+    """
+    try:
+        return state_cache[key]
+    except KeyError:
+        idx = key[0]
+        if idx is None:
+            state = dfa.State()
+        else:
+            original = automaton.states[idx]
+            state = dfa.State(
+                dict(original.symbol_transitions),
+                original.non_word_char_transition,
+                list(original.accepts),
+            )
+        state_cache[key] = len(automaton.states)
+        automaton.states.append(state)
+        queue.append(key)
+        return state_cache[key]
@@ -0,0 +1,149 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from collections import deque
+from typing import Dict, Hashable, List, Optional
+
+from stwfsapy.automata import dfa
+
+
+def minimize(automaton: dfa.Dfa) -> dfa.Dfa:
+    """Creates an automaton with the fewest states
+    that yields the same search results.
+    States are merged when they have the same acceptances, in the same order,
+    and their transitions lead to merged states for the same symbols.
+    The start state is never merged with another state,
+    as transitions to it are ignored during search.
+    The states of the result are numbered in breadth first order."""
+    order = _reverse_topological_order(automaton)
+    if order is None:
+        blocks = _refine_blocks(automaton)
+    else:
+        blocks = _register_blocks(automaton, order)
+    return _build(automaton, blocks)
+
+
+def _signature(state: dfa.State, blocks: List[int]) -> Hashable:
+    non_word_char_transition = state.non_word_char_transition
+    return (
+        tuple(state.accepts),
+        tuple(
+            sorted(
+                (symbol, blocks[target])
+                for symbol, target in state.symbol_transitions.items()
+            )
+        ),
+        None if non_word_char_transition is None else blocks[non_word_char_transition],
+    )
+
+
+def _register_blocks(automaton: dfa.Dfa, order: List[int]) -> List[int]:
+    """Merges the states of an acyclic automaton in a single pass.
+    As the successors of a state are processed before the state,
+    their blocks are final when the signature of the state is computed."""
+    blocks = [-1] * len(automaton.states)
+    register: Dict[Hashable, int] = {}
+    for idx in order:
+        if idx == 0:
+            blocks[idx] = len(register)
+            register[None] = blocks[idx]
+        else:
+            signature = _signature(automaton.states[idx], blocks)
+            blocks[idx] = register.setdefault(signature, len(register))
+    return blocks
+
+
+def _refine_blocks(automaton: dfa.Dfa) -> List[int]:
+    """Moore's partition refinement for automata with cycles.
+    Starts with blocks of states with equal acceptances
+    and splits them until all states in a block have equal signatures."""
+    initial: Dict[Hashable, int] = {}
+    blocks = [
+        initial.setdefault(None if idx == 0 else tuple(state.accepts), len(initial))
+        for idx, state in enumerate(automaton.states)
+    ]
+    n_blocks = len(initial)
+    while True:
+        refined: Dict[Hashable, int] = {}
+        blocks = [
+            refined.setdefault((blocks[idx], _signature(state, blocks)), len(refined))
+            for idx, state in enumerate(automaton.states)
+        ]
+        if len(refined) == n_blocks:
+            return blocks
+        n_blocks = len(refined)
+
+
+def _reverse_topological_order(automaton: dfa.Dfa) -> Optional[List[int]]:
+    """Orders the states such that each state comes after its successors.
+    Returns None if the automaton contains a cycle."""
+    n_predecessors = [0] * len(automaton.states)
+    for state in automaton.states:
+        for target in _successors(state):
+            n_predecessors[target] += 1
+    order = [idx for idx, count in enumerate(n_predecessors) if count == 0]
+    for idx in order:
+        for target in _successors(automaton.states[idx]):
+            n_predecessors[target] -= 1
+            if n_predecessors[target] == 0:
+                order.append(target)
+    if len(order) < len(automaton.states):
+        return None
+    order.reverse()
+    return order
+
+
+def _successors(state: dfa.State) -> List[int]:
+    successors = list(state.symbol_transitions.values())
+    if state.non_word_char_transition is not None:
+        successors.append(state.non_word_char_transition)
+    return successors
+
+
+def _build(automaton: dfa.Dfa, blocks: List[int]) -> dfa.Dfa:
+    """Creates one state per block, reachable from the start state."""
+    minimized = dfa.Dfa()
+    new_indices = {blocks[0]: minimized.add_state()}
+    queue = deque([0])
+    while queue:
+        idx = queue.popleft()
+        state = automaton.states[idx]
+        new_state = minimized.states[new_indices[blocks[idx]]]
+        for symbol, target in state.symbol_transitions.items():
+            new_state.symbol_transitions[symbol] = _new_index(
+                minimized, new_indices, queue, blocks, target
+            )
+        if state.non_word_char_transition is not None:
+            new_state.non_word_char_transition = _new_index(
+                minimized, new_indices, queue, blocks, state.non_word_char_transition
+            )
+        new_state.accepts = list(state.accepts)
+    return minimized
+
+
+def _new_index(
+    minimized: dfa.Dfa,
+    new_indices: Dict[int, int],
+    queue: deque,
+    blocks: List[int],
+    idx: int,
+) -> int:
+    block = blocks[idx]
+    try:
+        return new_indices[block]
+    except KeyError:
+        new_indices[block] = minimized.add_state()
+        queue.append(idx)
+        return new_indices[block]
@@ -13,27 +13,63 @@
 # limitations under the License.
 
 
-from collections import defaultdict
-from typing import Any, DefaultDict, List, Set
+from types import MappingProxyType
+from typing import Any, Collection, List, Mapping, Sequence
 
-from stwfsapy.automata.heap import BinaryMinHeap
+_VISITING = 1
+_DONE = 2
+
+_NO_TRANSITIONS: Mapping[str, Collection[int]] = MappingProxyType({})
 
 
 class State:
+    """A state of an NFA.
+    Label automata have millions of states,
+    most of which have a single outgoing transition.
+    Therefore states have no instance dictionary,
+    a single target state is stored in a tuple instead of a set
+    and empty containers are shared between all states."""
+
+    __slots__ = (
+        "symbol_transitions",
+        "non_word_char_transitions",
+        "empty_transitions",
+        "incoming_empty_transitions",
+        "accepts",
+    )
 
     def __init__(self):
-        self.symbol_transitions: DefaultDict[str, Set[int]] = defaultdict(set)
+        self.symbol_transitions: Mapping[str, Collection[int]] = _NO_TRANSITIONS
         """Determines the states that can be reached
         by consuming a character."""
-        self.non_word_char_transitions: Set[int] = set()
-        """Is not None if there is a transition via a non word symbol."""
-        self.empty_transitions: Set[int] = set()
+        self.non_word_char_transitions: Collection[int] = ()
+        """States that can be reached by consuming a non word symbol."""
+        self.empty_transitions: Collection[int] = ()
         """What can be reached using the empty String/Symbol."""
-        self.incoming_empty_transitions: Set[int] = set()
+        self.incoming_empty_transitions: Collection[int] = ()
         """How this state can be reached using the empty String/Symbol."""
-        self.accepts: List[Any] = []
+        self.accepts: Sequence[Any] = ()
         """What is accepted by this State."""
 
+    def __getstate__(self):
+        return (
+            self.symbol_transitions or None,
+            self.non_word_char_transitions,
+            self.empty_transitions,
+            self.incoming_empty_transitions,
+            self.accepts,
+        )
+
+    def __setstate__(self, state):
+        (
+            symbol_transitions,
+            self.non_word_char_transitions,
+            self.empty_transitions,
+            self.incoming_empty_transitions,
+            self.accepts,
+        ) = state
+        self.symbol_transitions = symbol_transitions or _NO_TRANSITIONS
+
 
 class Nfa:
 
@@ -55,51 +91,114 @@ class Nfa:
 
     def add_acceptance(self, idx, accept):
         """Add acceptance to a state. The state is identified by its index."""
-        self.states[idx].accepts.append(accept)
+        state = self.states[idx]
+        if not state.accepts:
+            state.accepts = [accept]
+        else:
+            state.accepts.append(accept)
 
     def add_symbol_transition(self, start: int, end: int, symbol: str):
         """Add a symbol consuming transition between two states.
         The states are represented by their indices."""
-        transitions = self.states[start].symbol_transitions
-        transitions[symbol].add(end)
+        state = self.states[start]
+        transitions = state.symbol_transitions
+        if not transitions:
+            state.symbol_transitions = {symbol: (end,)}
+        else:
+            transitions[symbol] = _added(transitions.get(symbol, ()), end)
 
     def add_empty_transition(self, start: int, end: int):
         """Add an empty Transition between two states.
         This transition does not consume a symbol.
         The states are represented by their indices."""
-        self.states[start].empty_transitions.add(end)
-        self.states[end].incoming_empty_transitions.add(start)
+        start_state = self.states[start]
+        start_state.empty_transitions = _added(start_state.empty_transitions, end)
+        end_state = self.states[end]
+        end_state.incoming_empty_transitions = _added(
+            end_state.incoming_empty_transitions, start
+        )
 
     def add_non_word_char_transition(self, start: int, end: int):
         """Add a non word char consuming transition between two states.
         The states are represented by their indices."""
-        self.states[start].non_word_char_transitions.add(end)
+        state = self.states[start]
+        state.non_word_char_transitions = _added(state.non_word_char_transitions, end)
 
     def remove_empty_transitions(self):
         """Removes all empty transitions in the NFA.
-        Does not support loops of empty transitions."""
-        queue = BinaryMinHeap()
-        for idx in range(len(self.states)):
-            if len(self.states[idx].incoming_empty_transitions) > 0:
-                queue.push(idx, len(self.states[idx].empty_transitions))
-        while len(queue.heap) > 0:
-            ptr_idx = queue.pop()
-            ptr = self.states[ptr_idx]
-            if len(ptr.empty_transitions) > 0:
-                raise Exception("There is an empty transition loop in the NFA.")
-            for incoming_idx in ptr.incoming_empty_transitions.copy():
-                incoming = self.states[incoming_idx]
-                self._remove_empty_transition(incoming_idx, incoming, ptr_idx, ptr)
-                if len(incoming.incoming_empty_transitions) > 0:
-                    queue.change_priority(incoming_idx, len(incoming.empty_transitions))
-
-    def _remove_empty_transition(
-        self, start_idx: int, start: State, end_idx: int, end: State
-    ):
-        for symbol, states in end.symbol_transitions.items():
-            for state_idx in states:
-                start.symbol_transitions[symbol].add(state_idx)
-        for state_idx in end.non_word_char_transitions:
-            start.non_word_char_transitions.add(state_idx)
-        start.empty_transitions.discard(end_idx)
-        end.incoming_empty_transitions.discard(start_idx)
+        States are processed in reverse topological order
+        of the empty transitions, so that the transitions of a state
+        are final before they are copied to its predecessors.
+        Raises an EmptyTransitionLoopException
+        if there is a loop of empty transitions."""
+        states = self.states
+        status = bytearray(len(states))
+        for root_idx, root in enumerate(states):
+            if status[root_idx] or not root.empty_transitions:
+                continue
+            status[root_idx] = _VISITING
+            stack = [(root_idx, iter(root.empty_transitions))]
+            while stack:
+                idx, successors = stack[-1]
+                for successor_idx in successors:
+                    successor_status = status[successor_idx]
+                    if successor_status == _DONE:
+                        continue
+                    if successor_status == _VISITING:
+                        raise EmptyTransitionLoopException(successor_idx)
+                    status[successor_idx] = _VISITING
+                    stack.append(
+                        (successor_idx, iter(states[successor_idx].empty_transitions))
+                    )
+                    break
+                else:
+                    stack.pop()
+                    status[idx] = _DONE
+                    self._inline_empty_transitions(idx, states[idx])
+
+    def _inline_empty_transitions(self, idx: int, state: State):
+        """Copies the transitions of all states reachable by
+        a single empty transition. Their empty transitions
+        have to be removed already."""
+        for successor_idx in state.empty_transitions:
+            successor = self.states[successor_idx]
+            for symbol, state_idxs in successor.symbol_transitions.items():
+                for state_idx in state_idxs:
+                    self.add_symbol_transition(idx, state_idx, symbol)
+            for state_idx in successor.non_word_char_transitions:
+                self.add_non_word_char_transition(idx, state_idx)
+            successor.incoming_empty_transitions = _removed(
+                successor.incoming_empty_transitions, idx
+            )
+        state.empty_transitions = ()
+
+
+def _added(states: Collection[int], idx: int) -> Collection[int]:
+    """Adds a state index to a collection of state indices.
+    A tuple holding a single index is replaced by a set."""
+    if isinstance(states, set):
+        states.add(idx)
+        return states
+    if not states:
+        return (idx,)
+    if idx in states:
+        return states
+    return {*states, idx}
+
+
+def _removed(states: Collection[int], idx: int) -> Collection[int]:
+    if isinstance(states, set):
+        states.discard(idx)
+        return states
+    return tuple(other for other in states if other != idx)
+
+
+class EmptyTransitionLoopException(Exception):
+    """Raised when the empty transitions of an NFA form a loop."""
+
+    def __init__(self, state_idx: int, message: str = ""):
+        super().__init__(
+            message or f"There is an empty transition loop through state {state_idx}."
+        )
+        self.state_idx: int = state_idx
+        """Index of a state on the loop."""
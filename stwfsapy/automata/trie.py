@@ -0,0 +1,221 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from stwfsapy.automata import dfa
+
+Atom = Tuple[str, bool]
+"""The symbols one of which is consumed, and whether the atom is optional."""
+
+_MAX_VARIANTS = 16
+"""Expressions with more alternatives of several symbols
+are left to the general construction."""
+
+
+def parse(expression: str) -> Optional[List[List[Atom]]]:
+    """Splits an expression into sequences of atoms,
+    whose union is the language of the expression.
+    Supports symbols, escaped symbols and groups of alternatives
+    without nested groups, each optionally followed by a single '?'.
+    Groups whose alternatives are single symbols become a single atom.
+    Other groups are expanded into one sequence per alternative.
+    Returns None for any other expression,
+    e.g., if it contains a Kleene closure or alternatives outside of a group."""
+    variants: List[List[Atom]] = [[]]
+    idx = 0
+    while idx < len(expression):
+        symbol = expression[idx]
+        if symbol == "\\":
+            if idx + 1 == len(expression):
+                return None
+            alternatives = [expression[idx + 1]]
+            idx += 2
+        elif symbol == "(":
+            group = _parse_group(expression, idx + 1)
+            if group is None:
+                return None
+            alternatives, idx = group
+        elif symbol in ")|?*":
+            return None
+        else:
+            alternatives = [symbol]
+            idx += 1
+        optional = expression.startswith("?", idx)
+        if optional:
+            idx += 1
+            if expression.startswith("?", idx) or expression.startswith("*", idx):
+                return None
+        if "" in alternatives:
+            optional = True
+            alternatives = [alternative for alternative in alternatives if alternative]
+        if not alternatives:
+            continue
+        if all(len(alternative) == 1 for alternative in alternatives):
+            atom = ("".join(alternatives), optional)
+            for variant in variants:
+                variant.append(atom)
+            continue
+        expanded = []
+        for variant in variants:
+            if optional:
+                expanded.append(variant)
+            for alternative in alternatives:
+                expanded.append(variant + [(symbol, False) for symbol in alternative])
+        if len(expanded) > _MAX_VARIANTS:
+            return None
+        variants = expanded
+    return variants
+
+
+def _parse_group(expression: str, idx: int) -> Optional[Tuple[List[str], int]]:
+    """Parses the alternatives of a group starting at idx.
+    Returns them together with the index after the closing brace."""
+    alternatives = []
+    current: List[str] = []
+    while idx < len(expression):
+        symbol = expression[idx]
+        if symbol == "\\":
+            if idx + 1 == len(expression):
+                return None
+            current.append(expression[idx + 1])
+            idx += 2
+        elif symbol == "|":
+            alternatives.append("".join(current))
+            current = []
+            idx += 1
+        elif symbol == ")":
+            alternatives.append("".join(current))
+            return alternatives, idx + 1
+        elif symbol in "(?*":
+            return None
+        else:
+            current.append(symbol)
+            idx += 1
+    return None
+
+
+class TrieBuilder:
+    """Creates the automaton for expressions supported by parse
+    without an NFA.
+    Each sequence of atoms occupies consecutive positions:
+    one per atom, one after the last atom
+    and one after the non word char following the expression,
+    which accepts. A state of the automaton represents
+    the positions that are reached by the same prefix.
+    The automaton is a trie of the expressions,
+    except that the symbols of an atom lead to the same state.
+    It accepts the same language as the one converted from the NFA
+    of the expressions, and both are equal after minimization."""
+
+    def __init__(self):
+        self.symbols: List[Optional[str]] = []
+        """Symbols of the atom at each position.
+        None for positions after the last atom."""
+        self.optional: List[bool] = []
+        """Whether the atom at each position is optional."""
+        self.accepts: Dict[int, Tuple[Any, ...]] = {}
+        """Acceptances of accepting positions."""
+        self.starts: List[int] = []
+        """First position of each sequence."""
+
+    def add(self, expression: str, accept: Any, *accepts: Any) -> bool:
+        """Adds an expression if it is supported by parse.
+        Returns whether it was added."""
+        variants = parse(expression)
+        if variants is None:
+            return False
+        for atoms in variants:
+            self.starts.append(len(self.symbols))
+            for symbols, optional in atoms:
+                self.symbols.append(symbols)
+                self.optional.append(optional)
+            self.symbols.extend((None, None))
+            self.optional.extend((False, False))
+            self.accepts[len(self.symbols) - 1] = (accept, *accepts)
+        return True
+
+    def to_dfa(self) -> dfa.Dfa:
+        automaton = dfa.Dfa()
+        automaton.add_state()
+        if not self.starts:
+            return automaton
+        represents: List[Tuple[int, ...]] = [()]
+        state_cache: Dict[Tuple[int, ...], int] = {}
+        queue: deque = deque()
+        automaton.states[0].non_word_char_transition = self._get_or_create_state(
+            automaton, represents, state_cache, queue, self.starts
+        )
+        symbols = self.symbols
+        optional = self.optional
+        accepting = self.accepts
+        while queue:
+            state_idx = queue.popleft()
+            symbol_targets: Dict[str, List[int]] = {}
+            non_word_char_targets = []
+            accepts = []
+            for position in represents[state_idx]:
+                position_accepts = accepting.get(position)
+                if position_accepts is not None:
+                    accepts.extend(position_accepts)
+                    continue
+                while True:
+                    atom_symbols = symbols[position]
+                    if atom_symbols is None:
+                        non_word_char_targets.append(position + 1)
+                        break
+                    for symbol in atom_symbols:
+                        targets = symbol_targets.get(symbol)
+                        if targets is None:
+                            symbol_targets[symbol] = [position + 1]
+                        else:
+                            targets.append(position + 1)
+                    if not optional[position]:
+                        break
+                    position += 1
+            state = automaton.states[state_idx]
+            for symbol, targets in symbol_targets.items():
+                state.symbol_transitions[symbol] = self._get_or_create_state(
+                    automaton, represents, state_cache, queue, targets
+                )
+            if non_word_char_targets:
+                state.non_word_char_transition = self._get_or_create_state(
+                    automaton, represents, state_cache, queue, non_word_char_targets
+                )
+            if accepts:
+                state.accepts = list(dict.fromkeys(accepts))
+        return automaton
+
+    @staticmethod
+    def _get_or_create_state(
+        automaton: dfa.Dfa,
+        represents: List[Tuple[int, ...]],
+        state_cache: Dict[Tuple[int, ...], int],
+        queue: deque,
+        positions: Sequence[int],
+    ) -> int:
+        if len(positions) == 1:
+            key = (positions[0],)
+        else:
+            key = tuple(sorted(set(positions)))
+        try:
+            return state_cache[key]
+        except KeyError:
+            state_idx = automaton.add_state()
+            represents.append(key)
+            state_cache[key] = state_idx
+            queue.append(state_idx)
+            return state_idx
@@ -13,32 +13,46 @@
 # limitations under the License.
 
 
-from collections import OrderedDict, defaultdict
+from collections import defaultdict
 from math import log
 
 import numpy as np
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.exceptions import NotFittedError
 
+from stwfsapy.util.columns import column, flat_column
+
 
 class FrequencyFeatures(BaseEstimator, TransformerMixin):
 
     def __init__(self):
         self.idfs_ = None
         self.log_doc_count_ = None
+        self.concept_counts_ = None
+        self.doc_count_ = None
 
     def fit(self, X, y=None):
-        concept_counts = defaultdict(int)
-        concepts = []
+        self.concept_counts_ = defaultdict(int)
         # count one doc more to cover case where a concept does not appear.
-        doc_count = 1
-        for x in X:
-            concepts.append(x[0])
-            if x[-1] == 1:
+        self.doc_count_ = 1
+        return self.partial_fit(X)
+
+    def partial_fit(self, X, y=None):
+        """Updates the document frequencies with additional documents.
+        The matches of each document have to be contained
+        in a single call."""
+        if self.concept_counts_ is None:
+            return self.fit(X)
+        concept_counts = self.concept_counts_
+        concepts = []
+        for concept, doc_end in zip(column(X, 0), column(X, -1)):
+            concepts.append(concept)
+            if doc_end == 1:
                 for concept in concepts:
                     concept_counts[concept] += 1
-                doc_count += 1
+                self.doc_count_ += 1
                 concepts = []
+        doc_count = self.doc_count_
         self.log_doc_count_ = log(doc_count)
         idfs = dict()
         for concept, count in concept_counts.items():
@@ -47,25 +61,29 @@ class FrequencyFeatures(BaseEstimator, TransformerMixin):
         return self
 
     def transform(self, X, y=None):
+        """Computes the term frequency of each match within its document,
+        the inverse document frequency of its concept and their product.
+        Each concept may only occur once per document.
+        Matches after the last end of a document are left at zero."""
         if self.idfs_ is None:
             raise NotFittedError
         ret = np.zeros((len(X), 3))
-        concept_counts = OrderedDict()
-        ret_ptr = 0
-        doc_concept_sum = 0
-        for x in X:
-            concept = x[0]
-            concept_count = len(x[1])
-            concept_counts[concept] = concept_count
-            doc_concept_sum += concept_count
-            if x[-1] == 1:
-                for concept, count in concept_counts.items():
-                    tf = count / doc_concept_sum
-                    idf = self.idfs_.get(concept, self.log_doc_count_)
-                    ret[ret_ptr, 0] = tf
-                    ret[ret_ptr, 1] = idf
-                    ret[ret_ptr, 2] = tf * idf
-                    ret_ptr += 1
-                doc_concept_sum = 0
-                concept_counts = OrderedDict()
+        if len(X) == 0:
+            return ret
+        counts = np.diff(flat_column(X, 1)[1]).astype(float)
+        doc_ends = np.asarray(column(X, -1)) == 1
+        idfs = np.fromiter(
+            (self.idfs_.get(concept, self.log_doc_count_) for concept in column(X, 0)),
+            dtype=float,
+            count=len(X),
+        )
+        n_complete = np.flatnonzero(doc_ends)[-1] + 1 if doc_ends.any() else 0
+        doc_starts = np.flatnonzero(np.concatenate([[True], doc_ends[:-1]]))
+        doc_starts = doc_starts[doc_starts < n_complete]
+        doc_lengths = np.diff(np.append(doc_starts, n_complete))
+        doc_sums = np.add.reduceat(counts[:n_complete], doc_starts)
+        tfs = counts[:n_complete] / np.repeat(doc_sums, doc_lengths)
+        ret[:n_complete, 0] = tfs
+        ret[:n_complete, 1] = idfs[:n_complete]
+        ret[:n_complete, 2] = tfs * idfs[:n_complete]
         return ret
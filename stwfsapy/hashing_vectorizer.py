@@ -0,0 +1,80 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from itertools import islice
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.exceptions import NotFittedError
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+class HashingTfidfVectorizer(BaseEstimator, TransformerMixin):
+    """Tf-idf representation of texts without a vocabulary.
+    Tokens are hashed to a fixed number of features
+    and only the inverse document frequency of each feature is stored.
+    Apart from collisions of hashes, the results equal those of
+    sklearn's TfidfVectorizer with its default parameters."""
+
+    def __init__(
+        self, input: str = "content", n_features: int = 2**20, batch_size: int = 1000
+    ):
+        """Creates the vectorizer.
+
+        :param input: Type of the texts, as for sklearn's vectorizers.
+        :param n_features: Number of features the tokens are hashed to.
+            The memory consumption and the size of the fitted vectorizer
+            are proportional to it.
+        :param batch_size: Number of texts that are hashed at once
+            while counting the document frequencies.
+        """
+        self.input = input
+        self.n_features = n_features
+        self.batch_size = batch_size
+        self.idf_ = None
+
+    def fit(self, X, y=None):
+        """Counts the documents containing each feature.
+        X is iterated once, in batches."""
+        hashing = self._hashing_vectorizer()
+        doc_freqs = np.zeros(self.n_features, dtype=np.int64)
+        n_docs = 0
+        texts = iter(X)
+        while True:
+            batch = list(islice(texts, self.batch_size))
+            if not batch:
+                break
+            counts = hashing.transform(batch)
+            doc_freqs += np.bincount(counts.indices, minlength=self.n_features)
+            n_docs += len(batch)
+        self.idf_ = (np.log((1 + n_docs) / (1 + doc_freqs)) + 1).astype(np.float32)
+        return self
+
+    def transform(self, X) -> csr_matrix:
+        if self.idf_ is None:
+            raise NotFittedError
+        counts = self._hashing_vectorizer().transform(X)
+        counts.data *= self.idf_[counts.indices]
+        return normalize(counts, copy=False)
+
+    def _hashing_vectorizer(self) -> HashingVectorizer:
+        """Token counts with sklearn's default preprocessing."""
+        return HashingVectorizer(
+            input=self.input,
+            n_features=self.n_features,
+            alternate_sign=False,
+            norm=None,
+        )
@@ -0,0 +1,197 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.sparse import spmatrix, vstack
+
+COLUMN_CONCEPT = 0
+COLUMN_TEXT_FEATURES = 1
+COLUMN_TEXT_VECTOR = 2
+COLUMN_TEXT_LENGTH = 3
+COLUMN_POSITIONS = 4
+COLUMN_DOCUMENT_END = 5
+N_COLUMNS = 6
+
+
+class MatchBatch:
+    """Concepts matched in a batch of documents.
+    Behaves like a two dimensional array with one row per match
+    and the columns concept, text features, text vector, text length,
+    positions and document end.
+    The document end is 1 for the last match of each document and 0 otherwise.
+    Values that are the same for all matches of a document
+    are stored once per document.
+    Selecting columns with batch[:, columns] creates a batch
+    that shares the data and only shows the selected columns.
+    A single column is returned as a list or an array."""
+
+    def __init__(
+        self,
+        concepts: List[str],
+        doc_ids: np.ndarray,
+        positions: np.ndarray,
+        position_offsets: np.ndarray,
+        text_features: np.ndarray,
+        text_vectors: Optional[spmatrix],
+        text_lengths: np.ndarray,
+        columns: Sequence[int] = tuple(range(N_COLUMNS)),
+    ):
+        self.concepts: List[str] = concepts
+        """Concept of each match."""
+        self.doc_ids: np.ndarray = doc_ids
+        """Index of the document of each match.
+        The matches of a document are consecutive."""
+        self.positions: np.ndarray = positions
+        """Start positions of all matches in their text."""
+        self.position_offsets: np.ndarray = position_offsets
+        """Start of the positions of each match.
+        Contains one additional entry marking the end of the last match."""
+        self.text_features: np.ndarray = text_features
+        """Text features of each document."""
+        self.text_vectors: Optional[spmatrix] = text_vectors
+        """Text vector of each document, if text vectors are used."""
+        self.text_lengths: np.ndarray = text_lengths
+        """Length of the text of each document."""
+        self.columns: Tuple[int, ...] = tuple(columns)
+        """Columns of the full batch that are shown."""
+
+    @staticmethod
+    def concatenate(batches: Sequence["MatchBatch"]) -> "MatchBatch":
+        """Joins the documents of several batches.
+        Batches without documents are skipped."""
+        batches = [batch for batch in batches if len(batch.text_lengths) > 0]
+        if not batches:
+            return MatchBatch(
+                [],
+                np.zeros(0, dtype=np.intp),
+                np.zeros(0, dtype=np.int64),
+                np.zeros(1, dtype=np.intp),
+                np.zeros((0, 0)),
+                None,
+                np.zeros(0, dtype=np.int64),
+            )
+        doc_offsets = np.cumsum([0] + [len(batch.text_lengths) for batch in batches])
+        position_offsets = [np.zeros(1, dtype=np.intp)]
+        n_positions = 0
+        for batch in batches:
+            position_offsets.append(batch.position_offsets[1:] + n_positions)
+            n_positions += len(batch.positions)
+        if batches[0].text_vectors is not None:
+            text_vectors = vstack([batch.text_vectors for batch in batches], "csr")
+        else:
+            text_vectors = None
+        return MatchBatch(
+            [concept for batch in batches for concept in batch.concepts],
+            np.concatenate(
+                [
+                    batch.doc_ids + doc_offset
+                    for batch, doc_offset in zip(batches, doc_offsets)
+                ]
+            ),
+            np.concatenate([batch.positions for batch in batches]),
+            np.concatenate(position_offsets),
+            np.vstack([batch.text_features for batch in batches]),
+            text_vectors,
+            np.concatenate([batch.text_lengths for batch in batches]),
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.concepts), len(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.concepts)
+
+    def __getitem__(self, key):
+        """Returns the match at an index as a tuple,
+        or the columns selected by a key of the form (slice(None), columns)."""
+        if not isinstance(key, tuple):
+            if key < 0:
+                key += len(self)
+            if not 0 <= key < len(self):
+                raise IndexError("Match index out of range.")
+            return tuple(self._value(column, key) for column in self.columns)
+        rows, columns = key
+        if rows != slice(None):
+            raise IndexError("Only columns can be selected from a MatchBatch.")
+        if isinstance(columns, (int, np.integer)):
+            return self.column(columns)
+        return MatchBatch(
+            self.concepts,
+            self.doc_ids,
+            self.positions,
+            self.position_offsets,
+            self.text_features,
+            self.text_vectors,
+            self.text_lengths,
+            [self.columns[column] for column in np.arange(self.shape[1])[columns]],
+        )
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        ret = np.empty(self.shape, dtype=object)
+        for idx in range(len(self)):
+            for column_idx, column in enumerate(self.columns):
+                ret[idx, column_idx] = self._value(column, idx)
+        return ret
+
+    def column(self, idx: int) -> Sequence:
+        """Values of a shown column for all matches."""
+        column = self.columns[idx]
+        if column == COLUMN_CONCEPT:
+            return self.concepts
+        if column == COLUMN_TEXT_FEATURES:
+            return self.text_features[self.doc_ids]
+        if column == COLUMN_TEXT_VECTOR:
+            if self.text_vectors is None:
+                return [0] * len(self)
+            return self.text_vectors[self.doc_ids]
+        if column == COLUMN_TEXT_LENGTH:
+            return self.text_lengths[self.doc_ids]
+        if column == COLUMN_POSITIONS:
+            return [self._value(column, idx) for idx in range(len(self))]
+        return self.document_ends()
+
+    def flat_column(self, idx: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Values and offsets of a shown column that holds the positions."""
+        if self.columns[idx] != COLUMN_POSITIONS:
+            raise ValueError(f"Column {idx} does not hold positions.")
+        return self.positions, self.position_offsets
+
+    def document_ends(self) -> np.ndarray:
+        ends = np.ones(len(self), dtype=np.int64)
+        ends[:-1] = self.doc_ids[:-1] != self.doc_ids[1:]
+        return ends
+
+    def _value(self, column: int, idx: int) -> Any:
+        if column == COLUMN_CONCEPT:
+            return self.concepts[idx]
+        if column == COLUMN_TEXT_FEATURES:
+            return self.text_features[self.doc_ids[idx]]
+        if column == COLUMN_TEXT_VECTOR:
+            if self.text_vectors is None:
+                return 0
+            return self.text_vectors[self.doc_ids[idx]]
+        if column == COLUMN_TEXT_LENGTH:
+            return int(self.text_lengths[self.doc_ids[idx]])
+        if column == COLUMN_POSITIONS:
+            return self.positions[
+                self.position_offsets[idx] : self.position_offsets[idx + 1]
+            ].tolist()
+        return int(idx == len(self) - 1 or self.doc_ids[idx] != self.doc_ids[idx + 1])
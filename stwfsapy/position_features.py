@@ -16,6 +16,8 @@
 import numpy as np
 from sklearn.base import BaseEstimator, TransformerMixin
 
+from stwfsapy.util.columns import column, flat_column
+
 
 class PositionFeatures(BaseEstimator, TransformerMixin):
 
@@ -23,14 +25,14 @@ class PositionFeatures(BaseEstimator, TransformerMixin):
         return self
 
     def transform(self, X, y=None):
-        out = np.zeros((len(X), 3))
-        for idx, x in enumerate(X):
-            positions = x[1]
-            min_pos = min(positions)
-            max_pos = max(positions)
-            spread = max_pos - min_pos
-            txt_len = x[0]
-            out[idx][0] = min_pos / txt_len
-            out[idx][1] = max_pos / txt_len
-            out[idx][2] = spread / txt_len
-        return out
+        """Computes the first and last position of each match
+        and their distance, relative to the length of the text."""
+        if len(X) == 0:
+            return np.zeros((0, 3))
+        txt_lens = np.asarray(column(X, 0), dtype=float)
+        positions, offsets = flat_column(X, 1)
+        min_pos = np.minimum.reduceat(positions, offsets[:-1])
+        max_pos = np.maximum.reduceat(positions, offsets[:-1])
+        return np.column_stack(
+            [min_pos / txt_lens, max_pos / txt_lens, (max_pos - min_pos) / txt_lens]
+        )
@@ -14,16 +14,35 @@
 
 
 import pickle as pkl
+from bisect import bisect_right
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+from io import StringIO
+from itertools import islice, repeat
 from json import dumps, loads
 from logging import getLogger
-from typing import Container, Dict, FrozenSet, Iterable, List, Tuple, TypeVar, Union
-from zipfile import ZipFile
+from os import PathLike, fspath
+from struct import Struct
+from typing import (
+    Container,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from zipfile import ZIP_STORED, ZipFile, ZipInfo
 
-from numpy import array
+from joblib import effective_n_jobs
+from numpy import array, column_stack, concatenate, empty, int64, intp
 from rdflib import Graph
 from rdflib.term import URIRef
-from scipy.sparse import csr_matrix, spmatrix
+from scipy.sparse import csr_matrix, hstack, vstack
 from sklearn.base import BaseEstimator, ClassifierMixin
 from sklearn.compose import ColumnTransformer
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -32,11 +51,33 @@ from sklearn.tree import DecisionTreeClassifier
 
 from stwfsapy import case_handlers, expansion
 from stwfsapy import thesaurus as t
-from stwfsapy.automata import construction, conversion, dfa, nfa
+from stwfsapy.automata import (
+    compact,
+    construction,
+    conversion,
+    dfa,
+    lazy,
+    merging,
+    minimization,
+    nfa,
+    trie,
+)
 from stwfsapy.frequency_features import FrequencyFeatures
+from stwfsapy.hashing_vectorizer import HashingTfidfVectorizer
+from stwfsapy.match_batch import MatchBatch
 from stwfsapy.position_features import PositionFeatures
 from stwfsapy.text_features import mk_text_features
 from stwfsapy.thesaurus_features import ThesaurusFeatureTransformation
+from stwfsapy.util.binary_format import (
+    UnknownFormatException,
+    int_bytes,
+    read_ints,
+    read_sections,
+    read_strings,
+    string_table,
+    write_sections,
+)
+from stwfsapy.util.columns import column
 from stwfsapy.util.input_handler import get_input_handler
 from stwfsapy.util.passthrough_transformer import PassthroughTransformer
 
@@ -55,19 +96,57 @@ _KEY_REMOVE_DEPRECATED = "remove_deprecated"
 _KEY_LANGS = "langs"
 _KEY_INPUT = "input"
 _KEY_USE_TXT_VEC = "use_txt_vec"
+_KEY_TXT_VEC_BACKEND = "txt_vec_backend"
+_KEY_TXT_VEC_N_FEATURES = "txt_vec_n_features"
 _KEY_HANDLE_TITLE_CASE = "handle_title_case"
 _KEY_EXTRACT_UPPER_CASE_FROM_BRACES = "extract_upper_case_from_braces"
 _KEY_EXTRACT_ANY_CASE_FROM_BRACES = "extract_any_key_from_braces"
 _KEY_EXPAND_AMPERSAND_WITH_SPACES = "expand_ampersand_with_spaces"
 _KEY_EXPAND_ABBREVIATION_WITH_PUNCTUATION = "expand_abbreviation_with_punctuation"
 _KEY_SIMPLE_ENGLISH_PLURAL_RULES = "simple_english_plural_rules"
+_KEY_COMPACT_DFA = "compact_dfa"
+_KEY_MINIMIZE_DFA = "minimize_dfa"
+_KEY_LAZY_DFA = "lazy_dfa"
+_KEY_LAZY_DFA_MAX_STATES = "lazy_dfa_max_states"
+_KEY_FORMAT_VERSION = "format_version"
 
+_LEGACY_FORMAT_VERSION = 1
+"""Models without a format version store the automaton
+and the concept map in predictor.json."""
+
+_FORMAT_VERSION = 2
+"""Version of the model format written by StwfsapyPredictor.store."""
+
+_CONCEPT_MAP_MAGIC = b"STWFSCPT"
+_CONCEPT_MAP_FORMAT_VERSION = 1
+
+_NAME_CONCEPT_MAP_FILE = "concept_map.bin"
+_NAME_DFA_FILE = "dfa.bin"
 _NAME_GRAPH_FILE = "graph.rdf"
 _NAME_PIPELINE_FILE = "pipeline.pkl"
 _NAME_PREDICTOR_FILE = "predictor.json"
 _NAME_TEXT_FEATURES_FILE = "text_features.pkl"
 _NAME_TEXT_VECTORIZER_FILE = "text_vectorizer.pkl"
 
+_PARALLEL_CHUNK_SIZE = 32
+"""Number of documents sent to a worker process at once."""
+
+_SHARDS_PER_JOB = 4
+"""Number of label shards per worker process
+when constructing the automaton in parallel."""
+
+TXT_VEC_TFIDF = "tfidf"
+"""Text vector backend that stores the vocabulary of the training texts."""
+
+TXT_VEC_HASHING = "hashing"
+"""Text vector backend that hashes tokens to a fixed number of features."""
+
+_ZIP_LOCAL_HEADER = Struct("<4s22xHH")
+"""Signature, file name length and extra field length
+of a local file header in a zip file."""
+
+_ZIP_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
 _logger = getLogger("stwfsa")
 
 
@@ -75,6 +154,12 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
     """Finds labels of thesaurus concepts in texts
     and assigns them a score."""
 
+    _graph_path = None
+    """Zip file the graph is parsed from by get_graph,
+    for predictors loaded with lazy_graph."""
+    _graph_predicates: Optional[FrozenSet[URIRef]] = None
+    """Predicates of the triples kept when the graph is parsed by get_graph."""
+
     def __init__(
         self,
         graph: Graph,
@@ -86,12 +171,19 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
         langs: FrozenSet[str] = frozenset(),
         input: str = "content",
         use_txt_vec: bool = False,
+        txt_vec_backend: str = TXT_VEC_TFIDF,
+        txt_vec_n_features: int = 2**20,
         handle_title_case: bool = True,
         extract_upper_case_from_braces: bool = True,
         extract_any_case_from_braces: bool = False,
         expand_ampersand_with_spaces: bool = True,
         expand_abbreviation_with_punctuation: bool = True,
         simple_english_plural_rules: bool = False,
+        compact_dfa: bool = False,
+        n_jobs: int = 1,
+        minimize_dfa: bool = False,
+        lazy_dfa: bool = False,
+        lazy_dfa_max_states: int = 100_000,
     ):
         """Creates the predictor.
 
@@ -129,6 +221,17 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
         :param  use_txt_vec:
             Whether to use vectorized representations of inputs.
             This can lead to high memory consumption.
+        :param  txt_vec_backend:
+            How texts are vectorized when use_txt_vec is set:
+
+                * 'tfidf': Tf-idf with a vocabulary of all tokens
+                  in the training texts.
+                * 'hashing': Tf-idf of tokens hashed to txt_vec_n_features
+                  features. Memory consumption and model size do not
+                  depend on the vocabulary and the training texts
+                  are processed in batches.
+        :param  txt_vec_n_features:
+            Number of features of the 'hashing' text vector backend.
         :param  handle_title_case:
             When True, will also match labels in title case.
             I.e., in a text the first letter of every word can be upper
@@ -163,15 +266,49 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
           match text with punctuation added. I.e., G.D.P. for label GDP.
         :param simple_english_plural_rules:
           Can detect simple English plural forms of labels.
+        :param compact_dfa:
+          Stores the automaton in flat arrays
+          instead of one Python object per state.
+          This considerably reduces the memory consumption
+          for large thesauri.
+        :param n_jobs:
+          Number of processes used for constructing the automaton
+          and for matching labels in texts.
+          The automaton is sent to each worker process once.
+          Inputs of at most one chunk are matched without worker processes.
+          -1 uses all processors. Not stored with the predictor.
+        :param minimize_dfa:
+          Merges equivalent states of the automaton after its construction.
+          This takes additional time during fitting,
+          but results in a smaller automaton with the same matches.
+        :param lazy_dfa:
+          Only determinizes the states of the automaton
+          that are reached while matching texts.
+          Fitting is faster, as the automaton is not converted up front,
+          while the matches are the same.
+          The automaton is neither minimized nor compacted.
+          The full automaton is converted when the predictor is stored.
+        :param lazy_dfa_max_states:
+          Maximal number of determinized states kept by each process
+          when lazy_dfa is set. When it is reached, the least recently used
+          state is discarded for each newly determinized state.
+          Discarded states are determinized again when they are reached.
+          Must be at least 1.
         """
         self.graph = graph
-        if isinstance(concept_type_uri, str):
+        if isinstance(concept_type_uri, str) and not isinstance(
+            concept_type_uri, URIRef
+        ):
             concept_type_uri = URIRef(concept_type_uri)
         self.concept_type_uri = concept_type_uri
-        if isinstance(sub_thesaurus_type_uri, str):
+        if isinstance(sub_thesaurus_type_uri, str) and not isinstance(
+            sub_thesaurus_type_uri, URIRef
+        ):
             sub_thesaurus_type_uri = URIRef(sub_thesaurus_type_uri)
         self.sub_thesaurus_type_uri = sub_thesaurus_type_uri
-        if isinstance(thesaurus_relation_type_uri, str):
+        if isinstance(thesaurus_relation_type_uri, str) and not isinstance(
+            thesaurus_relation_type_uri, URIRef
+        ):
             thesaurus_relation_type_uri = URIRef(thesaurus_relation_type_uri)
         self.thesaurus_relation_type_uri = thesaurus_relation_type_uri
         self.thesaurus_relation_is_specialisation = thesaurus_relation_is_specialisation
@@ -179,37 +316,226 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
         self.langs = langs
         self.input = input
         self.use_txt_vec = use_txt_vec
+        self.txt_vec_backend = txt_vec_backend
+        self.txt_vec_n_features = txt_vec_n_features
         self.handle_title_case = handle_title_case
         self.extract_upper_case_from_braces = extract_upper_case_from_braces
         self.extract_any_case_from_braces = extract_any_case_from_braces
         self.expand_ampersand_with_spaces = expand_ampersand_with_spaces
         self.expand_abbreviation_with_punctuation = expand_abbreviation_with_punctuation
         self.simple_english_plural_rules = simple_english_plural_rules
+        self.compact_dfa = compact_dfa
+        self.n_jobs = n_jobs
+        self.minimize_dfa = minimize_dfa
+        self.lazy_dfa = lazy_dfa
+        self.lazy_dfa_max_states = lazy_dfa_max_states
+
+    def get_graph(self) -> Optional[Graph]:
+        """Returns the SKOS ontology used to extract the labels.
+        For predictors loaded with lazy_graph,
+        the graph is parsed from the zip file on the first call
+        and assigned to the graph attribute."""
+        if self.graph is None and self._graph_path is not None:
+            with ZipFile(self._graph_path, "r") as zfile:
+                self.graph = _parse_graph(
+                    zfile.read(_NAME_GRAPH_FILE), self._graph_predicates
+                )
+            self._graph_path = None
+        return self.graph
 
     def _init(self):
-        all_deprecated = set(t.extract_deprecated(self.graph))
+        graph = self.get_graph()
+        all_deprecated = set(t.extract_deprecated(graph))
         concepts = set(
-            t.extract_by_type_uri(
-                self.graph, self.concept_type_uri, remove=all_deprecated
-            )
+            t.extract_by_type_uri(graph, self.concept_type_uri, remove=all_deprecated)
         )
         thesauri = set(
             t.extract_by_type_uri(
-                self.graph, self.sub_thesaurus_type_uri, remove=all_deprecated
+                graph, self.sub_thesaurus_type_uri, remove=all_deprecated
             )
         )
         self.concept_map_ = dict(zip(map(str, concepts), range(len(concepts))))
         thesaurus_features = ThesaurusFeatureTransformation(
-            self.graph,
+            graph,
             concepts,
             thesauri,
             self.thesaurus_relation_type_uri,
             self.thesaurus_relation_is_specialisation,
         )
-        labels = t.retrieve_concept_labels(
-            self.graph, allowed=concepts, langs=self.langs
+        labels = t.retrieve_concept_labels(graph, allowed=concepts, langs=self.langs)
+        self._set_dfa(self._build_dfa(labels))
+        self.text_features_ = mk_text_features().fit([])
+        transformations = [
+            ("Thesaurus Features", thesaurus_features, 0),
+            ("Text Features", PassthroughTransformer(), 1),
+            ("Position Features", PositionFeatures(), [3, 4]),
+            ("Frequency Features", FrequencyFeatures(), [0, 4, 5]),
+        ]
+        if self.use_txt_vec:
+            self.text_vectorizer_ = self._create_text_vectorizer()
+            transformations.append(
+                ("Text Vector", PassthroughTransformer(), 2),
+            )
+        else:
+            self.text_vectorizer_ = None
+        self.pipeline_ = Pipeline(
+            [
+                ("Combined Features", ColumnTransformer(transformations)),
+                (
+                    "Classifier",
+                    DecisionTreeClassifier(min_samples_leaf=25, max_leaf_nodes=100),
+                ),
+            ]
         )
-        nfautomat = nfa.Nfa()
+
+    def _create_text_vectorizer(self):
+        if self.txt_vec_backend == TXT_VEC_TFIDF:
+            return TfidfVectorizer(input=self.input)
+        if self.txt_vec_backend == TXT_VEC_HASHING:
+            return HashingTfidfVectorizer(
+                input=self.input, n_features=self.txt_vec_n_features
+            )
+        raise ValueError(f"Unknown text vector backend {self.txt_vec_backend}.")
+
+    def update_labels(self, graph: Graph):
+        """
+        Updates the automaton to the labels of a new release of the thesaurus,
+        without fitting the classifier again.
+        Only the labels of concepts whose labels differ between the releases
+        are processed. The concepts are removed from the acceptances
+        of the automaton and the automaton for their current labels
+        is merged into it in place.
+        With lazy_dfa, the automaton is created again for all labels,
+        which is fast as it is not converted up front.
+        Concepts that are new in the release are appended to the concept map.
+        Until the predictor is fit again,
+        they have no thesaurus features and concepts
+        that were removed from the thesaurus keep their index.
+
+        :params  graph: The new release of the thesaurus.
+
+        Returns:
+            self: The updated StwfsapyPredictor instance.
+        """
+        if self.get_graph() is None:
+            raise ValueError(
+                "Updating the labels requires the graph the predictor was fit with."
+            )
+        old_labels = self._concept_labels(self.graph)
+        new_labels = self._concept_labels(graph)
+        changed = {
+            concept
+            for concept in old_labels.keys() | new_labels.keys()
+            if set(old_labels.get(concept, ())) != set(new_labels.get(concept, ()))
+        }
+        if changed and self.lazy_dfa:
+            self._set_dfa(
+                self._build_dfa(
+                    (concept, label)
+                    for concept, concept_labels in new_labels.items()
+                    for label in concept_labels
+                )
+            )
+        elif changed:
+            labels = [
+                (concept, label)
+                for concept, concept_labels in new_labels.items()
+                if concept in changed
+                for label in concept_labels
+            ]
+            added = self._build_dfa(labels)
+            if isinstance(self.dfa_, compact.CompactDfa):
+                automaton = self.dfa_.to_dfa()
+            else:
+                automaton = self.dfa_
+            removed = set(map(str, changed))
+            for state in automaton.states:
+                if state.accepts:
+                    state.accepts = [
+                        accept for accept in state.accepts if accept not in removed
+                    ]
+            merging.extend(automaton, added)
+            self._set_dfa(automaton)
+        for concept in new_labels:
+            self.concept_map_.setdefault(str(concept), len(self.concept_map_))
+        self.graph = graph
+        _logger.info("Updated the labels of %d concepts.", len(changed))
+        return self
+
+    def _concept_labels(self, graph: Graph) -> Dict[URIRef, List[str]]:
+        """Maps all concepts that are not deprecated to their labels."""
+        concepts = t.extract_by_type_uri(
+            graph, self.concept_type_uri, remove=set(t.extract_deprecated(graph))
+        )
+        labels: Dict[URIRef, List[str]] = {concept: [] for concept in concepts}
+        for concept, label in t.retrieve_concept_labels(
+            graph, allowed=set(labels), langs=self.langs
+        ):
+            if concept in labels:
+                labels[concept].append(label)
+        return labels
+
+    def _build_dfa(
+        self, labels: Iterable[Tuple[URIRef, str]]
+    ) -> Union[dfa.Dfa, lazy.LazyDfa]:
+        if self.lazy_dfa:
+            return lazy.LazyDfa(self._construct_nfa(labels), self.lazy_dfa_max_states)
+        if effective_n_jobs(self.n_jobs) > 1:
+            return self._construct_dfa_parallel(labels)
+        return self._construct_dfa(labels)
+
+    def _set_dfa(self, automaton: Union[dfa.Dfa, lazy.LazyDfa]):
+        """Minimizes and compacts the automaton if requested."""
+        if isinstance(automaton, lazy.LazyDfa):
+            self.dfa_ = automaton
+            return
+        if self.minimize_dfa:
+            n_states = len(automaton.states)
+            automaton = minimization.minimize(automaton)
+            _logger.info(
+                "Minimized automaton from %d to %d states.",
+                n_states,
+                len(automaton.states),
+            )
+        if self.compact_dfa:
+            automaton = compact.CompactDfa.from_dfa(automaton)
+        self.dfa_ = automaton
+
+    def _construct_dfa(self, labels: Iterable[Tuple[URIRef, str]]) -> dfa.Dfa:
+        """Creates an automaton recognizing the labels of concepts.
+        Labels whose expressions are supported by the trie builder
+        bypass the nondeterministic automaton."""
+        builder = trie.TrieBuilder()
+        remaining = [
+            (expression, concept_labels)
+            for expression, concept_labels in self._expression_groups(labels).items()
+            if not builder.add(expression, *map(str, concept_labels))
+        ]
+        automaton = builder.to_dfa()
+        if remaining:
+            # No reference to the converter is kept,
+            # so that the NFA is freed before merging.
+            merging.extend(
+                automaton,
+                conversion.NfaToDfaConverter(
+                    self._expression_nfa(remaining)
+                ).start_conversion(),
+            )
+        return automaton
+
+    def _construct_nfa(self, labels: Iterable[Tuple[URIRef, str]]) -> nfa.Nfa:
+        """Creates a nondeterministic automaton without empty transitions
+        recognizing the labels of concepts."""
+        return self._expression_nfa(self._expression_groups(labels).items())
+
+    def _expression_groups(
+        self, labels: Iterable[Tuple[URIRef, str]]
+    ) -> Dict[str, Dict[URIRef, str]]:
+        """Expands the labels of concepts into expressions.
+        Maps each expression to the concepts having a label with this expression
+        and to the first such label of each concept.
+        Identical labels, e.g., in several languages,
+        are only expanded once."""
         if self.handle_title_case:
             case_handler = case_handlers.title_case_handler
         else:
@@ -229,56 +555,108 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
             def plural_fun(x):
                 return x
 
+        expressions: Dict[str, str] = {}
+        groups: Dict[str, Dict[URIRef, str]] = defaultdict(dict)
         for concept, label in labels:
-            expanded = label
-            for f in expansion_funs:
-                expanded = f(expanded)
+            text = str(label)
+            expression = expressions.get(text)
+            if expression is None:
+                expanded = text
+                for f in expansion_funs:
+                    expanded = f(expanded)
+                expression = plural_fun(case_handler(expanded))
+                expressions[text] = expression
+            groups[expression].setdefault(concept, label)
+        return groups
+
+    @staticmethod
+    def _expression_nfa(
+        expression_groups: Iterable[Tuple[str, Dict[URIRef, str]]],
+    ) -> nfa.Nfa:
+        """Constructs each expression once, accepting all of its concepts.
+        Raises an EmptyTransitionLoopException naming a label
+        if an expression contains a loop of empty transitions."""
+        nfautomat = nfa.Nfa()
+        first_states = []
+        labels = []
+        for expression, concept_labels in expression_groups:
+            first_states.append(len(nfautomat.states))
+            concept, label = next(iter(concept_labels.items()))
+            labels.append((concept, label))
             _handle_construction(
                 construction.ConstructionState(
-                    nfautomat, plural_fun(case_handler(expanded)), str(concept)
+                    nfautomat, expression, *map(str, concept_labels)
                 ),
                 concept,
                 label,
             )
-        nfautomat.remove_empty_transitions()
-        converter = conversion.NfaToDfaConverter(nfautomat)
-        self.dfa_ = converter.start_conversion()
-        self.text_features_ = mk_text_features().fit([])
-        transformations = [
-            ("Thesaurus Features", thesaurus_features, 0),
-            ("Text Features", PassthroughTransformer(), 1),
-            ("Position Features", PositionFeatures(), [3, 4]),
-            ("Frequency Features", FrequencyFeatures(), [0, 4, 5]),
-        ]
-        if self.use_txt_vec:
-            self.text_vectorizer_ = TfidfVectorizer(input=self.input)
-            transformations.append(
-                ("Text Vector", PassthroughTransformer(), 2),
+        try:
+            nfautomat.remove_empty_transitions()
+        except nfa.EmptyTransitionLoopException as exc:
+            concept, label = labels[bisect_right(first_states, exc.state_idx) - 1]
+            raise nfa.EmptyTransitionLoopException(
+                exc.state_idx,
+                "There is an empty transition loop in the expression"
+                f' of label "{label}" of concept "{concept}".',
+            ) from exc
+        return nfautomat
+
+    def _construct_dfa_parallel(self, labels: Iterable[Tuple[URIRef, str]]) -> dfa.Dfa:
+        """Splits the labels by their first letter.
+        The automata for the shards are created in worker processes
+        and merged into a single automaton."""
+        n_jobs = effective_n_jobs(self.n_jobs)
+        shards = [[] for _ in range(n_jobs * _SHARDS_PER_JOB)]
+        for concept, label in labels:
+            shards[_shard_index(label, len(shards))].append((concept, label))
+        constructor = self._construction_copy()
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            automata = list(
+                executor.map(
+                    _construct_shard,
+                    repeat(constructor),
+                    [shard for shard in shards if shard],
+                )
             )
-        else:
-            self.text_vectorizer_ = None
-        self.pipeline_ = Pipeline(
-            [
-                ("Combined Features", ColumnTransformer(transformations)),
-                (
-                    "Classifier",
-                    DecisionTreeClassifier(min_samples_leaf=25, max_leaf_nodes=100),
-                ),
-            ]
+        return merging.merge(automata)
+
+    def _construction_copy(self) -> "StwfsapyPredictor":
+        """Creates a predictor that only holds
+        what is needed by _construct_dfa."""
+        return StwfsapyPredictor(
+            None,
+            None,
+            handle_title_case=self.handle_title_case,
+            extract_upper_case_from_braces=self.extract_upper_case_from_braces,
+            extract_any_case_from_braces=self.extract_any_case_from_braces,
+            expand_ampersand_with_spaces=self.expand_ampersand_with_spaces,
+            expand_abbreviation_with_punctuation=(
+                self.expand_abbreviation_with_punctuation
+            ),
+            simple_english_plural_rules=self.simple_english_plural_rules,
+            minimize_dfa=self.minimize_dfa,
         )
 
-    def fit(self, X, y=None, **kwargs):
+    def fit(self, X, y=None, batch_size: Optional[int] = None, **kwargs):
         """
         Fits the classifier to the given training data.
 
         :params  X: Iterable of text inputs.
         :params  y: Iterable of correct concepts given by their URI for supervised
         training.
+        :params  batch_size: When given, the texts are matched and turned
+            into features in batches of this many texts.
+            Only a sparse feature matrix is kept in memory,
+            instead of the matches of all texts.
+            If use_txt_vec is set, X is iterated twice
+            and must therefore not be an iterator.
 
         Returns:
             self: The fitted StwfsapyPredictor instance.
         """
         self._init()
+        if batch_size is not None:
+            return self._fit_in_batches(X, y, batch_size)
         return self._fit_after_init(X, y=y)
 
     def _fit_after_init(self, X, y=None):
@@ -288,6 +666,86 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
         self.pipeline_.fit(matches, y=train_y)
         return self
 
+    def _fit_in_batches(self, X, y, batch_size: int):
+        if self.use_txt_vec:
+            if iter(X) is X:
+                raise TypeError(
+                    "X is iterated twice when use_txt_vec is set"
+                    " and can not be an iterator."
+                )
+            self.text_vectorizer_.fit(X)
+        features = self.pipeline_.named_steps["Combined Features"]
+        frequency_features = None
+        chunks = []
+        chunk_concepts = []
+        chunk_ys = []
+        for matches, batch_y in self._iter_match_batches(X, y, batch_size):
+            if not matches:
+                continue
+            if frequency_features is None:
+                chunk = features.fit_transform(matches)
+                frequency_features = features.named_transformers_["Frequency Features"]
+            else:
+                frequency_features.partial_fit(matches)
+                chunk = features.transform(matches)
+            chunks.append(csr_matrix(chunk))
+            chunk_concepts.append(
+                array([self.concept_map_[concept] for concept in column(matches, 0)])
+            )
+            chunk_ys.append(array(batch_y))
+        if not chunks:
+            raise ValueError("No concepts were matched in the training texts.")
+        # The document frequencies are only known after all batches.
+        idfs = empty(len(self.concept_map_))
+        for concept, idx in self.concept_map_.items():
+            idfs[idx] = frequency_features.idfs_.get(
+                concept, frequency_features.log_doc_count_
+            )
+        columns = features.output_indices_["Frequency Features"]
+        for idx, (chunk, concepts) in enumerate(zip(chunks, chunk_concepts)):
+            tf = chunk[:, columns.start].toarray().ravel()
+            idf = idfs[concepts]
+            chunks[idx] = hstack(
+                [
+                    chunk[:, : columns.start],
+                    csr_matrix(column_stack([tf, idf, tf * idf])),
+                    chunk[:, columns.stop :],
+                ],
+                format="csr",
+            )
+        self.pipeline_.named_steps["Classifier"].fit(
+            vstack(chunks, format="csr"), concatenate(chunk_ys)
+        )
+        return self
+
+    def _iter_match_batches(
+        self,
+        inputs: Iterable[str],
+        truth_refss: Optional[Iterable[Container]],
+        batch_size: int,
+    ) -> Iterator[Tuple[MatchBatch, List[int]]]:
+        """Yields the result of match_and_extend
+        for consecutive batches of batch_size inputs."""
+        if truth_refss is None:
+            batches = ((batch, None) for batch in _chunked(inputs, batch_size))
+        else:
+            batches = (
+                tuple(zip(*batch))
+                for batch in _chunked(zip(inputs, truth_refss), batch_size)
+            )
+        if batch_size > _PARALLEL_CHUNK_SIZE and effective_n_jobs(self.n_jobs) > 1:
+            with self._match_executor() as executor:
+                for batch, batch_truth in batches:
+                    if len(batch) > _PARALLEL_CHUNK_SIZE:
+                        yield self._match_and_extend_parallel(
+                            batch, batch_truth, executor
+                        )
+                    else:
+                        yield self.match_and_extend(batch, batch_truth)
+        else:
+            for batch, batch_truth in batches:
+                yield self.match_and_extend(batch, batch_truth)
+
     def predict_proba(self, X) -> csr_matrix:
         """
         Predicts probability scores for each concept per document.
@@ -303,9 +761,7 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
             predictions = self.pipeline_.predict_proba(match_X)[:, 1]
         else:
             predictions = []
-        return self._create_sparse_matrix(
-            predictions, [tpl[0] for tpl in match_X], doc_counts
-        )
+        return self._create_sparse_matrix(predictions, column(match_X, 0), doc_counts)
 
     def suggest_proba(self, texts) -> List[List[Tuple[str, float]]]:
         """
@@ -319,12 +775,37 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
             (concept, probability).
         """
         match_X, doc_counts = self.match_and_extend(texts)
+        return self._suggest_from_matches(match_X, doc_counts)
+
+    def iter_suggest_proba(
+        self, texts: Iterable[str], batch_size: int = 1000
+    ) -> Iterator[List[Tuple[str, float]]]:
+        """
+        Lazily computes the same suggestions as suggest_proba.
+        The texts are consumed and classified in batches,
+        so memory consumption does not depend on the number of texts.
+
+        :params  texts: Iterable of strings (documents).
+        :params  batch_size: Number of texts that are classified together.
+
+        Returns:
+            An iterator yielding a list of (concept, probability) tuples
+            for each text.
+        """
+        for match_X, doc_counts in self._iter_match_batches(texts, None, batch_size):
+            yield from self._suggest_from_matches(match_X, doc_counts)
+
+    def _suggest_from_matches(
+        self,
+        match_X: MatchBatch,
+        doc_counts: List[int],
+    ) -> List[List[Tuple[str, float]]]:
         if match_X:
             predictions = self.pipeline_.predict_proba(match_X)[:, 1]
         else:
             predictions = []
         combined = StwfsapyPredictor._collect_prediction_results(
-            predictions, [tpl[0] for tpl in match_X], doc_counts
+            predictions, column(match_X, 0), doc_counts
         )
         return [
             [(concept, score) for concept, score in zip(concepts, scores)]
@@ -346,9 +827,7 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
             predictions = self.pipeline_.predict(match_X)
         else:
             predictions = []
-        return self._create_sparse_matrix(
-            predictions, [tpl[0] for tpl in match_X], doc_counts
-        )
+        return self._create_sparse_matrix(predictions, column(match_X, 0), doc_counts)
 
     def _create_sparse_matrix(
         self, values: Nl, concept_names: List[str], doc_counts: List[int]
@@ -382,67 +861,128 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
 
     def match_and_extend(
         self, inputs: Iterable[str], truth_refss: Iterable[Container] = None
-    ) -> Tuple[List[Tuple[str, spmatrix, array, int, List[int], int]], List[int]]:
+    ) -> Tuple[MatchBatch, List[int]]:
         """Retrieves concepts by their labels from text.
+        The matches are returned as a MatchBatch,
+        which is the input of the pipeline.
         If ground truth values are present,
         it will also return a list of labels for scoring matches.
         If no ground truth values are present, a list
         with the number of matched concepts for each document is returned."""
-        concepts = []
+        if effective_n_jobs(self.n_jobs) > 1:
+            # Worker processes are only started for more than one chunk.
+            inputs = list(inputs)
+            if len(inputs) > _PARALLEL_CHUNK_SIZE:
+                return self._match_and_extend_parallel(inputs, truth_refss)
         input_handler = get_input_handler(self.input)
-        if truth_refss is not None:
-            ret_y = []
-            for inp, truth_refs in zip(inputs, map(str, truth_refss)):
-                text = input_handler(inp)
-                if self.use_txt_vec:
-                    txt_vec = self.text_vectorizer_.transform([inp])[0]
-                else:
-                    txt_vec = 0
-                txt_feat = self.text_features_.transform([text])[0]
-                matched_concepts: Dict[str, List[int]] = defaultdict(list)
-                for match in self.dfa_.search(text):
-                    concept = match[0]
-                    position = match[2]
-                    matched_concepts[concept].append(position)
-                for concept, positions in matched_concepts.items():
-                    concepts.append(
-                        (concept, txt_feat, txt_vec, len(text), positions, 0)
-                    )
-                    ret_y.append(int(concept in truth_refs))
-                self._mark_last_concept_in_doc(concepts)
-            return concepts, ret_y
+        if truth_refss is None:
+            docs = zip(inputs, repeat(None))
         else:
-            doc_counts: List[int] = []
-            for inp in inputs:
-                text = input_handler(inp)
-                if self.use_txt_vec:
-                    txt_vec = self.text_vectorizer_.transform([inp])[0]
-                else:
-                    txt_vec = 0
-                txt_feat = self.text_features_.transform([text])[0]
-                matched_concepts = defaultdict(list)
-                for match in self.dfa_.search(text):
-                    concept = match[0]
-                    position = match[2]
-                    matched_concepts[concept].append(position)
-                for concept, positions in matched_concepts.items():
-                    concepts.append(
-                        (concept, txt_feat, txt_vec, len(text), positions, 0)
-                    )
-                self._mark_last_concept_in_doc(concepts)
-                doc_counts.append(len(matched_concepts))
-            return concepts, doc_counts
+            docs = zip(inputs, map(str, truth_refss))
+        concepts = []
+        doc_ids = []
+        positions = []
+        position_offsets = [0]
+        texts = []
+        counts_or_y = []
+        for doc_idx, (inp, truth_refs) in enumerate(docs):
+            text = input_handler(inp)
+            texts.append(text)
+            matched_concepts: Dict[str, List[int]] = defaultdict(list)
+            for match in self.dfa_.search(text):
+                concept = match[0]
+                position = match[2]
+                matched_concepts[concept].append(position)
+            for concept, concept_positions in matched_concepts.items():
+                concepts.append(concept)
+                doc_ids.append(doc_idx)
+                positions.extend(concept_positions)
+                position_offsets.append(len(positions))
+                if truth_refs is not None:
+                    counts_or_y.append(int(concept in truth_refs))
+            if truth_refs is None:
+                counts_or_y.append(len(matched_concepts))
+        if not texts:
+            # The feature transformations require at least one text.
+            return MatchBatch.concatenate([]), counts_or_y
+        matches = MatchBatch(
+            concepts,
+            array(doc_ids, dtype=intp),
+            array(positions, dtype=int64),
+            array(position_offsets, dtype=intp),
+            self.text_features_.transform(texts),
+            self._vectorize_texts(texts) if self.use_txt_vec else None,
+            array([len(text) for text in texts], dtype=int64),
+        )
+        return matches, counts_or_y
 
-    def _mark_last_concept_in_doc(self, concepts):
-        if concepts:
-            last = concepts.pop()
-            concepts.append((last[0], last[1], last[2], last[3], last[4], 1))
+    def _vectorize_texts(self, texts: List[str]) -> csr_matrix:
+        """Vectorizes texts that were already read by the input handler
+        in a single call."""
+        vectorizer = self.text_vectorizer_
+        if vectorizer.input != "content":
+            vectorizer = copy(vectorizer)
+            vectorizer.input = "content"
+        return vectorizer.transform(texts)
 
-    def store(self, path):
+    def _match_and_extend_parallel(
+        self,
+        inputs: Iterable[str],
+        truth_refss: Iterable[Container] = None,
+        executor: ProcessPoolExecutor = None,
+    ) -> Tuple[MatchBatch, List[int]]:
+        """Distributes chunks of the inputs to a pool of worker processes.
+        The results are concatenated in the order of the inputs.
+        A new pool is created if no executor is given."""
+        if executor is None:
+            with self._match_executor() as executor:
+                return self._match_and_extend_parallel(inputs, truth_refss, executor)
+        if self.input == "file":
+            # File objects can not be sent to other processes.
+            inputs = (StringIO(get_input_handler("file")(inp)) for inp in inputs)
+        if truth_refss is None:
+            chunks = ((chunk, None) for chunk in _chunked(inputs, _PARALLEL_CHUNK_SIZE))
+        else:
+            chunks = (
+                tuple(zip(*chunk))
+                for chunk in _chunked(zip(inputs, truth_refss), _PARALLEL_CHUNK_SIZE)
+            )
+        batches = []
+        counts_or_y = []
+        for chunk_matches, chunk_counts_or_y in executor.map(_match_chunk, chunks):
+            batches.append(chunk_matches)
+            counts_or_y.extend(chunk_counts_or_y)
+        return MatchBatch.concatenate(batches), counts_or_y
+
+    def _match_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=effective_n_jobs(self.n_jobs),
+            initializer=_init_match_worker,
+            initargs=(self._matching_copy(),),
+        )
+
+    def _matching_copy(self) -> "StwfsapyPredictor":
+        """Creates a predictor that only holds
+        what is needed by match_and_extend."""
+        matcher = StwfsapyPredictor(
+            None,
+            None,
+            input=self.input,
+            use_txt_vec=self.use_txt_vec,
+        )
+        matcher.dfa_ = self.dfa_
+        matcher.text_features_ = self.text_features_
+        matcher.text_vectorizer_ = self.text_vectorizer_
+        return matcher
+
+    def store(self, path, include_graph: bool = True):
         """
         Stores a predictor instance into a zip file.
 
         :params  path: Path to the zip file storing the trained predictor.
+        :params  include_graph: When false, the graph is not stored.
+            The stored model only contains what is needed for prediction.
+            A predictor loaded from it can not be fit again.
 
         Returns:
             None
@@ -452,8 +992,7 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
                 fp.write(
                     dumps(
                         {
-                            _KEY_DFA: self.dfa_.to_dict(str),
-                            _KEY_CONCEPT_MAP: self.concept_map_,
+                            _KEY_FORMAT_VERSION: _FORMAT_VERSION,
                             _KEY_CONCEPT_TYPE_URI: _store_uri_ref(
                                 self.concept_type_uri
                             ),
@@ -470,6 +1009,8 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
                             _KEY_LANGS: list(self.langs),
                             _KEY_INPUT: self.input,
                             _KEY_USE_TXT_VEC: self.use_txt_vec,
+                            _KEY_TXT_VEC_BACKEND: self.txt_vec_backend,
+                            _KEY_TXT_VEC_N_FEATURES: self.txt_vec_n_features,
                             _KEY_HANDLE_TITLE_CASE: self.handle_title_case,
                             _KEY_EXTRACT_UPPER_CASE_FROM_BRACES: (
                                 self.extract_upper_case_from_braces
@@ -486,14 +1027,27 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
                             _KEY_SIMPLE_ENGLISH_PLURAL_RULES: (
                                 self.simple_english_plural_rules
                             ),
+                            _KEY_COMPACT_DFA: self.compact_dfa,
+                            _KEY_MINIMIZE_DFA: self.minimize_dfa,
+                            _KEY_LAZY_DFA: self.lazy_dfa,
+                            _KEY_LAZY_DFA_MAX_STATES: self.lazy_dfa_max_states,
                         },
                         ensure_ascii=False,
                     ).encode("utf-8")
                 )
+            with zfile.open(_NAME_DFA_FILE, "w", force_zip64=True) as fp:
+                if isinstance(self.dfa_, compact.CompactDfa):
+                    self.dfa_.write(fp, str)
+                elif isinstance(self.dfa_, lazy.LazyDfa):
+                    compact.CompactDfa.from_dfa(self.dfa_.to_dfa()).write(fp, str)
+                else:
+                    compact.CompactDfa.from_dfa(self.dfa_).write(fp, str)
+            with zfile.open(_NAME_CONCEPT_MAP_FILE, "w", force_zip64=True) as fp:
+                _write_concept_map(fp, self.concept_map_)
             with zfile.open(_NAME_PIPELINE_FILE, "w", force_zip64=True) as fp:
                 # No good way to serialize sk-learn classifier,
                 # apart from insecure pickling
-                pkl.dump(self.pipeline_, fp)
+                pkl.dump(_pipeline_without_graph(self.pipeline_), fp)
             if self.use_txt_vec:
                 with zfile.open(
                     _NAME_TEXT_VECTORIZER_FILE, "w", force_zip64=True
@@ -501,15 +1055,42 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
                     pkl.dump(self.text_vectorizer_, fp)
             with zfile.open(_NAME_TEXT_FEATURES_FILE, "w", force_zip64=True) as fp:
                 pkl.dump(self.text_features_, fp)
-            with zfile.open(_NAME_GRAPH_FILE, "w", force_zip64=True) as fp:
-                fp.write(self.graph.serialize(encoding="utf-8"))
+            if include_graph:
+                with zfile.open(_NAME_GRAPH_FILE, "w", force_zip64=True) as fp:
+                    fp.write(self.get_graph().serialize(encoding="utf-8"))
 
     @staticmethod
-    def load(path):
+    def load(
+        path,
+        mmap_dfa: bool = False,
+        lazy_graph: bool = False,
+        filter_graph: bool = False,
+    ):
         """
         Loads a predictor instance from a previously stored zip file.
 
         :params  path: Path to the zip file.
+        :params  mmap_dfa: When true, the automaton is memory mapped read only
+            from the zip file instead of being read into memory.
+            Processes that load the same file,
+            as well as the worker processes used for matching,
+            then share a single physical copy of the automaton.
+            The zip file must not be modified while the predictor is in use.
+            If path is a file object, the automaton is read into memory.
+        :params  lazy_graph: When true, the graph attribute of the predictor
+            is None and the graph is only parsed when get_graph is called,
+            which fitting, storing and updating the labels do.
+            The graph is not needed for prediction.
+            The graph is not parsed for clones of the predictor,
+            which have no graph.
+        :params  filter_graph: When true, the graph is parsed into a
+            `stwfsapy.thesaurus.FilteredGraph` that only keeps
+            the triples used by the predictor.
+            All other triples of the stored graph are discarded
+            and are missing when the predictor is stored again.
+
+        The number of processes is not stored with the predictor.
+        It is 1 after loading and can be set by assigning n_jobs.
 
         Returns:
             A reconstructed `StwfsapyPredictor` instance.
@@ -517,13 +1098,49 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
         with ZipFile(path, "r") as zfile:
             with zfile.open(_NAME_PREDICTOR_FILE, "r") as fp:
                 conf = loads(fp.read().decode("utf-8"))
+            format_version = conf.get(_KEY_FORMAT_VERSION, _LEGACY_FORMAT_VERSION)
+            if format_version == _LEGACY_FORMAT_VERSION:
+                if mmap_dfa:
+                    _logger.warning(
+                        "Model contains no binary automaton. Reading it instead."
+                    )
+                automaton = dfa.Dfa.from_dict(conf[_KEY_DFA], str)
+                concept_map = conf[_KEY_CONCEPT_MAP]
+            elif format_version == _FORMAT_VERSION:
+                is_file_path = isinstance(path, (str, PathLike))
+                if mmap_dfa and not is_file_path:
+                    _logger.warning(
+                        "Model is not given by a file path. Reading it instead."
+                    )
+                if mmap_dfa and is_file_path:
+                    info = zfile.getinfo(_NAME_DFA_FILE)
+                    automaton = compact.CompactDfa.open(
+                        fspath(path), str, _member_offset(zfile, info), info.file_size
+                    )
+                else:
+                    automaton = compact.CompactDfa.from_buffer(
+                        zfile.read(_NAME_DFA_FILE), str, copy=False
+                    )
+                concept_map = _read_concept_map(zfile.read(_NAME_CONCEPT_MAP_FILE))
+            else:
+                raise UnknownFormatException(
+                    f"Unsupported model format version {format_version}."
+                )
             use_txt_vec = conf[_KEY_USE_TXT_VEC]
             if use_txt_vec:
                 with zfile.open(_NAME_TEXT_VECTORIZER_FILE, "r") as fp:
                     text_vectorizer = pkl.load(fp)
-            with zfile.open(_NAME_GRAPH_FILE, "r") as fp:
-                graph = Graph()
-                graph.parse(data=fp.read().decode("utf-8"))
+            has_graph = _NAME_GRAPH_FILE in zfile.namelist()
+            if filter_graph:
+                graph_predicates = t.relevant_predicates(
+                    _load_uri_ref(conf[_KEY_THESAURUS_RELATION_TYPE_URI])
+                )
+            else:
+                graph_predicates = None
+            if has_graph and not lazy_graph:
+                graph = _parse_graph(zfile.read(_NAME_GRAPH_FILE), graph_predicates)
+            else:
+                graph = None
             with zfile.open(_NAME_PIPELINE_FILE, "r") as fp:
                 pipeline = pkl.load(fp)
             with zfile.open(_NAME_TEXT_FEATURES_FILE, "r") as fp:
@@ -542,6 +1159,8 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
             langs=frozenset(conf[_KEY_LANGS]),
             input=conf[_KEY_INPUT],
             use_txt_vec=use_txt_vec,
+            txt_vec_backend=conf.get(_KEY_TXT_VEC_BACKEND, TXT_VEC_TFIDF),
+            txt_vec_n_features=conf.get(_KEY_TXT_VEC_N_FEATURES, 2**20),
             handle_title_case=conf[_KEY_HANDLE_TITLE_CASE],
             extract_upper_case_from_braces=conf[_KEY_EXTRACT_UPPER_CASE_FROM_BRACES],
             extract_any_case_from_braces=conf[_KEY_EXTRACT_ANY_CASE_FROM_BRACES],
@@ -550,15 +1169,27 @@ class StwfsapyPredictor(BaseEstimator, ClassifierMixin):
                 _KEY_EXPAND_ABBREVIATION_WITH_PUNCTUATION
             ],
             simple_english_plural_rules=conf[_KEY_SIMPLE_ENGLISH_PLURAL_RULES],
+            compact_dfa=conf.get(_KEY_COMPACT_DFA, False),
+            minimize_dfa=conf.get(_KEY_MINIMIZE_DFA, False),
+            lazy_dfa=conf.get(_KEY_LAZY_DFA, False),
+            lazy_dfa_max_states=conf.get(_KEY_LAZY_DFA_MAX_STATES, 100_000),
         )
+        if has_graph and lazy_graph:
+            pred._graph_path = path
+            pred._graph_predicates = graph_predicates
         pred.text_features_ = text_features
         if use_txt_vec:
             pred.text_vectorizer_ = text_vectorizer
         else:
             pred.text_vectorizer_ = None
-        pred.dfa_ = dfa.Dfa.from_dict(conf[_KEY_DFA], str)
+        if pred.compact_dfa or mmap_dfa:
+            if isinstance(automaton, dfa.Dfa):
+                automaton = compact.CompactDfa.from_dfa(automaton)
+        elif isinstance(automaton, compact.CompactDfa):
+            automaton = automaton.to_dfa()
+        pred.dfa_ = automaton
         pred.pipeline_ = pipeline
-        pred.concept_map_ = conf[_KEY_CONCEPT_MAP]
+        pred.concept_map_ = concept_map
         return pred
 
 
@@ -570,6 +1201,117 @@ def _load_uri_ref(uri: str) -> URIRef:
     return URIRef(uri)
 
 
+def _parse_graph(data: bytes, predicates: Optional[FrozenSet[URIRef]]) -> Graph:
+    """When predicates are given, only triples with these predicates are kept."""
+    if predicates is None:
+        graph = Graph()
+    else:
+        graph = t.FilteredGraph(predicates)
+    graph.parse(data=data.decode("utf-8"))
+    return graph
+
+
+def _pipeline_without_graph(pipeline: Pipeline) -> Pipeline:
+    """Shallow copy of a fitted pipeline.
+    The thesaurus features do not reference the graph,
+    which is only needed for fitting them."""
+    features = copy(pipeline.named_steps["Combined Features"])
+    features.transformers = [
+        (name, _without_graph(transformer), columns)
+        for name, transformer, columns in features.transformers
+    ]
+    features.transformers_ = [
+        (name, _without_graph(transformer), columns)
+        for name, transformer, columns in features.transformers_
+    ]
+    stripped = copy(pipeline)
+    stripped.steps = [
+        (name, features if name == "Combined Features" else step)
+        for name, step in pipeline.steps
+    ]
+    return stripped
+
+
+def _without_graph(transformer):
+    if isinstance(transformer, ThesaurusFeatureTransformation):
+        transformer = copy(transformer)
+        transformer.graph = None
+        transformer.concepts = None
+        transformer.thesauri = None
+    return transformer
+
+
+def _write_concept_map(fp, concept_map: Dict[str, int]):
+    write_sections(
+        fp,
+        _CONCEPT_MAP_MAGIC,
+        _CONCEPT_MAP_FORMAT_VERSION,
+        [
+            *string_table(list(concept_map.keys())),
+            int_bytes(list(concept_map.values())),
+        ],
+    )
+
+
+def _read_concept_map(buffer) -> Dict[str, int]:
+    offsets, data, ids = read_sections(
+        buffer, _CONCEPT_MAP_MAGIC, _CONCEPT_MAP_FORMAT_VERSION, 3
+    )
+    return dict(zip(read_strings(offsets, data), read_ints(ids)))
+
+
+def _member_offset(zfile: ZipFile, info: ZipInfo) -> int:
+    """Position of the uncompressed data of a zip file member."""
+    if info.compress_type != ZIP_STORED:
+        raise ValueError(f"Zip file member {info.filename} is compressed.")
+    zfile.fp.seek(info.header_offset)
+    signature, name_length, extra_length = _ZIP_LOCAL_HEADER.unpack(
+        zfile.fp.read(_ZIP_LOCAL_HEADER.size)
+    )
+    if signature != _ZIP_LOCAL_HEADER_SIGNATURE:
+        raise ValueError(f"Invalid header for zip file member {info.filename}.")
+    return info.header_offset + _ZIP_LOCAL_HEADER.size + name_length + extra_length
+
+
+_worker_matcher = None
+"""Predictor used for matching in a worker process."""
+
+
+def _init_match_worker(matcher: StwfsapyPredictor):
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _match_chunk(chunk):
+    inputs, truth_refss = chunk
+    return _worker_matcher.match_and_extend(inputs, truth_refss)
+
+
+def _construct_shard(
+    constructor: StwfsapyPredictor, labels: List[Tuple[URIRef, str]]
+) -> compact.CompactDfa:
+    automaton = constructor._construct_dfa(labels)
+    if constructor.minimize_dfa:
+        # Smaller shards are faster to merge.
+        automaton = minimization.minimize(automaton)
+    return compact.CompactDfa.from_dfa(automaton)
+
+
+def _shard_index(label: str, n_shards: int) -> int:
+    """Labels starting with the same letter, regardless of case,
+    are assigned to the same shard."""
+    return sum(map(ord, label[:1].lower())) % n_shards
+
+
+def _chunked(iterable: Iterable[T], size: int) -> Iterable[List[T]]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def _handle_construction(
     con_state: construction.ConstructionState, concept: str, label: str
 ):
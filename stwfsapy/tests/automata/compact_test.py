@@ -0,0 +1,145 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pickle
+from io import BytesIO
+
+import pytest
+
+from stwfsapy.automata import compact, dfa
+from stwfsapy.tests.automata.data import random_texts, texts
+from stwfsapy.util.binary_format import UnknownFormatException
+
+
+@pytest.fixture
+def foo_graph():
+    graph = dfa.Dfa()
+    for _ in range(5):
+        graph.add_state()
+    graph.set_non_word_char_transition(0, 1)
+    graph.set_symbol_transition(1, 2, "f")
+    graph.set_symbol_transition(2, 3, "o")
+    graph.set_symbol_transition(3, 3, "o")
+    graph.set_non_word_char_transition(3, 4)
+    graph.add_acceptances(4, ["bar", "baz"])
+    return graph
+
+
+def test_from_dfa(foo_graph):
+    compact_graph = compact.CompactDfa.from_dfa(foo_graph)
+    assert len(compact_graph) == 5
+    assert compact_graph.alphabet == ["f", "o"]
+    assert list(compact_graph.transition_offsets) == [0, 0, 1, 2, 3, 3]
+    assert list(compact_graph.transition_symbols) == [0, 1, 1]
+    assert list(compact_graph.transition_targets) == [2, 3, 3]
+    assert list(compact_graph.non_word_char_transitions) == [1, -1, -1, 4, -1]
+    assert list(compact_graph.accepts(4)) == ["bar", "baz"]
+    assert list(compact_graph.accepts(3)) == []
+
+
+def test_to_dfa_inversion(foo_graph):
+    assert compact.CompactDfa.from_dfa(foo_graph).to_dfa() == foo_graph
+
+
+def test_interns_accepts(label_dfa):
+    compact_graph = compact.CompactDfa.from_dfa(label_dfa)
+    assert len(compact_graph.accept_values) == len(set(compact_graph.accept_values))
+    assert len(compact_graph.accept_ids) == sum(
+        len(state.accepts) for state in label_dfa.states
+    )
+
+
+def test_search(foo_graph):
+    res = list(compact.CompactDfa.from_dfa(foo_graph).search("a fooo"))
+    assert res == [("bar", "fooo", 2, 6), ("baz", "fooo", 2, 6)]
+
+
+@pytest.mark.parametrize("text", texts + random_texts(100))
+def test_search_equals_dfa_search(label_dfa, text):
+    compact_graph = compact.CompactDfa.from_dfa(label_dfa)
+    assert list(compact_graph.search(text)) == list(label_dfa.search(text))
+
+
+def test_serialization_inversion(label_dfa):
+    compact_graph = compact.CompactDfa.from_dfa(label_dfa)
+    assert compact_graph == compact.CompactDfa.from_dict(
+        compact_graph.to_dict(lambda x: x), lambda x: x
+    )
+    assert compact_graph.to_dict(str) == label_dfa.to_dict(str)
+
+
+def _binary(compact_graph):
+    buffer = BytesIO()
+    compact_graph.write(buffer, str)
+    return buffer.getvalue()
+
+
+def test_binary_inversion(label_dfa):
+    compact_graph = compact.CompactDfa.from_dfa(label_dfa)
+    data = _binary(compact_graph)
+    for copy in [True, False]:
+        loaded = compact.CompactDfa.from_buffer(data, str, copy=copy)
+        assert loaded == compact_graph
+    assert _binary(loaded) == data
+
+
+def test_binary_unicode(foo_graph):
+    foo_graph.set_symbol_transition(1, 2, "ü")
+    foo_graph.add_acceptances(4, ["ß"])
+    compact_graph = compact.CompactDfa.from_dfa(foo_graph)
+    loaded = compact.CompactDfa.from_buffer(_binary(compact_graph), str)
+    assert loaded == compact_graph
+    assert list(loaded.search("üoo")) == list(compact_graph.search("üoo"))
+
+
+def test_binary_rejects_unknown_data(foo_graph):
+    data = _binary(compact.CompactDfa.from_dfa(foo_graph))
+    with pytest.raises(UnknownFormatException):
+        compact.CompactDfa.from_buffer(b"STWFS", str)
+    with pytest.raises(UnknownFormatException):
+        compact.CompactDfa.from_buffer(b"X" + data[1:], str)
+    with pytest.raises(UnknownFormatException):
+        compact.CompactDfa.from_buffer(data[:8] + b"\x02" + data[9:], str)
+    with pytest.raises(UnknownFormatException):
+        compact.CompactDfa.from_buffer(data[:-1], str)
+
+
+def test_open(tmpdir, label_dfa):
+    compact_graph = compact.CompactDfa.from_dfa(label_dfa)
+    pth = tmpdir.join("dfa.bin")
+    pth.write_binary(b"prefix" + _binary(compact_graph) + b"suffix")
+    mapped = compact.CompactDfa.open(pth.strpath, str, 6, len(_binary(compact_graph)))
+    assert mapped == compact_graph
+    assert isinstance(mapped.transition_targets, memoryview)
+    for text in texts:
+        assert list(mapped.search(text)) == list(compact_graph.search(text))
+
+
+def test_pickle_mapped(tmpdir, label_dfa):
+    compact_graph = compact.CompactDfa.from_dfa(label_dfa)
+    pth = tmpdir.join("dfa.bin")
+    pth.write_binary(_binary(compact_graph))
+    mapped = compact.CompactDfa.open(pth.strpath, str)
+    data = pickle.dumps(mapped)
+    assert len(data) < len(pth.read_binary())
+    unpickled = pickle.loads(data)
+    assert unpickled == compact_graph
+    assert isinstance(unpickled.transition_targets, memoryview)
+
+
+def test_pickle_buffer_view(label_dfa):
+    compact_graph = compact.CompactDfa.from_dfa(label_dfa)
+    view = compact.CompactDfa.from_buffer(_binary(compact_graph), str, copy=False)
+    assert pickle.loads(pickle.dumps(view)) == compact_graph
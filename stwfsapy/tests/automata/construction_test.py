@@ -26,8 +26,8 @@ def test_init_with_empty_graph():
     construction._set_up()
     assert len(graph.states) == 3
     assert graph.starts == []
-    assert graph.states[0].non_word_char_transitions == {1}
-    assert graph.states[1].empty_transitions == {2}
+    assert set(graph.states[0].non_word_char_transitions) == {1}
+    assert set(graph.states[1].empty_transitions) == {2}
     assert construction.append_to == [2]
     assert construction.expression == expression
     assert construction.before_braces == [[1], [2]]
@@ -41,8 +41,8 @@ def test_init_with_existing_graph(input_graph):
     construction._set_up()
     assert len(input_graph.states) == 9
     assert input_graph.starts == [0, 1]
-    assert input_graph.states[6].non_word_char_transitions == {7}
-    assert input_graph.states[7].empty_transitions == {8}
+    assert set(input_graph.states[6].non_word_char_transitions) == {7}
+    assert set(input_graph.states[7].empty_transitions) == {8}
     assert construction.append_to == [8]
     assert construction.expression == expression
     assert construction.before_braces == [[7], [8]]
@@ -58,10 +58,10 @@ def test_adds_acceptance():
     assert graph.starts == [0]
     assert graph.states[-1].accepts == [accept]
     assert graph.states[-2].accepts == [accept]
-    assert graph.states[3].non_word_char_transitions == {7}
-    assert graph.states[5].non_word_char_transitions == {6}
-    assert graph.states[1].non_word_char_transitions == set()
-    assert graph.states[1].empty_transitions == {2, 4}
+    assert set(graph.states[3].non_word_char_transitions) == {7}
+    assert set(graph.states[5].non_word_char_transitions) == {6}
+    assert set(graph.states[1].non_word_char_transitions) == set()
+    assert set(graph.states[1].empty_transitions) == {2, 4}
 
 
 def test_handles_multiple_alternations():
@@ -177,3 +177,10 @@ def test_handles_kleene_closure(input_graph):
         assert (
             len(input_graph.states) - 1 in input_graph.states[bb_idx].empty_transitions
         )
+
+
+def test_adds_all_acceptances():
+    graph = nfa.Nfa()
+    c.ConstructionState(graph, "a|b", accept, "other").construct()
+    assert graph.states[-1].accepts == [accept, "other"]
+    assert graph.states[-2].accepts == [accept, "other"]
@@ -14,6 +14,7 @@
 
 
 from stwfsapy.automata import conversion as c
+from stwfsapy.automata import nfa
 from stwfsapy.tests.automata.data import accept, symbol0, symbol1
 
 
@@ -22,30 +23,29 @@ def test_conversion(input_graph, mocker):
     # Mainly interested in the end result.
     # Still mock to see that there are no unknown elements
     add_spy = mocker.spy(converter.dfa, "add_state")
-    symbol_transition_spy = mocker.spy(converter.dfa, "set_symbol_transition")
-    nwc_transition_spy = mocker.spy(converter.dfa, "set_non_word_char_transition")
-    acceptance_spy = mocker.spy(converter.dfa, "add_acceptances")
     result = converter.start_conversion()
-    assert converter.queue.qsize() == 0
+    assert len(converter.queue) == 0
     assert len(converter.state_cache) == 6
     assert len(converter.state_represents) == 6
     # One less call than states in the graph,
     # because the initial state was added during construction.
     assert add_spy.call_count == 5
-    assert nwc_transition_spy.call_count == 1
-    assert symbol_transition_spy.call_count == 7
-    assert acceptance_spy.call_count == 1
-    state01 = converter.state_cache[frozenset([0, 1])]
-    state02 = converter.state_cache[frozenset([0, 2])]
+    assert (
+        sum(state.non_word_char_transition is not None for state in result.states) == 1
+    )
+    assert sum(len(state.symbol_transitions) for state in result.states) == 7
+    assert sum(len(state.accepts) > 0 for state in result.states) == 1
+    state01 = converter.state_cache[(0, 1)]
+    state02 = converter.state_cache[(0, 2)]
     assert result.states[state01].symbol_transitions[symbol0] == state02
-    state3 = converter.state_cache[frozenset([3])]
+    state3 = converter.state_cache[(3,)]
     assert result.states[state01].symbol_transitions[symbol1] == state3
     assert result.states[state02].symbol_transitions[symbol1] == state3
-    state24 = converter.state_cache[frozenset([2, 4])]
+    state24 = converter.state_cache[(2, 4)]
     assert result.states[state02].symbol_transitions[symbol0] == state24
-    state5 = converter.state_cache[frozenset([5])]
+    state5 = converter.state_cache[(5,)]
     assert result.states[state24].symbol_transitions[symbol1] == state5
-    state4 = converter.state_cache[frozenset([4])]
+    state4 = converter.state_cache[(4,)]
     assert result.states[state24].symbol_transitions[symbol0] == state4
     assert result.states[state4].symbol_transitions[symbol1] == state5
     assert result.states[state5].accepts == [accept]
@@ -53,42 +53,41 @@ def test_conversion(input_graph, mocker):
 
 def test_creates_new_state(input_graph):
     converter = c.NfaToDfaConverter(input_graph)
-    new_set = frozenset([0, 2])
-    converter._get_or_create_dfa_state(new_set)
+    new_set = frozenset([2, 0])
+    assert converter._get_or_create_dfa_state(new_set) == 1
     assert len(converter.dfa.states) == 2
-    assert converter.queue.qsize() == 2
+    assert len(converter.queue) == 2
     assert len(converter.state_cache) == 2
     assert len(converter.state_represents) == 2
-    assert converter.state_represents[1] == list(new_set)
-    assert converter.state_cache[new_set] == 1
+    assert converter.state_represents[1] == (0, 2)
+    assert converter.state_cache[(0, 2)] == 1
 
 
 def test_retrieves_existing_state(input_graph):
     converter = c.NfaToDfaConverter(input_graph)
     new_set = frozenset(input_graph.starts)
-    converter._get_or_create_dfa_state(new_set)
+    assert converter._get_or_create_dfa_state(new_set) == 0
     assert len(converter.dfa.states) == 1
-    assert converter.queue.qsize() == 1
+    assert len(converter.queue) == 1
     assert len(converter.state_cache) == 1
     assert len(converter.state_represents) == 1
 
 
 def test_initialization(input_graph):
     converter = c.NfaToDfaConverter(input_graph)
-    start_set = frozenset(input_graph.starts)
+    start_set = tuple(sorted(input_graph.starts))
     assert len(converter.dfa.states) == 1
-    assert converter.queue.qsize() == 1
+    assert len(converter.queue) == 1
     assert len(converter.state_cache) == 1
     assert len(converter.state_represents) == 1
-    assert converter.state_represents[0] == list(start_set)
+    assert converter.state_represents[0] == start_set
     assert converter.state_cache[start_set] == 0
 
 
 def test_transition_collection(input_graph):
-    converter = c.NfaToDfaConverter(input_graph)
     state_set = {0, 1, 3, 5}
-    symbol_transitions, non_word_char_transitions, accepts = (
-        converter._collect_nfa_transitions(state_set)
+    symbol_transitions, non_word_char_transitions, accepts = c.combine_states(
+        input_graph, sorted(state_set)
     )
     for state_id in state_set:
         state = input_graph.states[state_id]
@@ -123,10 +122,10 @@ def test_transition_collection(input_graph):
 
 def test_transition_creation(input_graph):
     converter = c.NfaToDfaConverter(input_graph)
-    set13 = frozenset([1, 3])
-    set24 = frozenset([2, 4])
-    set5 = frozenset([5])
-    acceptance = {accept}
+    set13 = (1, 3)
+    set24 = (2, 4)
+    set5 = (5,)
+    acceptance = [accept]
     non_word_char_transitions = set(set24)
     symbol_transitions = {symbol0: set(set13), symbol1: set(set5)}
     converter._create_dfa_transitions(
@@ -137,3 +136,26 @@ def test_transition_creation(input_graph):
     assert state.non_word_char_transition == converter.state_cache[set24]
     assert state.symbol_transitions[symbol0] == converter.state_cache[set13]
     assert state.symbol_transitions[symbol1] == converter.state_cache[set5]
+
+
+def test_collection_does_not_modify_nfa(input_graph):
+    symbol_transitions, _, _ = c.combine_states(input_graph, [0, 1])
+    assert symbol_transitions[symbol0] == {0, 2}
+    assert set(input_graph.states[0].symbol_transitions[symbol0]) == {2}
+    assert set(input_graph.states[1].symbol_transitions[symbol0]) == {0}
+
+
+def test_accepts_keep_order():
+    automaton = nfa.Nfa()
+    start = automaton.add_state()
+    end = automaton.add_state()
+    automaton.add_start(start)
+    automaton.add_symbol_transition(start, end, symbol0)
+    for accept_value in ["c", "a", "b", "a"]:
+        automaton.add_acceptance(end, accept_value)
+    other_end = automaton.add_state()
+    automaton.add_symbol_transition(start, other_end, symbol0)
+    automaton.add_acceptance(other_end, "d")
+    result = c.NfaToDfaConverter(automaton).start_conversion()
+    target = result.states[0].symbol_transitions[symbol0]
+    assert result.states[target].accepts == ["c", "a", "b", "d"]
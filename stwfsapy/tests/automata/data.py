@@ -13,9 +13,12 @@
 # limitations under the License.
 
 
+import random
+
 import pytest
 
-from stwfsapy.automata import nfa
+from stwfsapy import case_handlers, expansion
+from stwfsapy.automata import construction, conversion, nfa
 
 symbol0 = "s"
 symbol1 = "t"
@@ -38,3 +41,160 @@ def input_graph():
     graph.add_non_word_char_transition(1, 5)
     graph.add_acceptance(5, accept)
     return graph
+
+
+labels = [
+    ("global", "id_global"),
+    ("economic", "id_economic"),
+    ("crisis", "id_crisis"),
+    ("global economic", "id_global_economic"),
+    ("economic crisis", "id_economic_crisis"),
+    ("global economic crisis", "id_global_economic_crisis"),
+    ("GDP", "id_gdp"),
+    ("R&D", "id_rd"),
+    ("economic policy", "id_economic_policy"),
+    ("monetary policy", "id_monetary_policy"),
+    ("policy", "id_policy"),
+    ("Policy", "id_policy"),
+    ("currency", "id_currency"),
+    ("a-b", "id_a_b"),
+    ("e", "id_e"),
+]
+
+texts = [
+    "",
+    "global economic crisis unfolds",
+    "bank collapse threatens global economic system",
+    "regulatory bodies react to economic crisis",
+    "global trends in economic policy during the crisis",
+    "The G.D.P. and R & D of Global Economic Policies.",
+    "economic economic policy policy monetary policies",
+    "currencies, a-b, a - b, e e e, ee (global) [crisis]",
+    "Monetary Policy: global-economic crisis/policy;GDP",
+    "\u00fcber global   economic\tcrisis\ncurrency 42 e",
+]
+
+
+def build_label_dfa(labels=labels):
+    """Constructs an automaton from labels
+    the same way the predictor does."""
+    return conversion.NfaToDfaConverter(build_label_nfa(labels)).start_conversion()
+
+
+def build_label_nfa(labels=labels):
+    """Constructs the automaton of build_label_dfa before its conversion."""
+    automaton = nfa.Nfa()
+    for expression, concept in label_expressions(labels):
+        construction.ConstructionState(automaton, expression, concept).construct()
+    automaton.remove_empty_transitions()
+    return automaton
+
+
+def label_expressions(labels=labels):
+    """Expands labels into expressions the same way the predictor does."""
+    expansion_funs = expansion.collect_expansion_functions()
+    for label, concept in labels:
+        expanded = label
+        for fun in expansion_funs:
+            expanded = fun(expanded)
+        yield expansion.simple_english_plural_fun(
+            case_handlers.title_case_handler(expanded)
+        ), concept
+
+
+def random_texts(count, seed=0):
+    """Texts mixing label fragments, separators and noise."""
+    rng = random.Random(seed)
+    fragments = [label for label, _ in labels] + [
+        "policies",
+        "currencies",
+        "Global",
+        "G.D.P.",
+        "R & D",
+        "x",
+        "42",
+        "_",
+        "\u00e9conomic",
+    ]
+    separators = [" ", "  ", "-", ",", ", ", "(", ")", ".", "\n", "", "_"]
+    return [
+        "".join(
+            rng.choice(fragments) + rng.choice(separators)
+            for _ in range(rng.randint(0, 12))
+        )
+        for _ in range(count)
+    ]
+
+
+def exhaustive_search(automaton, text):
+    """Reference implementation of stwfsapy.automata.dfa.Dfa.search
+    that tries every position of the text as start."""
+    search_text = f".{text}."
+    last_end_position = 0
+    for start in range(len(search_text)):
+        if start < last_end_position:
+            continue
+        stack = [(0, start)]
+        while len(stack) > 0:
+            state_idx, position = stack.pop()
+            state = automaton.states[state_idx]
+            if state.accepts:
+                last_end_position = position
+                for accept in state.accepts:
+                    yield (accept, text[start : position - 2], start, position - 2)
+                break
+            try:
+                symbol = search_text[position]
+            except IndexError:
+                continue
+            if not symbol.isalnum() and state.non_word_char_transition:
+                stack.append((state.non_word_char_transition, position + 1))
+            try:
+                stack.append((state.symbol_transitions[symbol], position + 1))
+            except KeyError:
+                pass
+
+
+def isomorphic(automaton, other):
+    """Checks whether two automata only differ in the numbering of states
+    and in the order of acceptances."""
+    mapping = {0: 0}
+    stack = [0]
+    while stack:
+        idx = stack.pop()
+        state = automaton.states[idx]
+        other_state = other.states[mapping[idx]]
+        if sorted(state.accepts) != sorted(other_state.accepts):
+            return False
+        if state.symbol_transitions.keys() != other_state.symbol_transitions.keys():
+            return False
+        pairs = [
+            (target, other_state.symbol_transitions[symbol])
+            for symbol, target in state.symbol_transitions.items()
+        ]
+        if (state.non_word_char_transition is None) != (
+            other_state.non_word_char_transition is None
+        ):
+            return False
+        if state.non_word_char_transition is not None:
+            pairs.append(
+                (state.non_word_char_transition, other_state.non_word_char_transition)
+            )
+        for target, other_target in pairs:
+            if target in mapping:
+                if mapping[target] != other_target:
+                    return False
+            else:
+                mapping[target] = other_target
+                stack.append(target)
+    return (
+        len(set(mapping.values()))
+        == len(mapping)
+        == len(automaton.states)
+        == len(other.states)
+    )
+
+
+@pytest.fixture
+def label_dfa():
+    return build_label_dfa()
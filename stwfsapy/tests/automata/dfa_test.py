@@ -16,6 +16,7 @@
 import pytest
 
 from stwfsapy.automata import dfa
+from stwfsapy.tests.automata.data import exhaustive_search, random_texts, texts
 
 symbol = "s"
 
@@ -84,3 +85,48 @@ def test_search(foo_graph):
 
 def test_serialization_inversion(foo_graph):
     assert foo_graph == dfa.Dfa.from_dict(foo_graph.to_dict(lambda x: x), lambda x: x)
+
+
+def test_search_with_start_symbol_transition(two_state_graph):
+    two_state_graph.set_symbol_transition(0, 1, "x")
+    two_state_graph.add_state()
+    two_state_graph.set_non_word_char_transition(1, 2)
+    two_state_graph.add_acceptances(2, ["bar"])
+    res = list(two_state_graph.search("axx x"))
+    assert [r[2] for r in res] == [3, 5]
+    assert res == list(exhaustive_search(two_state_graph, "axx x"))
+
+
+def test_candidate_starts_word_boundaries():
+    starts = list(dfa.candidate_starts(".ab c_d-é1 ?.", [], True))
+    assert starts == [0, 3, 5, 7, 10, 11, 12]
+
+
+def test_candidate_starts_symbols():
+    starts = list(dfa.candidate_starts("a]b-c^", ["]", "-", "^", "ab"], False))
+    assert starts == [1, 3, 5]
+
+
+def test_candidate_starts_follow_symbols():
+    starts = list(dfa.candidate_starts(".ab c_d-é1 ?.", [], True, ["a", "c", "d"]))
+    assert starts == [0, 3, 5]
+
+
+def test_candidate_starts_follow_non_word_chars():
+    starts = list(
+        dfa.candidate_starts(".ab c_d-é1 ?.", [], True, ["a", "c", "d"], True)
+    )
+    assert starts == [0, 3, 5, 10, 11]
+
+
+def test_candidate_starts_without_follow_transitions():
+    assert list(dfa.candidate_starts(".ab c.", [], True, [], False)) == []
+
+
+def test_candidate_starts_without_transitions():
+    assert list(dfa.candidate_starts(".abc.", [], False)) == []
+
+
+@pytest.mark.parametrize("text", texts + random_texts(200))
+def test_search_equals_exhaustive_search(label_dfa, text):
+    assert list(label_dfa.search(text)) == list(exhaustive_search(label_dfa, text))
@@ -0,0 +1,96 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pickle
+
+import pytest
+
+from stwfsapy.automata import construction, conversion, nfa
+from stwfsapy.automata.lazy import LazyDfa, LazyStates
+from stwfsapy.tests.automata.data import (
+    build_label_nfa,
+    exhaustive_search,
+    isomorphic,
+    random_texts,
+    texts,
+)
+
+
+@pytest.fixture
+def label_nfa():
+    return build_label_nfa()
+
+
+@pytest.mark.parametrize("max_states", [1, 5, 100_000])
+def test_search_equals_dfa(label_nfa, max_states):
+    eager = conversion.NfaToDfaConverter(label_nfa).start_conversion()
+    lazy = LazyDfa(label_nfa, max_states)
+    for text in texts + random_texts(100):
+        assert list(lazy.search(text)) == list(eager.search(text))
+        assert list(exhaustive_search(lazy, text)) == list(
+            exhaustive_search(eager, text)
+        )
+        assert len(lazy.states) <= max_states
+
+
+def test_only_reached_states(label_nfa):
+    lazy = LazyDfa(label_nfa)
+    assert len(lazy.states) == 0
+    list(lazy.search("crisis"))
+    n_states = len(lazy.states)
+    assert 0 < n_states < len(lazy.to_dfa().states)
+    list(lazy.search("crisis"))
+    assert len(lazy.states) == n_states
+
+
+def test_cyclic():
+    automaton = nfa.Nfa()
+    for expression, accept in [("ab*c", "abc"), ("xb*c", "xbc"), ("b", "b")]:
+        construction.ConstructionState(automaton, expression, accept).construct()
+    automaton.remove_empty_transitions()
+    eager = conversion.NfaToDfaConverter(automaton).start_conversion()
+    lazy = LazyDfa(automaton, 2)
+    for text in ["abbbbc", "xbc", "b", "abx", "ac b xbbc"]:
+        assert list(lazy.search(text)) == list(eager.search(text))
+
+
+def test_to_dfa(label_nfa):
+    assert isomorphic(
+        LazyDfa(label_nfa).to_dfa(),
+        conversion.NfaToDfaConverter(label_nfa).start_conversion(),
+    )
+
+
+def test_pickle_without_cache(label_nfa):
+    lazy = LazyDfa(label_nfa)
+    list(lazy.search(texts[1]))
+    loaded = pickle.loads(pickle.dumps(lazy))
+    assert len(loaded.states) == 0
+    assert list(loaded.search(texts[1])) == list(lazy.search(texts[1]))
+
+
+def test_evicts_least_recently_used(label_nfa):
+    states = LazyStates(label_nfa, 3)
+    first, second, third = frozenset([1]), frozenset([2]), frozenset([3])
+    # The start state is used again before the cache is full.
+    for key in [0, first, 0, second, third]:
+        states[key]
+    assert list(states.cache) == [0, second, third]
+    assert first not in states.keys
+
+
+@pytest.mark.parametrize("max_states", [0, -1])
+def test_rejects_empty_cache(label_nfa, max_states):
+    with pytest.raises(ValueError, match="max_states"):
+        LazyDfa(label_nfa, max_states)
@@ -0,0 +1,81 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from stwfsapy.automata import compact, merging
+from stwfsapy.tests.automata.data import (
+    build_label_dfa,
+    exhaustive_search,
+    isomorphic,
+    labels,
+    random_texts,
+    texts,
+)
+
+
+def _shards(n_shards):
+    shards = [labels[idx::n_shards] for idx in range(n_shards)]
+    return [compact.CompactDfa.from_dfa(build_label_dfa(shard)) for shard in shards]
+
+
+@pytest.mark.parametrize("n_shards", [1, 2, 3, len(labels)])
+def test_merge_is_isomorphic_to_serial(label_dfa, n_shards):
+    merged = merging.merge(_shards(n_shards))
+    assert isomorphic(merged, label_dfa)
+    assert isomorphic(label_dfa, merged)
+
+
+@pytest.mark.parametrize("text", texts + random_texts(50))
+def test_merge_search(label_dfa, text):
+    merged = merging.merge(_shards(4))
+    assert sorted(merged.search(text)) == sorted(label_dfa.search(text))
+
+
+def test_merge_nothing():
+    merged = merging.merge([])
+    assert len(merged.states) == 1
+    assert list(merged.search("global economic crisis")) == []
+
+
+def test_isomorphic_detects_differences(label_dfa):
+    other = build_label_dfa(labels[:-1])
+    assert not isomorphic(label_dfa, other)
+    assert not isomorphic(other, label_dfa)
+
+
+@pytest.mark.parametrize("split", [0, 5, len(labels)])
+def test_extend(label_dfa, split):
+    automaton = build_label_dfa(labels[:split])
+    other = build_label_dfa(labels[split:])
+    merging.extend(automaton, other)
+    for text in texts + random_texts(50):
+        assert sorted(automaton.search(text)) == sorted(label_dfa.search(text))
+        assert sorted(exhaustive_search(automaton, text)) == sorted(
+            exhaustive_search(label_dfa, text)
+        )
+
+
+def test_extend_keeps_existing_states():
+    automaton = build_label_dfa([("economic policy", "policy")])
+    original = build_label_dfa([("economic policy", "policy")])
+    merging.extend(automaton, build_label_dfa([("economic", "economic")]))
+    assert len(automaton.states) > len(original.states)
+    assert automaton.states[1 : len(original.states)] == original.states[1:]
+    for text in ["economic policy", "economic. policy", "economic"]:
+        assert list(automaton.search(text)) == list(
+            build_label_dfa(
+                [("economic policy", "policy"), ("economic", "economic")]
+            ).search(text)
+        )
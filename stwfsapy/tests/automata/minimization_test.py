@@ -0,0 +1,81 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from stwfsapy.automata import construction, conversion, minimization, nfa
+from stwfsapy.tests.automata.data import (
+    build_label_dfa,
+    exhaustive_search,
+    isomorphic,
+    labels,
+    random_texts,
+    texts,
+)
+
+
+@pytest.fixture
+def cyclic_dfa():
+    automaton = nfa.Nfa()
+    for expression, accept in [("ab*c", "abc"), ("xb*c", "xbc"), ("b", "b")]:
+        construction.ConstructionState(automaton, expression, accept).construct()
+    automaton.remove_empty_transitions()
+    return conversion.NfaToDfaConverter(automaton).start_conversion()
+
+
+def test_reduces_states(label_dfa):
+    minimized = minimization.minimize(label_dfa)
+    assert len(minimized.states) < len(label_dfa.states)
+    assert isomorphic(minimization.minimize(minimized), minimized)
+
+
+@pytest.mark.parametrize("text", texts + random_texts(100))
+def test_search_unchanged(label_dfa, text):
+    minimized = minimization.minimize(label_dfa)
+    assert list(minimized.search(text)) == list(label_dfa.search(text))
+    assert list(exhaustive_search(minimized, text)) == list(
+        exhaustive_search(label_dfa, text)
+    )
+
+
+def test_independent_of_construction_order(label_dfa):
+    reversed_dfa = build_label_dfa(list(reversed(labels)))
+    assert isomorphic(
+        minimization.minimize(reversed_dfa), minimization.minimize(label_dfa)
+    )
+
+
+def test_refinement_equals_register(label_dfa):
+    order = minimization._reverse_topological_order(label_dfa)
+    register = minimization._register_blocks(label_dfa, order)
+    refined = minimization._refine_blocks(label_dfa)
+    assert len(set(register)) == len(set(refined))
+    assert isomorphic(
+        minimization._build(label_dfa, register),
+        minimization._build(label_dfa, refined),
+    )
+
+
+def test_start_state_is_kept(label_dfa):
+    minimized = minimization.minimize(label_dfa)
+    assert minimized.states[0].symbol_transitions == {}
+    assert minimized.states[0].non_word_char_transition == 1
+
+
+def test_cyclic(cyclic_dfa):
+    assert minimization._reverse_topological_order(cyclic_dfa) is None
+    minimized = minimization.minimize(cyclic_dfa)
+    assert len(minimized.states) < len(cyclic_dfa.states)
+    for text in ["ac abbbc", "xbc b xc", "abx bb xbbbbbc", "b"]:
+        assert list(minimized.search(text)) == list(cyclic_dfa.search(text))
@@ -13,6 +13,8 @@
 # limitations under the License.
 
 
+import pickle
+
 import pytest
 
 from stwfsapy.automata import nfa
@@ -94,6 +96,64 @@ def test_remove_epsilons(epsilon_tree):
 
 
 def test_recognizes_empty_loops(epsilon_circle):
-    with pytest.raises(Exception) as exc:
+    with pytest.raises(nfa.EmptyTransitionLoopException) as exc:
         epsilon_circle.remove_empty_transitions()
-    assert exc.value.args[0] == "There is an empty transition loop in the NFA."
+    assert exc.value.state_idx in {3, 7, 16}
+    assert exc.value.args[0] == (
+        f"There is an empty transition loop through state {exc.value.state_idx}."
+    )
+
+
+def test_recognizes_empty_self_loop(two_state_graph):
+    two_state_graph.add_empty_transition(1, 1)
+    with pytest.raises(nfa.EmptyTransitionLoopException) as exc:
+        two_state_graph.remove_empty_transitions()
+    assert exc.value.state_idx == 1
+
+
+def test_remove_epsilon_chain():
+    graph = nfa.Nfa()
+    for _ in range(5):
+        graph.add_state()
+    graph.add_empty_transition(0, 1)
+    graph.add_empty_transition(1, 2)
+    graph.add_empty_transition(0, 2)
+    graph.add_empty_transition(3, 2)
+    graph.add_symbol_transition(2, 4, symbol0)
+    graph.add_non_word_char_transition(1, 4)
+    graph.remove_empty_transitions()
+    assert set(graph.states[0].symbol_transitions[symbol0]) == {4}
+    assert set(graph.states[0].non_word_char_transitions) == {4}
+    assert set(graph.states[1].symbol_transitions[symbol0]) == {4}
+    assert set(graph.states[3].symbol_transitions[symbol0]) == {4}
+    assert len(graph.states[3].non_word_char_transitions) == 0
+    for state in graph.states:
+        assert len(state.empty_transitions) == 0
+        assert len(state.incoming_empty_transitions) == 0
+
+
+def test_single_targets_are_tuples(two_state_graph):
+    two_state_graph.add_symbol_transition(0, 1, symbol0)
+    two_state_graph.add_non_word_char_transition(0, 1)
+    state = two_state_graph.states[0]
+    assert state.symbol_transitions[symbol0] == (1,)
+    assert state.non_word_char_transitions == (1,)
+    assert two_state_graph.states[1].symbol_transitions == {}
+    two_state_graph.add_symbol_transition(0, 1, symbol0)
+    assert state.symbol_transitions[symbol0] == (1,)
+    two_state_graph.add_symbol_transition(0, 0, symbol0)
+    assert state.symbol_transitions[symbol0] == {0, 1}
+
+
+def test_pickle(epsilon_tree):
+    epsilon_tree.add_acceptance(16, "accept")
+    loaded = pickle.loads(pickle.dumps(epsilon_tree))
+    for state, loaded_state in zip(epsilon_tree.states, loaded.states):
+        for name in nfa.State.__slots__:
+            assert getattr(loaded_state, name) == getattr(state, name)
+    loaded.add_symbol_transition(16, 0, symbol0)
+    loaded.add_acceptance(15, "accept")
+    assert set(loaded.states[16].symbol_transitions[symbol0]) == {0}
+    assert len(loaded.states[14].symbol_transitions) == 0
+    assert loaded.states[15].accepts == ["accept"]
+    assert len(loaded.states[14].accepts) == 0
@@ -0,0 +1,114 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from stwfsapy.automata import construction, conversion, minimization, nfa
+from stwfsapy.automata.trie import TrieBuilder, parse
+from stwfsapy.tests.automata.data import (
+    build_label_dfa,
+    exhaustive_search,
+    isomorphic,
+    label_expressions,
+    random_texts,
+    texts,
+)
+
+expressions = [
+    ("a(b|cd)?e", "abe"),
+    ("x\\.?y", "xy"),
+    ("(A|a)b?c?", "abc"),
+    ("(P|p)olic(y|ies)", "policy"),
+    ("R ?& ?D", "rd"),
+    ("()z", "z"),
+    ("(ss|ß|)t", "st"),
+]
+
+
+def convert(expressions):
+    automaton = nfa.Nfa()
+    for expression, accept in expressions:
+        construction.ConstructionState(automaton, expression, accept).construct()
+    automaton.remove_empty_transitions()
+    return conversion.NfaToDfaConverter(automaton).start_conversion()
+
+
+def build(expressions):
+    builder = TrieBuilder()
+    for expression, accept in expressions:
+        assert builder.add(expression, accept)
+    return builder.to_dfa()
+
+
+def test_parse():
+    assert parse("(A|a)b\\.?") == [[("Aa", False), ("b", False), (".", True)]]
+    assert parse("x(y|ies)") == [
+        [("x", False), ("y", False)],
+        [("x", False), ("i", False), ("e", False), ("s", False)],
+    ]
+    assert parse("x(y|)") == [[("x", False), ("y", True)]]
+    assert parse("") == [[]]
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["a*", "a|b", "(a|(b))", "(ab", "a)", "a\\", "(a\\", "?a", "(?a)", "a??", "a?*"]
+    + ["(ab|cd)" * 5],
+)
+def test_parse_unsupported(expression):
+    assert parse(expression) is None
+    assert not TrieBuilder().add(expression, "accept")
+
+
+def test_labels_equal_conversion():
+    assert isomorphic(
+        minimization.minimize(build(label_expressions())),
+        minimization.minimize(build_label_dfa()),
+    )
+
+
+def test_expressions_equal_conversion():
+    assert isomorphic(
+        minimization.minimize(build(expressions)),
+        minimization.minimize(convert(expressions)),
+    )
+
+
+def test_shared_symbol_classes():
+    assert len(build([("(A|a)(B|b)", "ab")]).states) == 5
+
+
+def test_search_equals_conversion():
+    automaton = build(label_expressions())
+    converted = build_label_dfa()
+    for text in texts + random_texts(100):
+        assert list(automaton.search(text)) == list(converted.search(text))
+        assert list(exhaustive_search(automaton, text)) == list(
+            exhaustive_search(converted, text)
+        )
+
+
+def test_empty():
+    automaton = TrieBuilder().to_dfa()
+    assert len(automaton.states) == 1
+    assert list(automaton.search("abc")) == []
+
+
+def test_several_accepts():
+    builder = TrieBuilder()
+    assert builder.add("(P|p)olic(y|ies)", "a", "b")
+    assert builder.add("policy", "c")
+    automaton = builder.to_dfa()
+    assert [match[0] for match in automaton.search("policy")] == ["a", "b", "c"]
+    assert [match[0] for match in automaton.search("policies")] == ["a", "b"]
@@ -46,6 +46,18 @@ def test_fit():
     assert features.idfs_["cncpt_3"] == log(3 / 2)
 
 
+def test_partial_fit():
+    features = FrequencyFeatures()
+    features.partial_fit(frequency_input[:2])
+    assert features.idfs_ == {"cncpt_1": 0, "cncpt_2": 0}
+    features.partial_fit(frequency_input[2:])
+    expected = FrequencyFeatures().fit(frequency_input)
+    assert features.idfs_ == expected.idfs_
+    assert features.log_doc_count_ == expected.log_doc_count_
+    features.fit(frequency_input[2:])
+    assert features.idfs_ == {"cncpt_1": 0, "cncpt_2": 0, "cncpt_3": 0}
+
+
 def test_not_fitted():
     features = FrequencyFeatures()
     with pytest.raises(NotFittedError):
@@ -70,3 +82,25 @@ def test_transform():
         [1 / 11, log(3 / 2), 1 / 11 * log(3 / 2)],
         [5 / 11, log(3), 5 / 11 * log(3)],
     ]
+
+
+def test_transform_unterminated_document():
+    features = FrequencyFeatures()
+    features.fit(frequency_input)
+    data = [
+        ("cncpt_2", [2, 5], 1),
+        ("cncpt_3", [17, 11, 22], 0),
+    ]
+    assert features.transform(data).tolist() == [[1, 0, 0], [0, 0, 0]]
+    assert features.transform(data[1:]).tolist() == [[0, 0, 0]]
+
+
+def test_transform_object_array():
+    features = FrequencyFeatures()
+    features.fit(frequency_input)
+    data = np.empty((len(frequency_input), 3), dtype=object)
+    data[:] = frequency_input
+    assert (
+        features.transform(data).tolist()
+        == features.transform(frequency_input).tolist()
+    )
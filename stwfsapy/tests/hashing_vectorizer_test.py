@@ -0,0 +1,65 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+from sklearn.exceptions import NotFittedError
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+
+from stwfsapy.hashing_vectorizer import HashingTfidfVectorizer
+
+_texts = [
+    "The cat sat on the mat.",
+    "The dog chased the cat.",
+    "",
+    "Cats and dogs, dogs and cats.",
+    "A mat for the dog",
+]
+
+
+def test_unfitted_raises():
+    with pytest.raises(NotFittedError):
+        HashingTfidfVectorizer().transform(_texts)
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1000])
+def test_equals_tfidf(batch_size):
+    n_features = 2**16
+    vectorizer = HashingTfidfVectorizer(n_features=n_features, batch_size=batch_size)
+    actual = vectorizer.fit(iter(_texts)).transform(_texts)
+    tfidf = TfidfVectorizer().fit(_texts)
+    expected = tfidf.transform(_texts)
+    hashing = HashingVectorizer(n_features=n_features, alternate_sign=False)
+    columns = {
+        token: hashing.transform([token]).indices[0] for token in tfidf.vocabulary_
+    }
+    assert len(set(columns.values())) == len(columns)
+    assert actual.shape == (len(_texts), n_features)
+    assert actual.nnz == expected.nnz
+    for token, idx in tfidf.vocabulary_.items():
+        assert np.allclose(
+            actual[:, columns[token]].toarray(), expected[:, idx].toarray()
+        )
+
+
+def test_file_input(tmpdir):
+    pths = []
+    for idx, txt in enumerate(_texts):
+        pth = tmpdir.join(f"{idx}.txt")
+        pth.write(txt)
+        pths.append(pth.strpath)
+    vectorizer = HashingTfidfVectorizer(input="filename", n_features=2**10)
+    actual = vectorizer.fit(pths).transform(pths)
+    expected = HashingTfidfVectorizer(n_features=2**10).fit(_texts).transform(_texts)
+    assert (actual != expected).nnz == 0
@@ -0,0 +1,120 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+from sklearn.compose import ColumnTransformer
+
+from stwfsapy.frequency_features import FrequencyFeatures
+from stwfsapy.match_batch import MatchBatch
+from stwfsapy.position_features import PositionFeatures
+from stwfsapy.util.passthrough_transformer import PassthroughTransformer
+
+
+def _batch(text_vectors=True):
+    return MatchBatch(
+        ["a", "b", "a"],
+        np.array([0, 0, 2]),
+        np.array([3, 1, 4, 1, 5]),
+        np.array([0, 2, 3, 5]),
+        np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]),
+        csr_matrix(np.eye(3)) if text_vectors else None,
+        np.array([10, 20, 30]),
+    )
+
+
+rows = [
+    ("a", [1.0, 2.0], [1, 0, 0], 10, [3, 1], 0),
+    ("b", [1.0, 2.0], [1, 0, 0], 10, [4], 1),
+    ("a", [5.0, 6.0], [0, 0, 1], 30, [1, 5], 1),
+]
+
+
+def _assert_rows(actual, expected):
+    assert len(actual) == len(expected)
+    for actual_row, expected_row in zip(actual, expected):
+        assert actual_row[0] == expected_row[0]
+        assert actual_row[1].tolist() == expected_row[1]
+        assert actual_row[2].toarray()[0].tolist() == expected_row[2]
+        assert actual_row[3:] == expected_row[3:]
+
+
+def test_rows():
+    batch = _batch()
+    assert batch.shape == (3, 6)
+    assert len(batch) == 3
+    _assert_rows(list(batch), rows)
+    _assert_rows([batch[-1]], rows[-1:])
+    with pytest.raises(IndexError):
+        batch[3]
+
+
+def test_without_text_vectors():
+    batch = _batch(text_vectors=False)
+    assert batch[0][2] == 0
+    assert batch.column(2) == [0, 0, 0]
+
+
+def test_columns():
+    batch = _batch()
+    assert batch[:, 0] == ["a", "b", "a"]
+    assert batch[:, 1].tolist() == [[1.0, 2.0], [1.0, 2.0], [5.0, 6.0]]
+    assert batch[:, 2].toarray().tolist() == [[1, 0, 0], [1, 0, 0], [0, 0, 1]]
+    assert batch[:, 3].tolist() == [10, 10, 30]
+    assert batch[:, 4] == [[3, 1], [4], [1, 5]]
+    assert batch[:, 5].tolist() == [0, 1, 1]
+
+
+def test_select_columns():
+    selected = _batch()[:, [3, 4]]
+    assert selected.shape == (3, 2)
+    assert selected[0] == (10, [3, 1])
+    assert selected[:, [1]][:, 0] == [[3, 1], [4], [1, 5]]
+    assert selected.flat_column(1)[1].tolist() == [0, 2, 3, 5]
+    with pytest.raises(ValueError):
+        selected.flat_column(0)
+    with pytest.raises(IndexError):
+        selected[1:, 0]
+
+
+def test_array():
+    array = np.asarray(_batch()[:, [0, 3, 5]])
+    assert array.dtype == object
+    assert array.tolist() == [["a", 10, 0], ["b", 10, 1], ["a", 30, 1]]
+
+
+def test_concatenate():
+    batch = _batch()
+    joined = MatchBatch.concatenate([batch, MatchBatch.concatenate([]), batch])
+    assert joined.shape == (6, 6)
+    _assert_rows(list(joined), rows + rows)
+    assert joined.text_features.shape == (6, 2)
+    assert MatchBatch.concatenate([]).shape == (0, 6)
+
+
+def test_column_transformer():
+    transformer = ColumnTransformer(
+        [
+            ("Text Features", PassthroughTransformer(), 1),
+            ("Position Features", PositionFeatures(), [3, 4]),
+            ("Frequency Features", FrequencyFeatures(), [0, 4, 5]),
+            ("Text Vector", PassthroughTransformer(), 2),
+        ],
+        sparse_threshold=0,
+    )
+    batch = _batch()
+    expected = transformer.fit_transform(np.asarray(batch))
+    actual = transformer.fit_transform(batch)
+    assert np.allclose(actual, expected)
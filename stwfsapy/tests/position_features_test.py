@@ -41,3 +41,13 @@ def test_convert_docs():
         [8 / 12, 102 / 12, 94 / 12],
         [13 / 70, 13 / 70, 0],
     ]
+
+
+def test_convert_object_array():
+    data = np.empty((len(position_feature_data), 2), dtype=object)
+    data[:] = position_feature_data
+    features = PositionFeatures()
+    assert (
+        features.transform(data).tolist()
+        == features.transform(position_feature_data).tolist()
+    )
@@ -12,14 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+from io import BytesIO
 from unittest.mock import call
+from zipfile import ZipFile
 
 import numpy as np
 import pytest
 from rdflib import Graph
-from rdflib.namespace import SKOS
-from rdflib.term import Literal
+from rdflib.namespace import RDF, SKOS
+from rdflib.term import Literal, URIRef
 from scipy.sparse import csr_matrix, lil_matrix
+from sklearn.base import clone
 from sklearn.compose import ColumnTransformer
 from sklearn.tree import DecisionTreeClassifier
 
@@ -27,9 +31,17 @@ import stwfsapy.tests.common as c
 import stwfsapy.thesaurus as t
 from stwfsapy import case_handlers as handlers
 from stwfsapy import predictor as p
+from stwfsapy.automata.compact import CompactDfa
 from stwfsapy.automata.construction import ConstructionState
+from stwfsapy.automata.conversion import NfaToDfaConverter
 from stwfsapy.automata.dfa import Dfa
+from stwfsapy.automata.lazy import LazyDfa
+from stwfsapy.automata.minimization import minimize
+from stwfsapy.automata.nfa import EmptyTransitionLoopException
+from stwfsapy.hashing_vectorizer import HashingTfidfVectorizer
+from stwfsapy.tests.automata.data import isomorphic
 from stwfsapy.text_features import mk_text_features
+from stwfsapy.util.binary_format import UnknownFormatException
 
 _doc_counts = [2, 4, 3]
 _concepts = list(range(9, 18))
@@ -475,6 +487,21 @@ def test_english_plural_with_case(case_graph):
     assert 1 == len(list(predictor.dfa_.search("Three Word Labels")))
 
 
+def test_compact_dfa(case_graph):
+    predictor = p.StwfsapyPredictor(
+        case_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+        compact_dfa=True,
+    )
+    predictor._init()
+    assert isinstance(predictor.dfa_, CompactDfa)
+    assert list(predictor.dfa_.search("A three word label.")) == [
+        (c.test_concept_uri_0_0, "three word label", 2, 18)
+    ]
+
+
 def test_expansion(full_graph, mocker):
     stub = mocker.stub(name="expansion_stub")
 
@@ -500,20 +527,6 @@ def test_expansion(full_graph, mocker):
         assert call(label_text) in stub.mock_calls
 
 
-def test_mark_doc_end():
-    predictor = p.StwfsapyPredictor(None, None, None, None)
-    matches = [("a", None, None, [0], 5, 0), ("b", None, None, [2, 5], 7, 0)]
-    predictor._mark_last_concept_in_doc(matches)
-    assert matches == [("a", None, None, [0], 5, 0), ("b", None, None, [2, 5], 7, 1)]
-
-
-def test_mark_doc_end_empty():
-    predictor = p.StwfsapyPredictor(None, None, None, None)
-    lst = []
-    predictor._mark_last_concept_in_doc(lst)
-    assert lst == []
-
-
 def test_uriref_str_inversion():
     ref = c.test_type_concept
     assert ref == p._load_uri_ref(p._store_uri_ref(ref))
@@ -558,15 +571,17 @@ def test_serialization_inversion_without_vec(tmpdir, full_graph):
     assert loaded.concept_map_ == predictor.concept_map_
     assert loaded.dfa_ == predictor.dfa_
     assert len(loaded.graph) == len(predictor.graph)
-    assert loaded.pipeline_[0].transformers[0][1].mapping_ == (
-        predictor.pipeline_[0].transformers[0][1].mapping_
+    assert loaded.pipeline_[0].transformers_[0][1].mapping_ == (
+        predictor.pipeline_[0].transformers_[0][1].mapping_
     )
+    assert (
+        loaded.pipeline_[0].transformers_[0][1].features_
+        != predictor.pipeline_[0].transformers_[0][1].features_
+    ).getnnz() == 0
     assert loaded.text_vectorizer_ is None
-    loaded_txt_feat_names = [name for name, _ in loaded.text_features_.transformer_list]
-    pred_txt_feat_names = [
-        name for name, _ in predictor.text_features_.transformer_list
-    ]
-    assert loaded_txt_feat_names == pred_txt_feat_names
+    assert list(loaded.text_features_.get_feature_names_out()) == list(
+        predictor.text_features_.get_feature_names_out()
+    )
     for triple in loaded.graph:
         assert triple in predictor.graph
 
@@ -610,18 +625,20 @@ def test_serialization_inversion_with_vec(tmpdir, full_graph):
     assert loaded.concept_map_ == predictor.concept_map_
     assert loaded.dfa_ == predictor.dfa_
     assert len(loaded.graph) == len(predictor.graph)
-    assert loaded.pipeline_[0].transformers[0][1].mapping_ == (
-        predictor.pipeline_[0].transformers[0][1].mapping_
+    assert loaded.pipeline_[0].transformers_[0][1].mapping_ == (
+        predictor.pipeline_[0].transformers_[0][1].mapping_
     )
+    assert (
+        loaded.pipeline_[0].transformers_[0][1].features_
+        != predictor.pipeline_[0].transformers_[0][1].features_
+    ).getnnz() == 0
     assert loaded.text_vectorizer_ is not None
     assert loaded.text_vectorizer_.vocabulary_ == (
         predictor.text_vectorizer_.vocabulary_
     )
-    loaded_txt_feat_names = [name for name, _ in loaded.text_features_.transformer_list]
-    pred_txt_feat_names = [
-        name for name, _ in predictor.text_features_.transformer_list
-    ]
-    assert loaded_txt_feat_names == pred_txt_feat_names
+    assert list(loaded.text_features_.get_feature_names_out()) == list(
+        predictor.text_features_.get_feature_names_out()
+    )
     for triple in loaded.graph:
         assert triple in predictor.graph
 
@@ -634,3 +651,716 @@ def test_warning(mocker):
     logging_spy.warning.assert_called_once_with(
         'Could not process label "invalid_label" of concept "test_concept".'
     )
+
+
+def test_serialization_inversion_compact_dfa(tmpdir, full_graph):
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+        compact_dfa=True,
+    )
+    predictor.fit(train_texts, train_labels)
+    pth = tmpdir.mkdir("tmp").join("model.zip")
+    predictor.store(pth.strpath)
+    loaded = p.StwfsapyPredictor.load(pth.strpath)
+    assert loaded.compact_dfa
+    assert loaded.n_jobs == 1
+    assert isinstance(loaded.dfa_, CompactDfa)
+    assert loaded.dfa_ == predictor.dfa_
+    assert (
+        loaded.predict_proba(train_texts).toarray()
+        == predictor.predict_proba(train_texts).toarray()
+    ).all()
+
+
+def test_serialization_mmap_dfa(tmpdir, full_graph):
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+    )
+    predictor.fit(train_texts, train_labels)
+    pth = tmpdir.mkdir("tmp").join("model.zip")
+    predictor.store(pth.strpath)
+    loaded = p.StwfsapyPredictor.load(pth.strpath, mmap_dfa=True)
+    assert isinstance(loaded.dfa_, CompactDfa)
+    assert isinstance(loaded.dfa_.transition_targets, memoryview)
+    assert loaded.dfa_ == CompactDfa.from_dfa(predictor.dfa_)
+    expected = predictor.predict_proba(train_texts).toarray()
+    assert (loaded.predict_proba(train_texts).toarray() == expected).all()
+    loaded.n_jobs = 2
+    assert (loaded.predict_proba(train_texts).toarray() == expected).all()
+
+
+def test_mmap_dfa_from_file_object(fitted_predictor):
+    buffer = BytesIO()
+    fitted_predictor.store(buffer)
+    loaded = p.StwfsapyPredictor.load(buffer, mmap_dfa=True)
+    assert loaded.dfa_ == CompactDfa.from_dfa(fitted_predictor.dfa_)
+    assert (
+        loaded.predict_proba(train_texts).toarray()
+        == fitted_predictor.predict_proba(train_texts).toarray()
+    ).all()
+
+
+def test_n_jobs_not_stored(tmpdir, fitted_predictor):
+    fitted_predictor.n_jobs = 2
+    pth = tmpdir.mkdir("tmp").join("model.zip")
+    fitted_predictor.store(pth.strpath)
+    assert p.StwfsapyPredictor.load(pth.strpath).n_jobs == 1
+
+
+def test_single_chunk_without_pool(fitted_predictor, mocker):
+    executor_spy = mocker.spy(fitted_predictor, "_match_executor")
+    fitted_predictor.n_jobs = 2
+    fitted_predictor.match_and_extend(train_texts[:1])
+    list(fitted_predictor.iter_suggest_proba(train_texts, batch_size=1))
+    executor_spy.assert_not_called()
+
+
+def _store_legacy(predictor, pth):
+    """Stores a predictor with the automaton and concept map in JSON."""
+    predictor.store(pth)
+    with ZipFile(pth, "r") as zfile:
+        members = {
+            name: zfile.read(name)
+            for name in zfile.namelist()
+            if name not in [p._NAME_DFA_FILE, p._NAME_CONCEPT_MAP_FILE]
+        }
+    conf = json.loads(members[p._NAME_PREDICTOR_FILE])
+    del conf[p._KEY_FORMAT_VERSION]
+    conf[p._KEY_DFA] = predictor.dfa_.to_dict(str)
+    conf[p._KEY_CONCEPT_MAP] = predictor.concept_map_
+    members[p._NAME_PREDICTOR_FILE] = json.dumps(conf).encode("utf-8")
+    with ZipFile(pth, "w") as zfile:
+        for name, data in members.items():
+            zfile.writestr(name, data)
+
+
+@pytest.mark.parametrize("mmap_dfa", [False, True])
+def test_load_legacy_format(tmpdir, full_graph, mmap_dfa):
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+    )
+    predictor.fit(train_texts, train_labels)
+    pth = tmpdir.mkdir("tmp").join("model.zip")
+    _store_legacy(predictor, pth.strpath)
+    loaded = p.StwfsapyPredictor.load(pth.strpath, mmap_dfa=mmap_dfa)
+    if mmap_dfa:
+        assert loaded.dfa_ == CompactDfa.from_dfa(predictor.dfa_)
+    else:
+        assert loaded.dfa_ == predictor.dfa_
+    assert loaded.concept_map_ == predictor.concept_map_
+    assert (
+        loaded.predict_proba(train_texts).toarray()
+        == predictor.predict_proba(train_texts).toarray()
+    ).all()
+
+
+def test_binary_model_format(tmpdir, full_graph):
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+    )
+    predictor.fit(train_texts, train_labels)
+    pth = tmpdir.mkdir("tmp").join("model.zip")
+    predictor.store(pth.strpath)
+    with ZipFile(pth.strpath, "r") as zfile:
+        conf = json.loads(zfile.read(p._NAME_PREDICTOR_FILE))
+        concept_map = p._read_concept_map(zfile.read(p._NAME_CONCEPT_MAP_FILE))
+    assert conf[p._KEY_FORMAT_VERSION] == p._FORMAT_VERSION
+    assert p._KEY_DFA not in conf
+    assert p._KEY_CONCEPT_MAP not in conf
+    assert concept_map == predictor.concept_map_
+
+
+def test_load_unknown_format(tmpdir):
+    pth = tmpdir.mkdir("tmp").join("model.zip")
+    with ZipFile(pth.strpath, "w") as zfile:
+        zfile.writestr(p._NAME_PREDICTOR_FILE, json.dumps({p._KEY_FORMAT_VERSION: 3}))
+    with pytest.raises(UnknownFormatException):
+        p.StwfsapyPredictor.load(pth.strpath)
+
+
+def test_load_lazy_graph(tmpdir, full_graph, mocker):
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+    )
+    predictor.fit(train_texts, train_labels)
+    pth = tmpdir.mkdir("tmp").join("model.zip")
+    predictor.store(pth.strpath)
+    spy_parse = mocker.spy(p, "_parse_graph")
+    loaded = p.StwfsapyPredictor.load(pth.strpath, lazy_graph=True)
+    assert (
+        loaded.predict_proba(train_texts).toarray()
+        == predictor.predict_proba(train_texts).toarray()
+    ).all()
+    spy_parse.assert_not_called()
+    assert loaded.graph is None
+    graph = loaded.get_graph()
+    assert len(graph) == len(full_graph)
+    assert loaded.graph is graph
+    assert loaded.get_graph() is graph
+    spy_parse.assert_called_once()
+    loaded.graph = full_graph
+    assert loaded.get_graph() is full_graph
+
+
+def test_inspect_lazy_graph_without_parsing(tmpdir, fitted_predictor, mocker):
+    pth = tmpdir.mkdir("tmp").join("model.zip")
+    fitted_predictor.store(pth.strpath)
+    spy_parse = mocker.spy(p, "_parse_graph")
+    loaded = p.StwfsapyPredictor.load(pth.strpath, lazy_graph=True)
+    assert loaded.get_params()["graph"] is None
+    assert clone(loaded).graph is None
+    repr(loaded)
+    spy_parse.assert_not_called()
+
+
+@pytest.mark.parametrize("lazy_graph", [False, True])
+def test_load_relevant_triples(tmpdir, full_graph, lazy_graph):
+    note = (c.test_concept_ref_0_0, SKOS.scopeNote, Literal("A note", lang="en"))
+    full_graph.add(note)
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+    )
+    predictor.fit(train_texts, train_labels)
+    pth = tmpdir.mkdir("tmp").join("model.zip")
+    predictor.store(pth.strpath)
+    loaded = p.StwfsapyPredictor.load(
+        pth.strpath, lazy_graph=lazy_graph, filter_graph=True
+    )
+    assert note not in loaded.get_graph()
+    assert len(loaded.get_graph()) == len(full_graph) - 1
+    loaded.fit(train_texts, train_labels)
+    assert set(loaded.concept_map_) == set(predictor.concept_map_)
+
+
+@pytest.mark.parametrize("lazy_graph", [False, True])
+def test_store_load_keeps_all_triples(tmpdir, full_graph, lazy_graph):
+    note = (c.test_concept_ref_0_0, SKOS.scopeNote, Literal("A note", lang="en"))
+    full_graph.add(note)
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+    )
+    predictor.fit(train_texts, train_labels)
+    tmp = tmpdir.mkdir("tmp")
+    predictor.store(tmp.join("model.zip").strpath)
+    loaded = p.StwfsapyPredictor.load(
+        tmp.join("model.zip").strpath, lazy_graph=lazy_graph
+    )
+    loaded.store(tmp.join("stored_again.zip").strpath)
+    reloaded = p.StwfsapyPredictor.load(tmp.join("stored_again.zip").strpath)
+    assert type(reloaded.graph) is Graph
+    assert note in reloaded.graph
+    assert len(reloaded.graph) == len(full_graph)
+
+
+def test_store_without_graph(tmpdir, full_graph):
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+    )
+    predictor.fit(train_texts, train_labels)
+    pth = tmpdir.mkdir("tmp").join("model.zip")
+    predictor.store(pth.strpath, include_graph=False)
+    with ZipFile(pth.strpath, "r") as zfile:
+        assert p._NAME_GRAPH_FILE not in zfile.namelist()
+    for lazy_graph in [False, True]:
+        loaded = p.StwfsapyPredictor.load(pth.strpath, lazy_graph=lazy_graph)
+        assert loaded.graph is None
+        assert (
+            loaded.predict_proba(train_texts).toarray()
+            == predictor.predict_proba(train_texts).toarray()
+        ).all()
+
+
+def test_stored_pipeline_without_graph(tmpdir, full_graph):
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+    )
+    predictor.fit(train_texts, train_labels)
+    pth = tmpdir.mkdir("tmp").join("model.zip")
+    predictor.store(pth.strpath)
+    loaded = p.StwfsapyPredictor.load(pth.strpath)
+    for predictor_graph, pipeline in [
+        (full_graph, predictor.pipeline_),
+        (None, loaded.pipeline_),
+    ]:
+        features = pipeline.named_steps["Combined Features"]
+        assert features.transformers[0][1].graph is predictor_graph
+        assert (features.transformers_[0][1].graph is None) == (predictor_graph is None)
+
+
+@pytest.mark.parametrize("use_txt_vec", [False, True])
+@pytest.mark.parametrize("batch_size", [1, 2, 100])
+def test_fit_in_batches(full_graph, mocker, use_txt_vec, batch_size):
+    fit_spy = mocker.spy(DecisionTreeClassifier, "fit")
+    predictors = []
+    for fit_batch_size in [None, batch_size]:
+        predictor = p.StwfsapyPredictor(
+            full_graph,
+            c.test_type_concept,
+            c.test_type_thesaurus,
+            SKOS.broader,
+            use_txt_vec=use_txt_vec,
+        )
+        predictors.append(
+            predictor.fit(train_texts, train_labels, batch_size=fit_batch_size)
+        )
+    (_, expected_X, expected_y), _ = fit_spy.call_args_list[0]
+    (_, actual_X, actual_y), _ = fit_spy.call_args_list[1]
+    assert isinstance(actual_X, csr_matrix)
+    assert np.allclose(actual_X.toarray(), csr_matrix(expected_X).toarray())
+    assert list(actual_y) == list(expected_y)
+    assert np.allclose(
+        predictors[1].predict_proba(train_texts).toarray(),
+        predictors[0].predict_proba(train_texts).toarray(),
+    )
+
+
+def test_fit_in_batches_without_matches(full_graph):
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+    )
+    with pytest.raises(ValueError):
+        predictor.fit(["nothing to see"], [[]], batch_size=2)
+
+
+def test_fit_in_batches_rejects_iterator_with_txt_vec(full_graph):
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+        use_txt_vec=True,
+    )
+    with pytest.raises(TypeError):
+        predictor.fit(iter(train_texts), train_labels, batch_size=2)
+
+
+@pytest.fixture
+def fitted_predictor(full_graph):
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+        use_txt_vec=True,
+    )
+    return predictor.fit(train_texts, train_labels)
+
+
+def test_match_and_extend_parallel(fitted_predictor, mocker):
+    mocker.patch.object(p, "_PARALLEL_CHUNK_SIZE", 2)
+    serial_matches, serial_counts = fitted_predictor.match_and_extend(train_texts)
+    serial_fit_matches, serial_y = fitted_predictor.match_and_extend(
+        train_texts, train_labels
+    )
+    fitted_predictor.n_jobs = 2
+    matches, counts = fitted_predictor.match_and_extend(train_texts)
+    fit_matches, ys = fitted_predictor.match_and_extend(train_texts, train_labels)
+    assert counts == serial_counts
+    assert ys == serial_y
+    for actual, expected in zip(
+        [matches, fit_matches], [serial_matches, serial_fit_matches]
+    ):
+        assert len(actual) == len(expected)
+        for actual_match, expected_match in zip(actual, expected):
+            assert actual_match[0] == expected_match[0]
+            assert (actual_match[1] == expected_match[1]).all()
+            assert (actual_match[2].toarray() == expected_match[2].toarray()).all()
+            assert actual_match[3:] == expected_match[3:]
+
+
+def test_predict_proba_parallel(fitted_predictor, mocker):
+    mocker.patch.object(p, "_PARALLEL_CHUNK_SIZE", 2)
+    expected = fitted_predictor.predict_proba(train_texts).toarray()
+    fitted_predictor.n_jobs = 2
+    assert (fitted_predictor.predict_proba(train_texts).toarray() == expected).all()
+    assert fitted_predictor.suggest_proba([]) == []
+
+
+def test_parallel_file_input(fitted_predictor, tmpdir, mocker):
+    mocker.patch.object(p, "_PARALLEL_CHUNK_SIZE", 2)
+    pths = []
+    for idx, txt in enumerate(train_texts):
+        pth = tmpdir.join(f"{idx}.txt")
+        pth.write(txt)
+        pths.append(pth.strpath)
+    fitted_predictor.use_txt_vec = False
+    fitted_predictor.input = "file"
+    counts = []
+    for n_jobs in [1, 2]:
+        fitted_predictor.n_jobs = n_jobs
+        handles = [open(pth) for pth in pths]
+        counts.append(fitted_predictor.match_and_extend(handles)[1])
+        for handle in handles:
+            handle.close()
+    assert counts[0] == counts[1] == [1, 0, 0, 1, 2]
+
+
+def test_hashing_text_vectors(tmpdir, full_graph):
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+        use_txt_vec=True,
+        txt_vec_backend=p.TXT_VEC_HASHING,
+        txt_vec_n_features=2**10,
+    )
+    predictor.fit(train_texts, train_labels)
+    assert isinstance(predictor.text_vectorizer_, HashingTfidfVectorizer)
+    matches, _ = predictor.match_and_extend(train_texts)
+    assert matches.text_vectors.shape == (len(train_texts), 2**10)
+    pth = tmpdir.mkdir("tmp").join("model.zip")
+    predictor.store(pth.strpath)
+    loaded = p.StwfsapyPredictor.load(pth.strpath)
+    assert loaded.txt_vec_backend == p.TXT_VEC_HASHING
+    assert loaded.txt_vec_n_features == 2**10
+    assert (loaded.text_vectorizer_.idf_ == predictor.text_vectorizer_.idf_).all()
+    assert (
+        loaded.predict_proba(train_texts) != predictor.predict_proba(train_texts)
+    ).nnz == 0
+
+
+def test_unknown_text_vector_backend(full_graph):
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+        use_txt_vec=True,
+        txt_vec_backend="unknown",
+    )
+    with pytest.raises(ValueError):
+        predictor.fit(train_texts, train_labels)
+
+
+@pytest.mark.parametrize("input_type", ["file", "filename"])
+def test_text_vectors_of_file_input(fitted_predictor, tmpdir, input_type):
+    pths = []
+    for idx, txt in enumerate(train_texts):
+        pth = tmpdir.join(f"{idx}.txt")
+        pth.write(txt)
+        pths.append(pth.strpath)
+    expected = fitted_predictor.text_vectorizer_.transform(train_texts).toarray()
+    fitted_predictor.input = input_type
+    fitted_predictor.text_vectorizer_.input = input_type
+    if input_type == "file":
+        inputs = [open(pth) for pth in pths]
+    else:
+        inputs = pths
+    matches, _ = fitted_predictor.match_and_extend(inputs)
+    if input_type == "file":
+        for handle in inputs:
+            handle.close()
+    assert fitted_predictor.text_vectorizer_.input == input_type
+    assert (matches.text_vectors.toarray() == expected).all()
+
+
+def test_construct_dfa_mixed_expressions(full_graph):
+    predictor = p.StwfsapyPredictor(
+        full_graph, c.test_type_concept, c.test_type_thesaurus, SKOS.broader
+    )
+    labels = [
+        ("c1", "monetary policy"),
+        ("c2", "a|b"),
+        ("c3", "R&D"),
+        ("c4", "x.y"),
+        ("c5", "a"),
+    ]
+    automaton = predictor._construct_dfa(labels)
+    converted = NfaToDfaConverter(predictor._construct_nfa(labels)).start_conversion()
+    assert isomorphic(minimize(automaton), minimize(converted))
+    text = "Monetary Policies and R & D in a b, a|b and x.y"
+    assert sorted(automaton.search(text)) == sorted(converted.search(text))
+
+
+def test_expression_groups(full_graph, mocker):
+    expansion_spy = mocker.spy(p.expansion, "base_expansion")
+    predictor = p.StwfsapyPredictor(
+        full_graph, c.test_type_concept, c.test_type_thesaurus, SKOS.broader
+    )
+    labels = [
+        ("c1", Literal("policy", lang="en")),
+        ("c1", Literal("policy", lang="fr")),
+        ("c2", Literal("policy", lang="en")),
+        ("c2", Literal("Policy", lang="en")),
+        ("c3", Literal("crisis", lang="en")),
+    ]
+    groups = predictor._expression_groups(labels)
+    assert groups == {
+        "(P|p)olicy": {"c1": labels[0][1], "c2": labels[2][1]},
+        "(C|c)risis": {"c3": labels[4][1]},
+    }
+    assert expansion_spy.call_count == 3
+    automaton = predictor._construct_dfa(labels)
+    assert list(automaton.search("Policy and crisis")) == [
+        ("c1", "Policy", 0, 6),
+        ("c2", "Policy", 0, 6),
+        ("c3", "crisis", 11, 17),
+    ]
+    nfa_automaton = predictor._construct_nfa(labels)
+    assert [state.accepts for state in nfa_automaton.states if state.accepts] == [
+        ["c1", "c2"],
+        ["c3"],
+    ]
+
+
+def test_empty_transition_loop_names_label():
+    expression_groups = [
+        ("first", {"c1": "first"}),
+        ("a**", {"c2": "second", "c4": "fourth"}),
+        ("x", {"c3": "x"}),
+    ]
+    with pytest.raises(EmptyTransitionLoopException) as exc:
+        p.StwfsapyPredictor._expression_nfa(expression_groups)
+    assert exc.value.args[0] == (
+        "There is an empty transition loop in the expression"
+        ' of label "second" of concept "c2".'
+    )
+
+
+@pytest.mark.parametrize("compact_dfa", [False, True])
+def test_construct_dfa_parallel(full_graph, compact_dfa):
+    predictors = []
+    for n_jobs in [1, 2]:
+        predictor = p.StwfsapyPredictor(
+            full_graph,
+            c.test_type_concept,
+            c.test_type_thesaurus,
+            SKOS.broader,
+            compact_dfa=compact_dfa,
+            n_jobs=n_jobs,
+        )
+        predictors.append(predictor.fit(train_texts, train_labels))
+    serial, parallel = predictors
+    if compact_dfa:
+        assert isinstance(parallel.dfa_, CompactDfa)
+        assert isomorphic(parallel.dfa_.to_dfa(), serial.dfa_.to_dfa())
+    else:
+        assert isomorphic(parallel.dfa_, serial.dfa_)
+    assert (
+        parallel.predict_proba(train_texts).toarray()
+        == serial.predict_proba(train_texts).toarray()
+    ).all()
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_minimize_dfa(full_graph, caplog, n_jobs):
+    predictors = []
+    for minimize_dfa in [False, True]:
+        predictor = p.StwfsapyPredictor(
+            full_graph,
+            c.test_type_concept,
+            c.test_type_thesaurus,
+            SKOS.broader,
+            n_jobs=n_jobs,
+            minimize_dfa=minimize_dfa,
+        )
+        with caplog.at_level("INFO", logger="stwfsa"):
+            predictors.append(predictor.fit(train_texts, train_labels))
+    full, minimized = predictors
+    assert len(minimized.dfa_.states) <= len(full.dfa_.states)
+    assert f"to {len(minimized.dfa_.states)} states" in caplog.text
+    assert (
+        minimized.predict_proba(train_texts).toarray()
+        == full.predict_proba(train_texts).toarray()
+    ).all()
+
+
+def test_serialization_minimize_dfa(tmpdir, full_graph):
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+        minimize_dfa=True,
+    )
+    predictor.fit(train_texts, train_labels)
+    pth = tmpdir.mkdir("tmp").join("model.zip")
+    predictor.store(pth.strpath)
+    loaded = p.StwfsapyPredictor.load(pth.strpath)
+    assert loaded.minimize_dfa
+    assert loaded.dfa_ == predictor.dfa_
+
+
+def test_shard_index():
+    assert p._shard_index("Policy", 8) == p._shard_index("policy", 8)
+    assert p._shard_index("", 8) == 0
+    assert 0 <= p._shard_index("\u0130stanbul", 3) < 3
+
+
+def test_chunked():
+    assert list(p._chunked(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(p._chunked([], 2)) == []
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_iter_suggest_proba(fitted_predictor, n_jobs):
+    expected = fitted_predictor.suggest_proba(train_texts)
+    fitted_predictor.n_jobs = n_jobs
+    texts = iter(train_texts)
+    suggestions = fitted_predictor.iter_suggest_proba(texts, batch_size=2)
+    assert next(suggestions) == expected[0]
+    # Only the first batch has been consumed.
+    assert next(texts) == train_texts[2]
+    assert list(suggestions) == expected[1:2] + expected[3:]
+    assert list(fitted_predictor.iter_suggest_proba([])) == []
+
+
+def _next_release(graph):
+    release = Graph()
+    for triple in graph:
+        release.add(triple)
+    release.remove(
+        (c.test_concept_ref_0_0, SKOS.prefLabel, c.test_labels[0][1]),
+    )
+    release.add(
+        (c.test_concept_ref_0_0, SKOS.prefLabel, Literal("updated-0_0", lang="en"))
+    )
+    release.add(
+        (c.test_concept_ref_10_1, SKOS.altLabel, Literal("concept-10_0", lang="en"))
+    )
+    new_concept = URIRef("http://test.org/concept/new")
+    release.add((new_concept, RDF.type, c.test_type_concept))
+    release.add((new_concept, SKOS.prefLabel, Literal("new concept", lang="en")))
+    return release
+
+
+@pytest.mark.parametrize(
+    "compact_dfa,n_jobs,minimize_dfa,lazy_dfa",
+    [
+        (False, 1, False, False),
+        (True, 1, False, False),
+        (False, 2, True, False),
+        (False, 1, False, True),
+    ],
+)
+def test_update_labels(full_graph, compact_dfa, n_jobs, minimize_dfa, lazy_dfa):
+    release = _next_release(full_graph)
+    predictors = []
+    for graph in [full_graph, release]:
+        predictor = p.StwfsapyPredictor(
+            graph,
+            c.test_type_concept,
+            c.test_type_thesaurus,
+            SKOS.broader,
+            compact_dfa=compact_dfa,
+            n_jobs=n_jobs,
+            minimize_dfa=minimize_dfa,
+            lazy_dfa=lazy_dfa,
+        )
+        predictors.append(predictor.fit(train_texts, train_labels))
+    updated, expected = predictors
+    concept_map = dict(updated.concept_map_)
+    pipeline = updated.pipeline_
+    assert updated.update_labels(release) is updated
+    assert updated.graph is release
+    assert updated.pipeline_ is pipeline
+    assert isinstance(updated.dfa_, CompactDfa) == compact_dfa
+    assert isinstance(updated.dfa_, LazyDfa) == lazy_dfa
+    assert set(updated.concept_map_) == set(expected.concept_map_)
+    assert {
+        concept: idx
+        for concept, idx in updated.concept_map_.items()
+        if concept in concept_map
+    } == concept_map
+    assert updated.concept_map_["http://test.org/concept/new"] == len(concept_map)
+    texts = train_texts + ["updated-0_0 and a new concept", "concept-0_0"]
+    for text in texts:
+        assert sorted(updated.dfa_.search(text)) == sorted(expected.dfa_.search(text))
+
+
+def test_update_labels_unchanged(full_graph, caplog):
+    predictor = p.StwfsapyPredictor(
+        full_graph, c.test_type_concept, c.test_type_thesaurus, SKOS.broader
+    )
+    predictor.fit(train_texts, train_labels)
+    automaton = predictor.dfa_
+    with caplog.at_level("INFO", logger="stwfsa"):
+        predictor.update_labels(full_graph)
+    assert predictor.dfa_ is automaton
+    assert "Updated the labels of 0 concepts." in caplog.text
+
+
+def test_update_labels_without_graph(tmpdir, full_graph):
+    predictor = p.StwfsapyPredictor(
+        full_graph, c.test_type_concept, c.test_type_thesaurus, SKOS.broader
+    )
+    predictor.fit(train_texts, train_labels)
+    pth = tmpdir.mkdir("tmp").join("model.zip")
+    predictor.store(pth.strpath, include_graph=False)
+    loaded = p.StwfsapyPredictor.load(pth.strpath)
+    with pytest.raises(ValueError):
+        loaded.update_labels(full_graph)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_lazy_dfa(tmpdir, full_graph, mocker, n_jobs):
+    mocker.patch.object(p, "_PARALLEL_CHUNK_SIZE", 2)
+    predictors = []
+    for lazy_dfa in [False, True]:
+        predictor = p.StwfsapyPredictor(
+            full_graph,
+            c.test_type_concept,
+            c.test_type_thesaurus,
+            SKOS.broader,
+            n_jobs=n_jobs,
+            lazy_dfa=lazy_dfa,
+            lazy_dfa_max_states=3,
+        )
+        predictors.append(predictor.fit(train_texts, train_labels))
+    eager, lazy = predictors
+    assert isinstance(lazy.dfa_, LazyDfa)
+    assert isomorphic(minimize(lazy.dfa_.to_dfa()), minimize(eager.dfa_))
+    eager_matches, eager_y = eager.match_and_extend(train_texts, train_labels)
+    lazy_matches, lazy_y = lazy.match_and_extend(train_texts, train_labels)
+    assert lazy_y == eager_y
+    assert list(lazy_matches[:, [0, 4]]) == list(eager_matches[:, [0, 4]])
+    pth = tmpdir.mkdir("tmp").join("model.zip")
+    lazy.store(pth.strpath)
+    loaded = p.StwfsapyPredictor.load(pth.strpath)
+    assert loaded.lazy_dfa
+    assert loaded.lazy_dfa_max_states == 3
+    assert isomorphic(minimize(loaded.dfa_), minimize(eager.dfa_))
+
+
+def test_lazy_dfa_without_states(full_graph):
+    predictor = p.StwfsapyPredictor(
+        full_graph,
+        c.test_type_concept,
+        c.test_type_thesaurus,
+        SKOS.broader,
+        lazy_dfa=True,
+        lazy_dfa_max_states=0,
+    )
+    with pytest.raises(ValueError):
+        predictor.fit(train_texts, train_labels)
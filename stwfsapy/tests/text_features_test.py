@@ -14,7 +14,9 @@
 
 
 import pytest
+from numpy import array_equal
 from sklearn.exceptions import NotFittedError
+from sklearn.pipeline import FeatureUnion
 
 from stwfsapy import text_features as tf
 from stwfsapy.tests.upper_case_letters import upper_case_letters
@@ -28,6 +30,20 @@ _text = (
 )
 
 
+def _count_features():
+    """Union of single counts,
+    the reference for the columns computed by TextStatistics."""
+    return FeatureUnion(
+        [
+            (tf._NAME_CHAR_FEATURE, tf.CountFeature(tf.CountType.N_CHAR)),
+            (tf._NAME_WORD_FEATURE, tf.CountFeature(tf.CountType.N_WORD)),
+            (tf._NAME_SPECIAL_CHARS_FEATURE, tf.CountFeature(tf.CountType.N_SPECIAL)),
+            (tf._NAME_UPPER_FEATURE, tf.CountFeature(tf.CountType.N_UPPER)),
+            (tf._NAME_DIGIT_FEATURE, tf.CountFeature(tf.CountType.N_DIGIT)),
+        ]
+    )
+
+
 def test_count_char():
     assert tf._count_char(_text) == 78
 
@@ -96,7 +112,7 @@ def test_config_digit():
 
 
 def test_feature_creation():
-    union = tf.mk_text_features()
+    union = _count_features()
     assert [t[0] for t in union.transformer_list] == [
         tf._NAME_CHAR_FEATURE,
         tf._NAME_WORD_FEATURE,
@@ -114,3 +130,24 @@ def test_international_upper_case_recall():
 def test_international_upper_case_precision():
     for c in upper_case_letters:
         assert 1 == tf._count_upper(f"xy{c}z")
+
+
+def test_text_statistics_names():
+    assert list(tf.mk_text_features().get_feature_names_out()) == [
+        name for name, _ in _count_features().transformer_list
+    ]
+
+
+@pytest.mark.parametrize(
+    "texts",
+    [
+        [],
+        [""],
+        [_text],
+        ["", _text, "", upper_case_letters, "Ab (1) \ud800 ²٣", ""],
+    ],
+)
+def test_text_statistics_equal_count_features(texts):
+    expected = _count_features().fit([]).transform(texts)
+    actual = tf.TextStatistics().fit([]).transform(texts)
+    assert array_equal(actual, expected)
@@ -0,0 +1,61 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from rdflib import Graph
+from rdflib.compare import isomorphic
+from rdflib.namespace import OWL, RDF, SKOS
+from rdflib.term import Literal
+
+from stwfsapy import thesaurus as t
+from stwfsapy.tests.thesaurus import common as c
+
+
+def test_parse_keeps_relevant_triples(typed_label_graph):
+    full = Graph()
+    for triple in typed_label_graph:
+        full.add(triple)
+    full.add((c.concept_ref_insurance, OWL.deprecated, Literal(True)))
+    full.add((c.concept_ref_insurance, SKOS.broader, c.thsys_ref_insurance))
+    irrelevant = [
+        (c.concept_ref_insurance, SKOS.related, c.concept_ref_it),
+        (c.concept_ref_it, SKOS.scopeNote, Literal("A note", lang="en")),
+    ]
+    for triple in irrelevant:
+        full.add(triple)
+    filtered = t.FilteredGraph(t.relevant_predicates())
+    filtered.parse(data=full.serialize(format="turtle"), format="turtle")
+    for triple in irrelevant:
+        full.remove(triple)
+    assert isomorphic(filtered, full)
+    assert set(t.retrieve_concept_labels(filtered)) == set(
+        t.retrieve_concept_labels(typed_label_graph)
+    )
+
+
+def test_add_n():
+    graph = t.FilteredGraph([RDF.type])
+    graph.addN(
+        [
+            (c.concept_ref_it, RDF.type, c.test_ref_type, graph),
+            (c.concept_ref_it, SKOS.prefLabel, c.concept_prefLabel_it_en, graph),
+        ]
+    )
+    assert list(graph) == [(c.concept_ref_it, RDF.type, c.test_ref_type)]
+
+
+def test_relevant_predicates():
+    predicates = t.relevant_predicates(SKOS.narrower)
+    assert SKOS.narrower in predicates
+    assert SKOS.broader not in predicates
+    assert t.LABEL_PREDICATES < predicates
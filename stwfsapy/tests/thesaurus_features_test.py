@@ -13,10 +13,13 @@
 # limitations under the License.
 
 
+import pickle
+
 import pytest
 from numpy import array
 from rdflib.namespace import SKOS
 from scipy.sparse import coo_matrix, csr_matrix
+from sklearn.base import BaseEstimator
 from sklearn.exceptions import NotFittedError
 
 from stwfsapy import thesaurus as t
@@ -46,13 +49,45 @@ def test_unfitted_raises():
 
 def test_transform():
     trans = tf.ThesaurusFeatureTransformation(None, None, None, None)
+    trans.mapping_ = {"a": 0, "b": 1, "c": 2}
+    trans.features_ = csr_matrix([[1], [2], [3], [0]])
+    res = trans.transform(["c", "c", "a"])
+    assert (res.toarray() == array([[3], [3], [1]])).all()
+
+
+def test_load_legacy_mapping():
+    trans = tf.ThesaurusFeatureTransformation(None, None, None, None)
+    trans.feature_dim_ = 1
     trans.mapping_ = {
         "a": coo_matrix([[1]]),
         "b": coo_matrix([[2]]),
         "c": coo_matrix([[3]]),
     }
-    res = trans.transform(["c", "c", "a"])
-    assert (res.toarray() == array([[3], [3], [1]])).all()
+    loaded = pickle.loads(pickle.dumps(trans))
+    assert loaded.mapping_ == {"a": 0, "b": 1, "c": 2}
+    res = loaded.transform(["c", "unknown", "a"])
+    assert (res.toarray() == array([[3], [0], [1]])).all()
+
+
+def test_load_legacy_mapping_restores_estimator_state(mocker):
+    setstate_spy = mocker.spy(BaseEstimator, "__setstate__")
+    trans = tf.ThesaurusFeatureTransformation(None, None, None, None)
+    trans.feature_dim_ = 1
+    trans.mapping_ = {"a": coo_matrix([[1]])}
+    loaded = pickle.loads(pickle.dumps(trans))
+    setstate_spy.assert_called_once()
+    assert loaded.mapping_ == {"a": 0}
+
+
+def test_load_legacy_empty_mapping():
+    trans = tf.ThesaurusFeatureTransformation(None, None, None, None)
+    trans.feature_dim_ = 1
+    trans.mapping_ = {}
+    loaded = pickle.loads(pickle.dumps(trans))
+    assert loaded.mapping_ == {}
+    assert loaded.features_.shape == (1, 1)
+    res = loaded.transform(["unknown", "a"])
+    assert (res.toarray() == array([[0], [0]])).all()
 
 
 def test_fit(full_graph):
@@ -62,10 +97,10 @@ def test_fit(full_graph):
         full_graph, concepts, thesauri, SKOS.broader
     )
     trans.fit()
-    mapping = trans.mapping_
+    mapping = {concept: trans.features_[row] for concept, row in trans.mapping_.items()}
     assert len(mapping) == len(c.test_concepts)
-    for x in mapping.values():
-        assert x.shape[1] == 6
+    assert trans.features_.shape == (len(c.test_concepts) + 1, 6)
+    assert trans.features_[-1].getnnz() == 0
     # Can not test positions because retrieval from graph is not deterministic.
     # Therefore, test non zero entries only.
     assert mapping[c.test_concept_uri_0_0].getnnz() == 1
@@ -89,8 +124,8 @@ def test_transform_unknown():
 
     feature_dim = 12
     trans.feature_dim_ = feature_dim
-    known = csr_matrix(([1], ([0], [4])), shape=(1, feature_dim))
-    trans.mapping_ = {"key": known}
+    trans.mapping_ = {"key": 0}
+    trans.features_ = csr_matrix(([1], ([0], [4])), shape=(2, feature_dim))
     random_results = trans.transform(["some random stuff edsfysdfhjsedf", "key"])
     assert random_results.shape == (2, feature_dim)
     assert random_results.getrow(0).getnnz() == 0
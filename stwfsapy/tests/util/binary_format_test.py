@@ -0,0 +1,63 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from io import BytesIO
+
+from pytest import raises
+
+from stwfsapy.util import binary_format as bf
+
+_magic = b"TESTTEST"
+
+
+def _write(sections, version=1):
+    buffer = BytesIO()
+    bf.write_sections(buffer, _magic, version, sections)
+    return buffer.getvalue()
+
+
+def test_sections_are_aligned():
+    data = _write([b"a", b"", b"bcd"])
+    sections = bf.read_sections(data, _magic, 1, 3)
+    assert [section.tobytes() for section in sections] == [b"a", b"", b"bcd"]
+    assert len(data) == 16 + 3 * 8 + 8 + 3
+
+
+def test_ints_inversion():
+    values = [0, 1, -1, 2**31 - 1, -(2**31)]
+    data = bf.int_bytes(values)
+    assert data[:8] == b"\x00\x00\x00\x00\x01\x00\x00\x00"
+    assert list(bf.read_ints(memoryview(data))) == values
+    assert list(bf.read_ints(memoryview(data), copy=False)) == values
+
+
+def test_strings_inversion():
+    strings = ["", "abc", "äöü", "€"]
+    offsets, data = bf.string_table(strings)
+    assert bf.read_strings(memoryview(offsets), memoryview(data)) == strings
+
+
+def test_rejects_unknown_data():
+    data = _write([b"a"])
+    with raises(bf.UnknownFormatException):
+        bf.read_sections(data[:10], _magic, 1, 1)
+    with raises(bf.UnknownFormatException):
+        bf.read_sections(data, b"OTHEROTH", 1, 1)
+    with raises(bf.UnknownFormatException):
+        bf.read_sections(data, _magic, 2, 1)
+    with raises(bf.UnknownFormatException):
+        bf.read_sections(data, _magic, 1, 2)
+    with raises(bf.UnknownFormatException):
+        bf.read_sections(data[:-1], _magic, 1, 1)
@@ -0,0 +1,37 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from stwfsapy.util import columns
+
+
+def test_column():
+    rows = [("a", 1), ("b", 2)]
+    array = np.empty((2, 2), dtype=object)
+    array[:] = rows
+    assert list(columns.column(rows, 1)) == [1, 2]
+    assert list(columns.column(array, 0)) == ["a", "b"]
+
+
+def test_flatten():
+    values, offsets = columns.flatten(iter([[3, 1], [], [4, 1, 5]]))
+    assert values.tolist() == [3, 1, 4, 1, 5]
+    assert offsets.tolist() == [0, 2, 2, 5]
+
+
+def test_flatten_empty():
+    values, offsets = columns.flatten([])
+    assert values.tolist() == []
+    assert offsets.tolist() == [0]
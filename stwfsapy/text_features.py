@@ -14,12 +14,13 @@
 
 
 import re
+import sys
 from enum import Enum
+from functools import lru_cache
 
 import numpy as np
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.exceptions import NotFittedError
-from sklearn.pipeline import FeatureUnion
 
 _NAME_VECTOR_FEATURE = "vectorizer"
 _NAME_CHAR_FEATURE = "n_chars"
@@ -30,15 +31,7 @@ _NAME_DIGIT_FEATURE = "n_digits"
 
 
 def mk_text_features():
-    return FeatureUnion(
-        [
-            (_NAME_CHAR_FEATURE, CountFeature(CountType.N_CHAR)),
-            (_NAME_WORD_FEATURE, CountFeature(CountType.N_WORD)),
-            (_NAME_SPECIAL_CHARS_FEATURE, CountFeature(CountType.N_SPECIAL)),
-            (_NAME_UPPER_FEATURE, CountFeature(CountType.N_UPPER)),
-            (_NAME_DIGIT_FEATURE, CountFeature(CountType.N_DIGIT)),
-        ]
-    )
+    return TextStatistics()
 
 
 class CountType(Enum):
@@ -49,6 +42,61 @@ class CountType(Enum):
     N_DIGIT = 4
 
 
+class TextStatistics(BaseEstimator, TransformerMixin):
+    """Computes all counts of CountType, in this order, for each text.
+    The characters counted by the types are disjoint,
+    so the count type of each code point is looked up in a table
+    and the counts of a text are obtained with a single bincount."""
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X) -> np.ndarray:
+        count_types = _count_types()
+        ret = np.empty((len(X), len(CountType)))
+        for idx, text in enumerate(X):
+            codes = np.frombuffer(
+                text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32
+            )
+            ret[idx] = np.bincount(count_types[codes], minlength=len(CountType))
+            ret[idx, CountType.N_CHAR.value] = len(text)
+        return ret
+
+    def get_feature_names_out(self, input_features=None):
+        return np.array(
+            [
+                _NAME_CHAR_FEATURE,
+                _NAME_WORD_FEATURE,
+                _NAME_SPECIAL_CHARS_FEATURE,
+                _NAME_UPPER_FEATURE,
+                _NAME_DIGIT_FEATURE,
+            ],
+            dtype=object,
+        )
+
+
+@lru_cache(maxsize=None)
+def _count_types() -> np.ndarray:
+    """Value of the CountType each code point is counted for.
+    Code points that are not counted by any type except N_CHAR
+    are mapped to N_CHAR, whose count is the length of the text instead."""
+    count_types = np.full(sys.maxunicode + 1, CountType.N_CHAR.value, dtype=np.uint8)
+    count_types[ord(" ")] = CountType.N_WORD.value
+    count_types[[ord(c) for c in "\"'?!()"]] = CountType.N_SPECIAL.value
+    count_types[
+        np.fromiter(
+            (chr(code_point).isupper() for code_point in range(len(count_types))),
+            dtype=bool,
+            count=len(count_types),
+        )
+    ] = CountType.N_UPPER.value
+    all_chars = "".join(map(chr, range(len(count_types))))
+    count_types[[match.start() for match in _re_digit.finditer(all_chars)]] = (
+        CountType.N_DIGIT.value
+    )
+    return count_types
+
+
 class CountFeature(BaseEstimator, TransformerMixin):
     def __init__(self, ctype: CountType):
         self.ctype = ctype
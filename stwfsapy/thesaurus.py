@@ -13,7 +13,7 @@
 # limitations under the License.
 
 
-from typing import Any, FrozenSet, Iterable, Optional, Tuple
+from typing import Any, Container, FrozenSet, Iterable, Optional, Tuple
 
 from rdflib import Graph
 from rdflib.namespace import OWL, RDF, SKOS, Namespace
@@ -21,6 +21,49 @@ from rdflib.term import Literal, URIRef
 
 ZBWEXT = Namespace("http://zbw.eu/namespaces/zbw-extensions/")
 
+LABEL_PREDICATES = frozenset(
+    [
+        SKOS.prefLabel,
+        SKOS.altLabel,
+        SKOS.hiddenLabel,
+        ZBWEXT.altLabelRelated,
+        ZBWEXT.altLabelNarrower,
+    ]
+)
+"""Predicates of the labels that are extracted by extract_labels."""
+
+
+class FilteredGraph(Graph):
+    """Graph that only stores triples with one of the given predicates.
+    All other triples are discarded while parsing.
+    Example:
+        from stwfsapy import thesaurus
+
+        graph = thesaurus.FilteredGraph(thesaurus.relevant_predicates())
+        graph.parse("thesaurus.ttl")"""
+
+    def __init__(self, predicates: Container[URIRef], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.predicates = predicates
+        """Predicates of the triples that are stored."""
+
+    def add(self, triple):
+        if triple[1] in self.predicates:
+            super().add(triple)
+        return self
+
+    def addN(self, quads):
+        return super().addN(quad for quad in quads if quad[1] in self.predicates)
+
+
+def relevant_predicates(
+    thesaurus_relation_type_uri: URIRef = SKOS.broader,
+) -> FrozenSet[URIRef]:
+    """Predicates of all triples that are used by the predictor.
+    Those are the labels, types, deprecation markers
+    and the relation between concepts and thesauri."""
+    return LABEL_PREDICATES | {RDF.type, OWL.deprecated, thesaurus_relation_type_uri}
+
 
 def extract_labels(g: Graph) -> Iterable[Tuple[URIRef, Literal]]:
     """
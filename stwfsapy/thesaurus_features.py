@@ -14,8 +14,9 @@
 
 
 from collections import defaultdict
-from typing import DefaultDict, Iterable, Set, Tuple
+from typing import DefaultDict, Dict, Iterable, Optional, Set, Tuple
 
+import numpy as np
 import rdflib
 from scipy.sparse import csr_matrix, vstack
 from sklearn.base import BaseEstimator, TransformerMixin
@@ -37,7 +38,10 @@ class ThesaurusFeatureTransformation(BaseEstimator, TransformerMixin):
         self.graph = graph
         self.concepts = concepts
         self.thesauri = thesauri
-        self.mapping_ = None
+        self.mapping_: Optional[Dict[str, int]] = None
+        """Row of each concept in features_."""
+        self.features_: Optional[csr_matrix] = None
+        """Thesauri broader than each concept, one row per concept."""
         self.thesaurus_relation = thesaurus_relation
         self.inverse_relation = inverse_relation
 
@@ -66,33 +70,40 @@ class ThesaurusFeatureTransformation(BaseEstimator, TransformerMixin):
             for concept, broaders in concept_po.items()
         }
         self.feature_dim_ = max(len(thesaurus_indices), 1)
-        self.mapping_ = {
-            str(concept): csr_matrix(
-                (
-                    [1 for _ in thesaurii],
-                    (
-                        [0 for _ in thesaurii],
-                        [thesaurus_indices[thesaurus] for thesaurus in thesaurii],
-                    ),
-                ),
-                shape=(1, len(thesaurus_indices)),
+        self.mapping_ = {}
+        indices = []
+        indptr = [0]
+        for concept, concept_thesauri in concept_thesauri_mapping.items():
+            self.mapping_[str(concept)] = len(self.mapping_)
+            indices.extend(
+                thesaurus_indices[thesaurus] for thesaurus in concept_thesauri
             )
-            for concept, thesaurii in concept_thesauri_mapping.items()
-        }
+            indptr.append(len(indices))
+        # Unknown concepts are mapped to an additional empty row.
+        indptr.append(len(indices))
+        self.features_ = csr_matrix(
+            (np.ones(len(indices), dtype=np.int64), indices, indptr),
+            shape=(len(indptr) - 1, self.feature_dim_),
+        )
         return self
 
-    def _transform_single(self, x):
-        # No default dict, so the transform can be pickled
-        try:
-            res = self.mapping_[x]
-        except KeyError:
-            res = csr_matrix(([], ([], [])), shape=(1, self.feature_dim_))
-        return res
-
     def transform(self, X) -> csr_matrix:
         if self.mapping_ is None:
             raise NotFittedError
-        return vstack([self._transform_single(x) for x in X])
+        unknown = self.features_.shape[0] - 1
+        rows = np.array([self.mapping_.get(x, unknown) for x in X], dtype=np.intp)
+        return self.features_[rows]
+
+    def __setstate__(self, state):
+        """Converts the mapping of models stored with one matrix per concept."""
+        mapping = state.get("mapping_")
+        if mapping is not None and state.get("features_") is None:
+            rows = list(mapping.values())
+            state["mapping_"] = dict(zip(mapping, range(len(mapping))))
+            # Models without concepts have a single empty row for unknown concepts.
+            width = rows[0].shape[1] if rows else state["feature_dim_"]
+            state["features_"] = vstack([*rows, csr_matrix((1, width))], format="csr")
+        super().__setstate__(state)
 
 
 def _collect_po_from_tuples(
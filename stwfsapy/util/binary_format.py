@@ -0,0 +1,134 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Versioned binary files consisting of a sequence of sections.
+A file starts with a magic byte string identifying its content,
+a format version and the number of sections,
+followed by the length of each section.
+Every section starts at a multiple of eight bytes."""
+
+import struct
+import sys
+from array import array
+from typing import IO, List, Sequence, Tuple
+
+_TYPE_CODE = "i"
+"""Type code of integer arrays. Signed 32 bit integers."""
+
+_HEADER = struct.Struct("<8sII")
+"""Magic bytes, format version and number of sections."""
+
+_SECTION_LENGTH = struct.Struct("<Q")
+"""Length in bytes of a single section."""
+
+_ALIGNMENT = 8
+"""Sections start at multiples of this many bytes."""
+
+
+class UnknownFormatException(Exception):
+    def __init__(self, message: str) -> None:
+        self.message = message
+        super().__init__(self.message)
+
+
+def write_sections(
+    fp: IO[bytes], magic: bytes, version: int, sections: List[bytes]
+) -> None:
+    position = fp.write(_HEADER.pack(magic, version, len(sections)))
+    for section in sections:
+        position += fp.write(_SECTION_LENGTH.pack(len(section)))
+    for section in sections:
+        position += fp.write(bytes(_padding(position)))
+        position += fp.write(section)
+
+
+def read_sections(
+    buffer, magic: bytes, version: int, n_sections: int
+) -> List[memoryview]:
+    """Returns views into the buffer for all sections.
+    Raises an UnknownFormatException if the magic bytes,
+    the version or the number of sections do not match."""
+    view = memoryview(buffer).cast("B")
+    try:
+        actual_magic, actual_version, actual_n_sections = _HEADER.unpack_from(view)
+    except struct.error:
+        raise UnknownFormatException("Buffer is too short.")
+    if actual_magic != magic:
+        raise UnknownFormatException(f"Buffer does not start with {magic!r}.")
+    if actual_version != version or actual_n_sections != n_sections:
+        raise UnknownFormatException(
+            f"Unsupported format version {actual_version} of {magic!r}."
+        )
+    position = _HEADER.size
+    lengths = []
+    for _ in range(n_sections):
+        lengths.append(_SECTION_LENGTH.unpack_from(view, position)[0])
+        position += _SECTION_LENGTH.size
+    sections = []
+    for length in lengths:
+        position += _padding(position)
+        sections.append(view[position : position + length])
+        position += length
+    if position > len(view):
+        raise UnknownFormatException("Buffer is truncated.")
+    return sections
+
+
+def int_bytes(values: Sequence[int]) -> bytes:
+    """Little endian representation of 32 bit integers."""
+    if not isinstance(values, (array, memoryview)):
+        values = array(_TYPE_CODE, values)
+    data = memoryview(values).tobytes()
+    if sys.byteorder == "big":
+        swapped = array(_TYPE_CODE, data)
+        swapped.byteswap()
+        data = swapped.tobytes()
+    return data
+
+
+def read_ints(section: memoryview, copy: bool = True) -> Sequence[int]:
+    """Reads an integer array written by int_bytes.
+    If copy is false, a view into the section is returned where possible."""
+    if not copy and sys.byteorder == "little":
+        return section.cast(_TYPE_CODE)
+    values = array(_TYPE_CODE)
+    values.frombytes(section)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def string_table(strings: Sequence[str]) -> Tuple[bytes, bytes]:
+    """Encodes strings as two sections.
+    The offsets of each string and the utf-8 encoded strings."""
+    offsets = array(_TYPE_CODE, [0])
+    encoded = []
+    for string in strings:
+        encoded.append(string.encode("utf-8"))
+        offsets.append(offsets[-1] + len(encoded[-1]))
+    return int_bytes(offsets), b"".join(encoded)
+
+
+def read_strings(offsets_section: memoryview, data_section: memoryview) -> List[str]:
+    """Decodes a string table created by string_table."""
+    offsets = read_ints(offsets_section)
+    data = data_section.tobytes()
+    return [
+        data[offsets[idx] : offsets[idx + 1]].decode("utf-8")
+        for idx in range(len(offsets) - 1)
+    ]
+
+
+def _padding(position: int) -> int:
+    return -position % _ALIGNMENT
@@ -0,0 +1,59 @@
+# Copyright 2020-2026 Leibniz Information Centre for Economics
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Column wise access to the matches passed to the transformers.
+They are given as a stwfsapy.match_batch.MatchBatch, as a 2D object array
+or as a sequence of tuples."""
+
+from itertools import chain
+from typing import Iterable, Sequence, Tuple
+
+import numpy as np
+
+from stwfsapy.match_batch import MatchBatch
+
+
+def column(X, idx: int) -> Sequence:
+    """Returns the values of a single column."""
+    if isinstance(X, MatchBatch):
+        return X.column(idx)
+    if isinstance(X, np.ndarray):
+        return X[:, idx]
+    return [x[idx] for x in X]
+
+
+def flatten(sequences: Iterable[Sequence[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenates the sequences into a single array of values,
+    in the same way as the indices of a CSR matrix.
+    Also returns the offsets of the sequences within the values.
+    The offsets contain one additional entry marking the end of the last sequence.
+    """
+    sequences = list(sequences)
+    offsets = np.zeros(len(sequences) + 1, dtype=np.intp)
+    np.cumsum(
+        np.fromiter(map(len, sequences), dtype=np.intp, count=len(sequences)),
+        out=offsets[1:],
+    )
+    values = np.fromiter(
+        chain.from_iterable(sequences), dtype=np.int64, count=offsets[-1]
+    )
+    return values, offsets
+
+
+def flat_column(X, idx: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Flattens a column holding integer sequences.
+    Returns the values and offsets as described for flatten."""
+    if isinstance(X, MatchBatch):
+        return X.flat_column(idx)
+    return flatten(column(X, idx))
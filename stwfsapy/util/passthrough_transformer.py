@@ -24,6 +24,10 @@ class PassthroughTransformer(BaseEstimator, TransformerMixin):
         return self
 
     def transform(self, X, y=None):
+        if sp.issparse(X):
+            return sp.csr_matrix(X)
+        if isinstance(X, np.ndarray) and X.dtype != object:
+            return X
         if sp.issparse(X[0]):
             ret = sp.vstack(X, format="csr")
         else: